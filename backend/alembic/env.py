@@ -1,4 +1,5 @@
 import asyncio
+import os
 from logging.config import fileConfig
 from sqlalchemy.ext.asyncio import create_async_engine
 from alembic import context
@@ -7,6 +8,9 @@ from app.models import Base
 config = context.config
 fileConfig(config.config_file_name)
 target_metadata = Base.metadata
+# The app's DATABASE_URL wins over alembic.ini, so migrations hit the same database the app uses
+if os.environ.get("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -0,0 +1,81 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases from before migrations (tables made by Base.metadata.create_all) already have
+    # some or all of these tables: keep them as they are, so `alembic upgrade head` adopts them
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=32), nullable=False),
+            sa.Column('email', sa.String(length=255), nullable=True),
+            sa.Column('password_hash', sa.String(length=128), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_users_id', 'users', ['id'])
+        op.create_index('ix_users_username', 'users', ['username'], unique=True)
+    if 'matches' not in existing:
+        op.create_table(
+            'matches',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('code', sa.String(length=10), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.Column('ended_at', sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if 'match_players' not in existing:
+        op.create_table(
+            'match_players',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('match_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('name', sa.String(length=50), nullable=False),
+            sa.Column('score', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if 'words_played' not in existing:
+        op.create_table(
+            'words_played',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('match_id', sa.Integer(), nullable=False),
+            sa.Column('player_id', sa.Integer(), nullable=False),
+            sa.Column('word', sa.String(length=32), nullable=False),
+            sa.Column('points', sa.Integer(), nullable=False),
+            sa.Column('was_stolen', sa.Boolean(), nullable=False),
+            sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['player_id'], ['match_players.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('words_played')
+    op.drop_table('match_players')
+    op.drop_table('matches')
+    op.drop_index('ix_users_username', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,61 @@
+"""user_stats summary table for leaderboard and per-user stats
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('user_stats'):  # create_all may have made it already
+        op.create_table(
+            'user_stats',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('games_played', sa.Integer(), nullable=False),
+            sa.Column('wins', sa.Integer(), nullable=False),
+            sa.Column('total_score', sa.Integer(), nullable=False),
+            sa.Column('best_score', sa.Integer(), nullable=False),
+            sa.Column('longest_word', sa.String(length=32), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('user_id'),
+        )
+        op.create_index('ix_user_stats_leaderboard', 'user_stats', ['wins', 'total_score', 'user_id'])
+    if bind.execute(sa.text("SELECT COUNT(*) FROM user_stats")).scalar():
+        return  # already kept up to date by the app: a backfill would count every match twice
+    # Backfill from matches saved before this table existed (a win is a positive top score in its match)
+    op.execute("""
+        INSERT INTO user_stats (user_id, games_played, wins, total_score, best_score, longest_word)
+        SELECT mp.user_id,
+               COUNT(*),
+               SUM(CASE WHEN mp.score > 0
+                         AND mp.score = (SELECT MAX(o.score) FROM match_players o WHERE o.match_id = mp.match_id)
+                        THEN 1 ELSE 0 END),
+               SUM(mp.score),
+               MAX(mp.score),
+               COALESCE((SELECT w.word FROM words_played w JOIN match_players p ON p.id = w.player_id
+                         WHERE p.user_id = mp.user_id ORDER BY LENGTH(w.word) DESC LIMIT 1), '')
+        FROM match_players mp
+        WHERE mp.user_id IS NOT NULL
+        GROUP BY mp.user_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_stats_leaderboard', table_name='user_stats')
+    op.drop_table('user_stats')
@@ -0,0 +1,36 @@
+"""indexes for match-history export filters and joins
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_matches_ended_at', 'matches', ['ended_at'])
+    op.create_index('ix_matches_code', 'matches', ['code'])
+    op.create_index('ix_match_players_match_id', 'match_players', ['match_id'])
+    op.create_index('ix_match_players_user_id', 'match_players', ['user_id'])
+    op.create_index('ix_words_played_player_id', 'words_played', ['player_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_words_played_player_id', table_name='words_played')
+    op.drop_index('ix_match_players_user_id', table_name='match_players')
+    op.drop_index('ix_match_players_match_id', table_name='match_players')
+    op.drop_index('ix_matches_code', table_name='matches')
+    op.drop_index('ix_matches_ended_at', table_name='matches')
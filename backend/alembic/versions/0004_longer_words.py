@@ -0,0 +1,39 @@
+"""room for words longer than 32 letters in words_played and user_stats
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Batch mode, so SQLite (which can't ALTER a column) gets a copied table
+    with op.batch_alter_table('words_played') as batch:
+        batch.alter_column('word', type_=sa.String(length=64), existing_type=sa.String(length=32),
+                           existing_nullable=False)
+    with op.batch_alter_table('user_stats') as batch:
+        batch.alter_column('longest_word', type_=sa.String(length=64), existing_type=sa.String(length=32),
+                           existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('user_stats') as batch:
+        batch.alter_column('longest_word', type_=sa.String(length=32), existing_type=sa.String(length=64),
+                           existing_nullable=False)
+    with op.batch_alter_table('words_played') as batch:
+        batch.alter_column('word', type_=sa.String(length=32), existing_type=sa.String(length=64),
+                           existing_nullable=False)
@@ -0,0 +1,115 @@
+# backend/app/actor.py
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from . import metrics
+
+# (coroutine function, args, future for the result, enqueue time)
+_Command = Tuple[Callable[..., Awaitable[Any]], tuple, asyncio.Future, float]
+
+command_latency = metrics.Histogram("bamandagrams_actor_command_seconds",
+                                    "Time from a game command being queued to it finishing")
+
+
+class GameActor:
+    """Single writer for one game: every command that touches the game runs here, one at a time, in order."""
+    __slots__ = ("code", "_queue", "_runner", "processed", "batches", "max_batch",
+                 "latency_total", "latency_max")
+
+    def __init__(self, code: str):
+        self.code = code
+        self._queue: Deque[_Command] = deque()
+        self._runner: Optional[asyncio.Task] = None
+        # Counters
+        self.processed = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.latency_total = 0.0  # seconds from submit to completion
+        self.latency_max = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def submit(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> asyncio.Future:
+        """Queue fn(*args) and return a future for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((fn, args, future, time.perf_counter()))
+        if self._runner is None:
+            self._runner = loop.create_task(self._run())
+        return future
+
+    async def _run(self):
+        try:
+            while self._queue:
+                batch = list(self._queue)
+                self._queue.clear()
+                self.batches += 1
+                self.max_batch = max(self.max_batch, len(batch))
+                for fn, args, future, queued_at in batch:
+                    if future.done():
+                        continue  # caller gave up waiting
+                    try:
+                        result = await fn(*args)
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                    else:
+                        if not future.done():
+                            future.set_result(result)
+                    latency = time.perf_counter() - queued_at
+                    command_latency.observe(latency)
+                    self.processed += 1
+                    self.latency_total += latency
+                    if latency > self.latency_max:
+                        self.latency_max = latency
+        finally:
+            self._runner = None
+
+
+class GameActors:
+    """One GameActor per live game, keyed by lobby code."""
+    def __init__(self):
+        self._actors: Dict[str, GameActor] = {}
+        # Totals carried over from actors of finished games
+        self._processed = 0
+        self._batches = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def get(self, code: str) -> GameActor:
+        actor = self._actors.get(code)
+        if actor is None:
+            actor = self._actors[code] = GameActor(code)
+        return actor
+
+    def submit(self, code: str, fn: Callable[..., Awaitable[Any]], *args: Any) -> asyncio.Future:
+        return self.get(code).submit(fn, *args)
+
+    def discard(self, code: str):
+        """Forget a finished game's actor; commands already queued on it still run."""
+        actor = self._actors.pop(code, None)
+        if actor:
+            self._processed += actor.processed
+            self._batches += actor.batches
+            self._latency_total += actor.latency_total
+            self._latency_max = max(self._latency_max, actor.latency_max)
+
+    def stats(self) -> Dict[str, Any]:
+        actors = self._actors.values()
+        processed = self._processed + sum(a.processed for a in actors)
+        latency_total = self._latency_total + sum(a.latency_total for a in actors)
+        return {
+            "actors": len(self._actors),
+            "queued": sum(a.depth for a in actors),
+            "processed": processed,
+            "batches": self._batches + sum(a.batches for a in actors),
+            "latency_avg_ms": latency_total / processed * 1000 if processed else 0.0,
+            "latency_max_ms": max([self._latency_max, *(a.latency_max for a in actors)]) * 1000,
+        }
@@ -0,0 +1,167 @@
+# backend/app/anagram.py
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from . import dictionary
+
+if TYPE_CHECKING:
+    from .state import PlayerState
+
+# Letters from rarest to most common across the dictionary. Signatures sort letters in
+# this order, so a prefix walk meets the selective letters (Q, X, J...) first and dead
+# branches are cut before the common vowels multiply them.
+LETTER_ORDER = "QXJZWVFKYBPGHMDUCLTOSNRIEA"
+_RANK = {ch: i for i, ch in enumerate(LETTER_ORDER)}
+# Each letter is encoded as chr(97 + rank) so plain string order matches LETTER_ORDER
+_ENCODE = str.maketrans({ch: chr(97 + i) for ch, i in _RANK.items()})
+
+
+def signature(word: str) -> str:
+    """Key shared by all anagrams of a word: its letters, rank-encoded and sorted."""
+    return "".join(sorted(word.upper().translate(_ENCODE)))
+
+
+class AnagramIndex:
+    """Dictionary words sorted by signature, queried by bisecting along signature prefixes."""
+    def __init__(self, words: Iterable[str]):
+        # Two parallel sorted lists keep the index compact
+        pairs = sorted((signature(w), w) for w in words)
+        self._sigs: List[str] = [s for s, _ in pairs]
+        self._words: List[str] = [w for _, w in pairs]
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def anagrams(self, letters: str) -> List[str]:
+        """All words spelled by exactly these letters."""
+        sig = signature(letters)
+        lo = bisect_left(self._sigs, sig)
+        hi = lo
+        while hi < len(self._sigs) and self._sigs[hi] == sig:
+            hi += 1
+        return self._words[lo:hi]
+
+    def extensions(self, base_word: str, letters: Iterable[str],
+                   deadline: Optional[float] = None) -> Tuple[List[str], bool]:
+        """Every word made of all of base_word plus at least one of the letters, and whether the search finished."""
+        required = _counts(base_word)
+        avail = _counts(letters)
+        for i in range(26):
+            avail[i] += required[i]
+        return self._search(required, avail, len(base_word) + 1, deadline)
+
+    def words_from(self, letters: Iterable[str], min_len: int = 1,
+                   deadline: Optional[float] = None) -> Tuple[List[str], bool]:
+        """Every word that can be spelled from a subset of the given letters, and whether the search finished."""
+        return self._search([0] * 26, _counts(letters), min_len, deadline)
+
+    def _search(self, required: List[int], avail: List[int], min_len: int,
+                deadline: Optional[float] = None) -> Tuple[List[str], bool]:
+        # With a deadline (a time.perf_counter() value) the walk stops once it passes,
+        # returning what it found so far and False; the clock is only read every 256 steps.
+        sigs = self._sigs
+        found: List[str] = []
+        # Letters of `required` still to be placed; signatures are sorted, so once we
+        # move past a letter any missing copies of it can never be added later.
+        remaining = sum(required)
+        steps = 0
+        expired = False
+
+        def walk(prefix: str, first: int, lo: int, hi: int):
+            nonlocal remaining, steps, expired
+            if deadline is not None:
+                steps += 1
+                if steps & 255 == 0 and time.perf_counter() > deadline:
+                    expired = True
+                if expired:
+                    return
+            if remaining == 0 and len(prefix) >= min_len:
+                j = lo
+                while j < hi and sigs[j] == prefix:
+                    j += 1
+                found.extend(self._words[lo:j])
+            for c in range(first, 26):
+                if avail[c]:
+                    child = prefix + chr(97 + c)
+                    c_lo = bisect_left(sigs, child, lo, hi)
+                    c_hi = bisect_left(sigs, child + "\x7f", c_lo, hi)
+                    if c_lo < c_hi:
+                        avail[c] -= 1
+                        took = required[c] > 0
+                        if took:
+                            required[c] -= 1
+                            remaining -= 1
+                        walk(child, c, c_lo, c_hi)
+                        if took:
+                            required[c] += 1
+                            remaining += 1
+                        avail[c] += 1
+                if required[c]:
+                    break  # skipping past c would leave a required letter unplaced
+
+        walk("", 0, 0, len(sigs))
+        return found, not expired
+
+
+def _counts(letters: Iterable[str]) -> List[int]:
+    # Indexed by rank in LETTER_ORDER, matching the signature encoding
+    counts = [0] * 26
+    for ch in letters:
+        i = _RANK.get(ch.upper())
+        if i is not None:
+            counts[i] += 1
+    return counts
+
+
+class BoardIndex:
+    """Per-game grouping of the table's words by signature, cached until changed() and rebuilt on demand."""
+    __slots__ = ("_players", "_by_sig")
+
+    def __init__(self, players: Dict[str, "PlayerState"]):
+        self._players = players
+        self._by_sig: Optional[Dict[str, List[Tuple["PlayerState", int]]]] = None
+
+    def changed(self):
+        self._by_sig = None
+
+    def groups(self) -> Dict[str, List[Tuple["PlayerState", int]]]:
+        """signature -> [(owner, word_id), ...] for every word on the table."""
+        if self._by_sig is None:
+            by_sig: Dict[str, List[Tuple["PlayerState", int]]] = {}
+            for player in self._players.values():
+                for word_id, word in player.words.items():
+                    by_sig.setdefault(signature(word), []).append((player, word_id))
+            self._by_sig = by_sig
+        return self._by_sig
+
+    def steals(self, index: AnagramIndex, letters: Iterable[str],
+               deadline: Optional[float] = None) -> Tuple[List[dict], bool]:
+        """Every table word these letters extend and what it becomes, and whether the search finished."""
+        letters = list(letters)
+        if not letters:
+            return [], True
+        result = []
+        # Identical words (and anagrams of each other) share one search
+        for entries in self.groups().values():
+            if deadline is not None and time.perf_counter() > deadline:
+                return result, False
+            owner, word_id = entries[0]
+            new_words, complete = index.extensions(owner.words[word_id], letters, deadline)
+            if new_words:
+                for owner, word_id in entries:
+                    result.append({"targetPlayerId": owner.sid, "baseWordId": word_id,
+                                   "baseWord": owner.words[word_id], "newWords": new_words})
+            if not complete:
+                return result, False
+        return result, True
+
+
+_index: Optional[AnagramIndex] = None
+
+def get_index() -> AnagramIndex:
+    """Return the process-wide anagram index over the dictionary, building it on first use."""
+    global _index
+    if _index is None:
+        _index = AnagramIndex(dictionary.get_dictionary().words)
+    return _index
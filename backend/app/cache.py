@@ -0,0 +1,65 @@
+# backend/app/cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from . import metrics
+
+V = TypeVar("V")
+
+lookups = metrics.Counter("bamandagrams_cache_lookups_total", "Lookups in named caches", ["cache", "result"])
+evicted = metrics.Counter("bamandagrams_cache_evictions_total", "Entries evicted from named caches to make room", ["cache"])
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU cache whose entries expire after the ttl (or their own earlier expiry); named ones report metrics."""
+    def __init__(self, maxsize: int, ttl: float, name: str = ""):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()  # key -> (expires at, value)
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # dropped to make room (expired or invalidated entries don't count)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._data.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._data[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            if self.name:
+                lookups.inc(self.name, "miss")
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        if self.name:
+            lookups.inc(self.name, "hit")
+        return entry[1]
+
+    def set(self, key: Hashable, value: V, expires_at: Optional[float] = None):
+        """Store value; expires_at is a time.monotonic() deadline, capped at now + ttl."""
+        deadline = time.monotonic() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        self._data[key] = (deadline, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+            if self.name:
+                evicted.inc(self.name)
+
+    def pop(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
@@ -0,0 +1,150 @@
+# backend/app/cluster.py
+"""Lobby ownership across workers, and forwarding lobby events to the owner (in-process without REDIS_URL)."""
+import asyncio
+import json
+import os
+import secrets
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+import socketio
+
+# Environment configuration
+REDIS_URL = os.environ.get("REDIS_URL")  # shared store for lobby ownership + Socket.IO fan-out
+NODE_ID = os.environ.get("NODE_ID") or os.environ.get("FLY_MACHINE_ID") or secrets.token_hex(4)
+RPC_TIMEOUT = float(os.environ.get("CLUSTER_RPC_TIMEOUT", "5"))  # seconds to wait for the owning worker
+LOBBY_TTL = 12 * 3600  # ownership records expire even if a worker dies without releasing them
+
+# (event name, sid, payload) -> ack; runs a lobby event on this worker
+Dispatch = Callable[[str, str, Any], Awaitable[Any]]
+
+
+class LocalBackend:
+    """In-process backend: this worker owns every lobby."""
+    def __init__(self):
+        self._owners: Dict[str, str] = {}
+
+    async def start(self, dispatch: Dispatch):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def claim(self, code: str) -> bool:
+        """Record this worker as the owner of `code`; False if it is already taken."""
+        if code in self._owners:
+            return False
+        self._owners[code] = NODE_ID
+        return True
+
+    async def owner(self, code: str) -> Optional[str]:
+        return self._owners.get(code)
+
+    async def release(self, code: str):
+        self._owners.pop(code, None)
+
+    async def call(self, node: str, event: str, sid: str, data: Any) -> Any:
+        raise RuntimeError(f"No route to worker {node}")
+
+
+class RedisBackend:
+    """Lobby ownership in Redis (or any redis.asyncio-compatible client); events reach the owner over pub/sub."""
+    def __init__(self, redis, prefix: str = "bg"):
+        self.redis = redis
+        self.prefix = prefix
+        self._dispatch: Optional[Dispatch] = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._serving: Set[asyncio.Task] = set()
+
+    def _key(self, code: str) -> str:
+        return f"{self.prefix}:lobby:{code}"
+
+    def _channel(self, node: str) -> str:
+        return f"{self.prefix}:node:{node}"
+
+    async def start(self, dispatch: Dispatch):
+        self._dispatch = dispatch
+        self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self._channel(NODE_ID))
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub:
+            await self._pubsub.unsubscribe()
+            self._pubsub = None
+
+    async def claim(self, code: str) -> bool:
+        return bool(await self.redis.set(self._key(code), NODE_ID, nx=True, ex=LOBBY_TTL))
+
+    async def owner(self, code: str) -> Optional[str]:
+        node = await self.redis.get(self._key(code))
+        return node.decode() if isinstance(node, bytes) else node
+
+    async def release(self, code: str):
+        if await self.owner(code) == NODE_ID:
+            await self.redis.delete(self._key(code))
+
+    async def call(self, node: str, event: str, sid: str, data: Any) -> Any:
+        """Run `event` on worker `node` and return its ack."""
+        call_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = future
+        try:
+            await self.redis.publish(self._channel(node), json.dumps(
+                {"id": call_id, "from": NODE_ID, "event": event, "sid": sid, "data": data}))
+            return await asyncio.wait_for(future, RPC_TIMEOUT)
+        except asyncio.TimeoutError:
+            return {"error": "Game server did not respond"}
+        finally:
+            self._pending.pop(call_id, None)
+
+    async def _listen(self):
+        while True:
+            message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if not message:
+                continue
+            try:
+                msg = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            if "reply" in msg:
+                future = self._pending.get(msg["reply"])
+                if future and not future.done():
+                    future.set_result(msg.get("result"))
+            else:
+                task = asyncio.create_task(self._serve(msg))
+                self._serving.add(task)
+                task.add_done_callback(self._serving.discard)
+
+    async def _serve(self, msg: dict):
+        try:
+            result = await self._dispatch(msg["event"], msg["sid"], msg["data"])
+        except Exception as e:
+            result = {"error": str(e) or type(e).__name__}
+        await self.redis.publish(self._channel(msg["from"]), json.dumps({"reply": msg["id"], "result": result}))
+
+
+def create_backend():
+    if not REDIS_URL:
+        return LocalBackend()
+    from redis import asyncio as aioredis  # only imported for multi-worker deploys
+    return RedisBackend(aioredis.from_url(REDIS_URL))
+
+
+def client_manager() -> Optional[socketio.AsyncManager]:
+    """Socket.IO manager that delivers emits to sockets connected to any worker."""
+    if not REDIS_URL:
+        return None
+    return socketio.AsyncRedisManager(REDIS_URL)
+
+
+backend = create_backend()
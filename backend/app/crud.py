@@ -1,20 +1,28 @@
 # backend/app/crud.py
+import os
+import time
+from sqlalchemy import tuple_
 from sqlalchemy.future import select
-from passlib.context import CryptContext
-from . import models, schemas
-import datetime
+from . import models, schemas, passwords
+from .cache import TTLCache
 from typing import Optional
 from typing import List
 from typing import Dict
+from typing import Tuple
 from fastapi import HTTPException
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt runs on the password pool, never on the event loop (see passwords.py)
+async def hash_password(password: str) -> str:
+    return await passwords.pool.hash(password)
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+async def verify_password(session: models.AsyncSession, user: models.User, plain: str) -> bool:
+    """Check a user's password, upgrading the stored hash if its cost is out of date."""
+    ok, new_hash = await passwords.pool.verify(plain, user.password_hash)
+    if ok and new_hash:
+        user.password_hash = new_hash
+        await session.commit()
+        invalidate_user(user.id)
+    return ok
 
 # User CRUD
 async def get_user_by_username(session: models.AsyncSession, username: str) -> Optional[models.User]:
@@ -23,30 +31,92 @@ async def get_user_by_username(session: models.AsyncSession, username: str) -> O
 
 async def create_user(session: models.AsyncSession, user_in: schemas.UserCreate) -> models.User:
     user = models.User(username=user_in.username, email=user_in.email or None,
-                       password_hash=hash_password(user_in.password))
+                       password_hash=await hash_password(user_in.password))
     session.add(user)
     await session.commit()
     await session.refresh(user)
     return user
 
-# Save match results after game end
-async def save_match_results(session: models.AsyncSession, game: "GameState", results: List[Dict]) -> models.Match:
-    # Create Match record
-    match = models.Match(code=game.code, ended_at=datetime.utcnow())
-    session.add(match)
-    # For each player result, create a MatchPlayer and WordPlayed records
-    for res in results:
-        name = res["name"]
-        score = res["score"]
-        # If the player was a registered user (we could map by name to user if logged in, but here we didn't attach user_id in GameState)
-        mp = models.MatchPlayer(match=match, name=name, score=score)
-        session.add(mp)
-        # Also record each word that player had at end
-        player_state = game.players  # game is GameState, which lacks direct user_id mapping in this MVP
-        # We won't have word details here easily; for MVP, skip logging individual words or implement as needed.
+# Save match results after game end (called by persistence.MatchWriter with a batch of match records)
+async def save_match_results(session: models.AsyncSession, records: List[Dict]) -> List[models.Match]:
+    """Insert finished matches with their players and every word played, in one transaction."""
+    matches = []
+    for rec in records:
+        match = models.Match(code=rec["code"], ended_at=rec["ended_at"])
+        for res in rec["players"]:
+            # user_id is set for players who were logged in, None for guests
+            mp = models.MatchPlayer(match=match, user_id=res["user_id"], name=res["name"], score=res["score"])
+            for w in res["words"]:
+                mp.words.append(models.WordPlayed(match=match, word=w["word"], points=w["points"],
+                                                  was_stolen=w["was_stolen"]))
+        matches.append(match)
+    # The unit of work emits one multi-row INSERT per table for the whole batch
+    session.add_all(matches)
+    await update_user_stats(session, records)
     await session.commit()
-    await session.refresh(match)
-    return match
+    return matches
+
+async def update_user_stats(session: models.AsyncSession, records: List[Dict]):
+    """Fold a batch of match records into user_stats (same transaction as the matches)."""
+    deltas: Dict[int, Dict] = {}
+    for rec in records:
+        top = max((res["score"] for res in rec["players"]), default=0)
+        for res in rec["players"]:
+            if res["user_id"] is None:
+                continue  # guests have no stats
+            d = deltas.setdefault(res["user_id"], {"games": 0, "wins": 0, "total": 0, "best": 0, "longest": ""})
+            d["games"] += 1
+            d["wins"] += top > 0 and res["score"] == top  # nobody wins a match where nobody scored
+            d["total"] += res["score"]
+            d["best"] = max(d["best"], res["score"])
+            for w in res["words"]:
+                if len(w["word"]) > len(d["longest"]):
+                    d["longest"] = w["word"]
+    if not deltas:
+        return
+    # One SELECT for every user in the batch; rows are locked so concurrent writers can't lose updates
+    result = await session.execute(
+        select(models.UserStats).where(models.UserStats.user_id.in_(deltas)).with_for_update())
+    existing = {stats.user_id: stats for stats in result.scalars()}
+    for user_id, d in deltas.items():
+        stats = existing.get(user_id)
+        if stats is None:
+            stats = models.UserStats(user_id=user_id, games_played=0, wins=0, total_score=0, best_score=0,
+                                     longest_word="")
+            session.add(stats)
+        stats.games_played += d["games"]
+        stats.wins += d["wins"]
+        stats.total_score += d["total"]
+        stats.best_score = max(stats.best_score, d["best"])
+        if len(d["longest"]) > len(stats.longest_word):
+            stats.longest_word = d["longest"]
+
+# Stats reads (served from user_stats; never aggregate match history)
+def _stats_out(user: models.User, stats: Optional[models.UserStats]) -> schemas.UserStatsOut:
+    if stats is None:
+        return schemas.UserStatsOut(user_id=user.id, username=user.username)
+    return schemas.UserStatsOut(user_id=user.id, username=user.username, games_played=stats.games_played,
+                                wins=stats.wins, total_score=stats.total_score, best_score=stats.best_score,
+                                longest_word=stats.longest_word)
+
+async def get_user_stats(session: models.AsyncSession, user_id: int) -> Optional[schemas.UserStatsOut]:
+    user = await session.get(models.User, user_id)
+    if not user:
+        return None
+    return _stats_out(user, await session.get(models.UserStats, user_id))
+
+async def get_leaderboard(session: models.AsyncSession, limit: int,
+                          after: Optional[Tuple[int, int, int]] = None) -> List[schemas.UserStatsOut]:
+    """One page of users by wins, total score, then user id (descending), after the previous page's last key."""
+    key = tuple_(models.UserStats.wins, models.UserStats.total_score, models.UserStats.user_id)
+    query = (select(models.UserStats, models.User).join(models.User, models.User.id == models.UserStats.user_id)
+             .order_by(models.UserStats.wins.desc(), models.UserStats.total_score.desc(),
+                       models.UserStats.user_id.desc())
+             .limit(limit))
+    if after is not None:
+        query = query.where(key < tuple_(*after))  # a row-value seek into ix_user_stats_leaderboard
+    result = await session.execute(query)
+    return [_stats_out(user, stats) for stats, user in result.all()]
 
 # Dependency for getting current user from JWT for /auth/me
 from fastapi import Depends
@@ -55,18 +125,47 @@ import jwt
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> models.User:
-    credentials_exception = HTTPException(status_code=401, detail="Could not validate credentials")
+# Decoded tokens and user rows are cached, so authenticated requests and socket
+# connects only reach the database the first time a user is seen
+AUTH_CACHE_SIZE = int(os.environ.get("AUTH_CACHE_SIZE", "10000"))  # entries per cache
+AUTH_CACHE_TTL = float(os.environ.get("AUTH_CACHE_TTL", "300"))    # seconds; tokens also expire at their exp
+token_cache: TTLCache[int] = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL, "auth_token")        # token -> user id
+user_cache: TTLCache[models.User] = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL, "auth_user")   # user id -> User row
+
+def invalidate_user(user_id: int):
+    """Drop a cached user row; call whenever the user is updated or deleted."""
+    user_cache.pop(user_id)
+
+def user_id_from_token(token: str) -> Optional[int]:
+    """User id from a valid JWT, or None."""
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
     try:
         payload = jwt.decode(token, models.JWT_SECRET, algorithms=[models.JWT_ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except jwt.PyJWTError:
-        raise credentials_exception
-    async with models.SessionLocal() as session:
-        result = await session.execute(select(models.User).where(models.User.id == int(user_id)))
-        user = result.scalars().first()
-        if not user:
-            raise credentials_exception
-        return user
+        user_id = int(payload["sub"])
+    except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+        return None
+    exp = payload.get("exp")
+    # Cache deadlines are monotonic; convert the token's wall-clock exp
+    token_cache.set(token, user_id, time.monotonic() + exp - time.time() if exp else None)
+    return user_id
+
+async def get_user(user_id: int) -> Optional[models.User]:
+    user = user_cache.get(user_id)
+    if user is None:
+        async with models.SessionLocal() as session:
+            user = await session.get(models.User, user_id)
+        if user:
+            user_cache.set(user_id, user)
+    return user
+
+async def user_from_token(token: str) -> Optional[models.User]:
+    user_id = user_id_from_token(token)
+    return await get_user(user_id) if user_id is not None else None
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> models.User:
+    user = await user_from_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    return user
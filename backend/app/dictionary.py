@@ -0,0 +1,62 @@
+# backend/app/dictionary.py
+import os
+from typing import FrozenSet, Iterable, Optional
+
+# Optional override: path to a plain-text word list (one word per line).
+# When unset, the wordfreq "large" English list is used.
+WORDLIST_PATH = os.environ.get("WORDLIST_PATH")
+
+
+class Dictionary:
+    """Immutable set of valid words, stored upper-case for O(1) membership checks."""
+    def __init__(self, words: Iterable[str]):
+        self.words: FrozenSet[str] = frozenset(_normalize(words))
+
+    def is_valid(self, word: str) -> bool:
+        return word.upper() in self.words
+
+    def __contains__(self, word: str) -> bool:
+        return self.is_valid(word)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+def _normalize(words: Iterable[str]):
+    # Tiles only carry A-Z, so anything with digits, apostrophes or accents can never be played
+    for w in words:
+        w = w.strip()
+        if w and w.isascii() and w.isalpha():
+            yield w.upper()
+
+
+def _iter_wordfreq():
+    # wordfreq only ships words with a non-zero frequency, which is exactly
+    # the set that zipf_frequency(word, "en", wordlist="large") accepts.
+    from wordfreq import iter_wordlist
+    return iter_wordlist("en", wordlist="large")
+
+
+def _iter_file(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line
+
+
+def load_dictionary(path: Optional[str] = None) -> Dictionary:
+    """Build a Dictionary from a word file, or from wordfreq if no path is given."""
+    path = path or WORDLIST_PATH
+    return Dictionary(_iter_file(path) if path else _iter_wordfreq())
+
+
+_dictionary: Optional[Dictionary] = None
+
+def get_dictionary() -> Dictionary:
+    """Return the process-wide dictionary, loading it on first use."""
+    global _dictionary
+    if _dictionary is None:
+        _dictionary = load_dictionary()
+    return _dictionary
+
+def is_valid(word: str) -> bool:
+    return get_dictionary().is_valid(word)
@@ -0,0 +1,110 @@
+# backend/app/export.py
+"""Match history (matches, players and words) streamed as NDJSON or CSV from a server-side cursor."""
+import csv
+import datetime
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy import select
+
+from . import models
+
+EXPORT_CHUNK_ROWS = 1000  # rows fetched from the cursor at a time
+CSV_COLUMNS = ["match_id", "code", "created_at", "ended_at", "player_id", "user_id", "name", "score",
+               "word", "points", "was_stolen"]
+
+
+def _query(since: Optional[datetime.datetime], until: Optional[datetime.datetime], code: Optional[str],
+           user_id: Optional[int]):
+    M, P, W = models.Match, models.MatchPlayer, models.WordPlayed
+    query = (select(M.id, M.code, M.created_at, M.ended_at, P.id, P.user_id, P.name, P.score,
+                    W.word, W.points, W.was_stolen)
+             .select_from(M)
+             .outerjoin(P, P.match_id == M.id)
+             .outerjoin(W, W.player_id == P.id)
+             .order_by(M.id, P.id, W.id)
+             .execution_options(yield_per=EXPORT_CHUNK_ROWS))
+    if since:
+        query = query.where(M.ended_at >= since)
+    if until:
+        query = query.where(M.ended_at < until)
+    if code:
+        query = query.where(M.code == code.upper())
+    if user_id is not None:  # only matches this user played in (with every player's rows)
+        query = query.where(M.id.in_(select(P.match_id).where(P.user_id == user_id)))
+    return query
+
+
+async def iter_rows(since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None,
+                    code: Optional[str] = None, user_id: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Flat rows, one per word played (or per player/match with none), ordered by match."""
+    async with models.SessionLocal() as session:
+        result = await session.stream(_query(since, until, code, user_id))
+        async for row in result:
+            yield dict(zip(CSV_COLUMNS, row))
+
+
+async def iter_matches(since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None,
+                       code: Optional[str] = None, user_id: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """One nested dict per match: {..., "players": [{..., "words": [...]}]}."""
+    match: Optional[Dict[str, Any]] = None
+    player: Optional[Dict[str, Any]] = None
+    async for row in iter_rows(since, until, code, user_id):
+        if match is None or match["id"] != row["match_id"]:
+            if match is not None:
+                yield match
+            match = {"id": row["match_id"], "code": row["code"], "created_at": row["created_at"],
+                     "ended_at": row["ended_at"], "players": []}
+            player = None
+        if row["player_id"] is None:
+            continue
+        if player is None or player["id"] != row["player_id"]:
+            player = {"id": row["player_id"], "user_id": row["user_id"], "name": row["name"],
+                      "score": row["score"], "words": []}
+            match["players"].append(player)
+        if row["word"] is not None:
+            player["words"].append({"word": row["word"], "points": row["points"], "was_stolen": row["was_stolen"]})
+    if match is not None:
+        yield match
+
+
+def _json_default(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+async def ndjson_lines(**filters) -> AsyncIterator[str]:
+    async for match in iter_matches(**filters):
+        yield json.dumps(match, default=_json_default) + "\n"
+
+
+async def csv_lines(**filters) -> AsyncIterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_COLUMNS)
+    async for row in iter_rows(**filters):
+        writer.writerow([value.isoformat() if isinstance(value, datetime.datetime) else value
+                         for value in row.values()])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    yield buf.getvalue()
+
+
+FORMATS = {"ndjson": (ndjson_lines, "application/x-ndjson"), "csv": (csv_lines, "text/csv")}
+
+
+async def stream(fmt: str, chunk_size: int = 64 * 1024, **filters) -> AsyncIterator[str]:
+    """Export in format `fmt`, coalesced into chunks of about chunk_size characters."""
+    lines, _ = FORMATS[fmt]
+    parts, size = [], 0
+    async for line in lines(**filters):
+        parts.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(parts)
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts)
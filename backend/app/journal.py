@@ -0,0 +1,405 @@
+# backend/app/journal.py
+"""Append-only game journal with periodic snapshots, replayed on boot so live games survive a restart."""
+import asyncio
+import functools
+import logging
+import os
+import struct
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from . import letters, logs
+from .state import GameState, PlayerState
+
+# Environment configuration
+JOURNAL_DIR = os.environ.get("JOURNAL_DIR")  # unset: no journal (games are lost on restart)
+JOURNAL_FLUSH_INTERVAL = float(os.environ.get("JOURNAL_FLUSH_INTERVAL", "0.05"))     # seconds between writes
+JOURNAL_SNAPSHOT_INTERVAL = float(os.environ.get("JOURNAL_SNAPSHOT_INTERVAL", "60"))  # seconds between snapshots
+JOURNAL_FSYNC = os.environ.get("JOURNAL_FSYNC", "0") == "1"                         # fsync every flush
+
+# Record types. Each describes an outcome (a created game carries its shuffled bag), and every type but
+# CREATED, ADVANCED and ENDED pairs with one broadcast_change in main.py, so replay restores game versions too
+CREATED, JOINED, LEFT, STARTED, DRAWN, FORMED, STOLEN, ADVANCED, RESUMED, ENDED = range(1, 11)
+GAME = 20  # full game state (snapshots only)
+
+_HEADER = struct.Struct("<IB")
+_U8, _U16, _U32, _I32 = struct.Struct("<B"), struct.Struct("<H"), struct.Struct("<I"), struct.Struct("<i")
+SNAPSHOT_MAGIC = b"BGSNAP2\n"
+
+
+def _s(value: str) -> bytes:
+    raw = value.encode()
+    if len(raw) > 255:
+        # Cut on a character boundary: half a multi-byte character would fail to decode on restore
+        raw = raw[:255].decode(errors="ignore").encode()
+    return bytes((len(raw),)) + raw
+
+
+def _record(rtype: int, body: bytes) -> bytes:
+    return _HEADER.pack(len(body), rtype) + body
+
+
+def _recording(method):
+    """Skip a GameJournal record method entirely (fields aren't even encoded) while the journal is closed."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._file is not None:
+            method(self, *args, **kwargs)
+    return wrapper
+
+
+class _Reader:
+    """Cursor over one record body."""
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf: memoryview):
+        self.buf = buf
+        self.pos = 0
+
+    def s(self) -> str:
+        n = self.buf[self.pos]
+        value = bytes(self.buf[self.pos + 1:self.pos + 1 + n]).decode()
+        self.pos += 1 + n
+        return value
+
+    def raw(self, n: int) -> bytes:
+        value = bytes(self.buf[self.pos:self.pos + n])
+        self.pos += n
+        return value
+
+    def u8(self) -> int:
+        self.pos += 1
+        return self.buf[self.pos - 1]
+
+    def u16(self) -> int:
+        self.pos += 2
+        return _U16.unpack_from(self.buf, self.pos - 2)[0]
+
+    def u32(self) -> int:
+        self.pos += 4
+        return _U32.unpack_from(self.buf, self.pos - 4)[0]
+
+    def i32(self) -> int:
+        self.pos += 4
+        return _I32.unpack_from(self.buf, self.pos - 4)[0]
+
+
+def iter_records(data: bytes) -> Iterator[Tuple[int, _Reader]]:
+    """Records in a segment; stops quietly at a torn tail (a write cut short by a crash)."""
+    view = memoryview(data)
+    pos, end = 0, len(data)
+    while pos + _HEADER.size <= end:
+        length, rtype = _HEADER.unpack_from(view, pos)
+        start = pos + _HEADER.size
+        if start + length > end:
+            break
+        yield rtype, _Reader(view[start:start + length])
+        pos = start + length
+
+
+# Snapshot encoding of a whole game
+def encode_game(game: GameState) -> bytes:
+    parts = [_s(game.code), _U16.pack(len(game.tile_bag)), bytes(game.tile_bag),
+             _U8.pack(game.started | game.game_active << 1), _U16.pack(game.no_move_turns),
+             _U32.pack(game.last_word_id), _U32.pack(game.version), _U32.pack(game.turn_order.turn),
+             _s(game.turn_order.current or ""),
+             _U8.pack(len(game.players))]
+    for p in game.players.values():
+        parts += [_s(p.sid), _s(p.name), _I32.pack(-1 if p.user_id is None else p.user_id), _s(p.token),
+                  bytes(p.hand), _U16.pack(len(p.words))]
+        for word_id, word in p.words.items():
+            parts += [_U32.pack(word_id), _s(word)]
+    parts.append(_U32.pack(len(game.history)))
+    for sid, word_id, word, was_stolen in game.history:
+        parts += [_s(sid), _U32.pack(word_id), _s(word), _U8.pack(was_stolen)]
+    return _record(GAME, b"".join(parts))
+
+
+def decode_game(r: _Reader) -> GameState:
+    code = r.s()
+    game = GameState(code, r.raw(r.u16()))
+    flags = r.u8()
+    game.started, game.game_active = bool(flags & 1), bool(flags & 2)
+    game.no_move_turns = r.u16()
+    game.last_word_id = r.u32()
+    game.version = r.u32()
+    turn = r.u32()
+    current = r.s()
+    for _ in range(r.u8()):
+        sid, name, user_id, token = r.s(), r.s(), r.i32(), r.s()
+        player = PlayerState(sid, name, None if user_id < 0 else user_id)
+        player.token = token
+        player.hand = bytearray(r.raw(26))
+        for _ in range(r.u16()):
+            word_id = r.u32()
+            player.words[word_id] = r.s()
+        game.players[sid] = player
+        game.turn_order.append(sid)
+    game.turn_order.current = current or None
+    game.turn_order.turn = turn
+    game.history = [(r.s(), r.u32(), r.s(), bool(r.u8())) for _ in range(r.u32())]
+    return game
+
+
+def apply(games: Dict[str, GameState], rtype: int, r: _Reader):
+    """Replay one log record onto `games`, mirroring what the handlers in main.py did (and bumping versions)."""
+    code = r.s()
+    if rtype == CREATED:
+        games[code] = GameState(code, r.raw(r.u16()))
+        return
+    game = games.get(code)
+    if game is None:
+        return  # ended before the snapshot this log continues from
+    if rtype not in (ADVANCED, ENDED):
+        game.version += 1
+    if rtype == JOINED:
+        sid, name, user_id, token = r.s(), r.s(), r.i32(), r.s()
+        player = game.players[sid] = PlayerState(sid, name, None if user_id < 0 else user_id)
+        player.token = token
+        game.turn_order.append(sid)
+    elif rtype == LEFT:
+        sid = r.s()
+        player = game.players.pop(sid)
+        game.turn_order.remove(sid)
+        if player.words:
+            game.board.changed()
+    elif rtype == STARTED:
+        game.started = True
+    elif rtype == DRAWN:
+        game.players[r.s()].add_letter(game.draw_tile())
+    elif rtype == FORMED:
+        sid, word_id, word = r.s(), r.u32(), r.s()
+        player = game.players[sid]
+        letters.consume(player.hand, letters.counts(word))
+        player.words[word_id] = word
+        game.last_word_id = max(game.last_word_id, word_id)
+        game.history.append((sid, word_id, word, False))
+        game.board.changed()
+    elif rtype == STOLEN:
+        sid, victim, base_word_id, word_id, word = r.s(), r.s(), r.u32(), r.u32(), r.s()
+        player = game.players[sid]
+        base_word = game.players[victim].words.pop(base_word_id)
+        letters.consume(player.hand, letters.diff(letters.counts(word), letters.counts(base_word)))
+        player.words[word_id] = word
+        game.last_word_id = max(game.last_word_id, word_id)
+        game.history.append((sid, word_id, word, True))
+        game.board.changed()
+    elif rtype == ADVANCED:
+        game.no_move_turns = r.u16()
+        game.turn_order.advance()
+    elif rtype == RESUMED:
+        game.rename_player(r.s(), r.s())
+    elif rtype == ENDED:
+        del games[code]
+
+
+class GameJournal:
+    """Writes the journal for this worker's games and restores them at boot."""
+    def __init__(self, directory: Optional[str] = JOURNAL_DIR, flush_interval: float = JOURNAL_FLUSH_INTERVAL,
+                 snapshot_interval: float = JOURNAL_SNAPSHOT_INTERVAL, fsync: bool = JOURNAL_FSYNC):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+        self.enabled = bool(directory)
+        self._games: Dict[str, GameState] = {}
+        self._buf = bytearray()
+        self._seq = 0
+        self._file = None
+        self._task: Optional[asyncio.Task] = None
+        self._encoded: Dict[str, bytes] = {}  # code -> encode_game() bytes from the last snapshot
+        self._dirty: Set[str] = set()        # codes changed since then
+        self._last_snapshot = 0.0
+        # Counters
+        self.records = 0
+        self.bytes_written = 0
+        self.snapshots = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {"records": self.records, "bytes_written": self.bytes_written, "snapshots": self.snapshots,
+                "buffered": len(self._buf), "segment": self._seq}
+
+    # Files
+    def _path(self, kind: str, seq: int) -> str:
+        return os.path.join(self.directory, f"{kind}-{seq:08d}.{'log' if kind == 'journal' else 'bin'}")
+
+    def _listing(self, kind: str) -> List[int]:
+        prefix = f"{kind}-"
+        return sorted(int(name[len(prefix):len(prefix) + 8]) for name in os.listdir(self.directory)
+                      if name.startswith(prefix) and not name.endswith(".tmp"))
+
+    # Boot
+    async def open(self, games: Dict[str, GameState]) -> List[str]:
+        """Restore journaled games into `games`, start a fresh segment and return the restored codes."""
+        self._games = games
+        if not self.enabled:
+            return []
+        os.makedirs(self.directory, exist_ok=True)
+        t0 = time.perf_counter()
+        restored = await asyncio.to_thread(self._load)
+        for code, game in restored.items():
+            if game.game_active and code not in games:
+                games[code] = game
+        segments = self._listing("journal")
+        self._seq = (segments[-1] if segments else 0) + 1
+        self._file = open(self._path("journal", self._seq), "ab")
+        self._dirty = set(games)
+        await self.snapshot()
+        self._task = asyncio.create_task(self._run())
+        logs.event("journal_restored", games=len(restored), seconds=round(time.perf_counter() - t0, 3))
+        return list(restored)
+
+    def _load(self) -> Dict[str, GameState]:
+        games: Dict[str, GameState] = {}
+        snapshots = self._listing("snapshot")
+        start = 0
+        if snapshots:
+            start = snapshots[-1]
+            with open(self._path("snapshot", start), "rb") as f:
+                data = f.read()
+            if not data.startswith(SNAPSHOT_MAGIC):
+                logs.event("journal_snapshot_unreadable", logging.ERROR, snapshot=start)
+            for rtype, r in iter_records(data[len(SNAPSHOT_MAGIC):] if data.startswith(SNAPSHOT_MAGIC) else b""):
+                if rtype != GAME:
+                    continue
+                try:
+                    game = decode_game(r)
+                except (IndexError, ValueError, struct.error) as e:
+                    # One unreadable game is lost; the others (and startup) go on
+                    logs.event("journal_game_unreadable", logging.ERROR, snapshot=start, error=repr(e))
+                    continue
+                games[game.code] = game
+        for seq in self._listing("journal"):
+            if seq < start:
+                continue
+            with open(self._path("journal", seq), "rb") as f:
+                data = f.read()
+            for rtype, r in iter_records(data):
+                try:
+                    apply(games, rtype, r)
+                except (KeyError, IndexError, ValueError, struct.error) as e:
+                    logs.event("journal_replay_skipped", segment=seq, type=rtype, error=repr(e))
+        return games
+
+    # Writing
+    def _append(self, code: str, rtype: int, body: bytes):
+        if self._file is None:
+            return
+        self._buf += _record(rtype, _s(code) + body)
+        self._dirty.add(code)
+        self.records += 1
+
+    @_recording
+    def created(self, game: GameState):
+        self._append(game.code, CREATED, _U16.pack(len(game.tile_bag)) + bytes(game.tile_bag))
+
+    @_recording
+    def joined(self, code: str, player: PlayerState):
+        user_id = -1 if player.user_id is None else player.user_id
+        self._append(code, JOINED, _s(player.sid) + _s(player.name) + _I32.pack(user_id) + _s(player.token))
+
+    @_recording
+    def left(self, code: str, sid: str):
+        self._append(code, LEFT, _s(sid))
+
+    @_recording
+    def started(self, code: str):
+        self._append(code, STARTED, b"")
+
+    @_recording
+    def drawn(self, code: str, sid: str):
+        self._append(code, DRAWN, _s(sid))
+
+    @_recording
+    def formed(self, code: str, sid: str, word_id: int, word: str):
+        self._append(code, FORMED, _s(sid) + _U32.pack(word_id) + _s(word))
+
+    @_recording
+    def stolen(self, code: str, sid: str, victim: str, base_word_id: int, word_id: int, word: str):
+        self._append(code, STOLEN, _s(sid) + _s(victim) + _U32.pack(base_word_id) + _U32.pack(word_id) + _s(word))
+
+    @_recording
+    def advanced(self, code: str, no_move_turns: int):
+        self._append(code, ADVANCED, _U16.pack(min(no_move_turns, 0xFFFF)))
+
+    @_recording
+    def resumed(self, code: str, old_sid: str, new_sid: str):
+        self._append(code, RESUMED, _s(old_sid) + _s(new_sid))
+
+    def ended(self, code: str):
+        self._append(code, ENDED, b"")
+        self._encoded.pop(code, None)
+
+    def _write(self, file, data: bytes, sync: bool):
+        file.write(data)
+        file.flush()
+        if sync:
+            os.fsync(file.fileno())
+
+    async def flush(self):
+        if self._buf and self._file is not None:
+            data, self._buf = bytes(self._buf), bytearray()
+            await asyncio.to_thread(self._write, self._file, data, self.fsync)
+            self.bytes_written += len(data)
+
+    async def snapshot(self):
+        """Rotate to a new segment and snapshot every live game; then drop what the snapshot replaces."""
+        if self._file is None:
+            return
+        # Everything up to here goes to the old segment; the snapshot captures the same instant
+        data, self._buf = bytes(self._buf), bytearray()
+        old_file, old_seq = self._file, self._seq
+        self._seq += 1
+        self._file = open(self._path("journal", self._seq), "ab")
+        for code in self._dirty:
+            game = self._games.get(code)
+            if game is not None and game.game_active:
+                self._encoded[code] = encode_game(game)
+        self._dirty = set()
+        for code in [c for c in self._encoded if c not in self._games]:
+            del self._encoded[code]
+        body = b"".join(self._encoded.values())
+        seq = self._seq
+        self._last_snapshot = time.monotonic()
+        await asyncio.to_thread(self._write_snapshot, old_file, data, seq, body)
+        self.bytes_written += len(data)
+        self.snapshots += 1
+
+    def _write_snapshot(self, old_file, tail: bytes, seq: int, body: bytes):
+        self._write(old_file, tail, True)
+        old_file.close()
+        path = self._path("snapshot", seq)
+        with open(path + ".tmp", "wb") as f:
+            f.write(SNAPSHOT_MAGIC + body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        for kind in ("journal", "snapshot"):
+            for old in self._listing(kind):
+                if old < seq:
+                    os.remove(self._path(kind, old))
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                if time.monotonic() - self._last_snapshot >= self.snapshot_interval and self._dirty:
+                    await self.snapshot()
+                else:
+                    await self.flush()
+            except OSError as e:
+                logs.event("journal_write_failed", logging.ERROR, error=str(e))
+
+    async def close(self):
+        """Flush, take a final snapshot and stop (graceful shutdown)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._file is not None:
+            await self.snapshot()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,56 @@
+# backend/app/letters.py
+"""Letter multisets as 26-slot count vectors (index 0 = 'A'), as hands are stored and moves checked."""
+from typing import Iterable, List, Optional
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def counts(letters: Iterable[str]) -> Optional[bytearray]:
+    """Count vector for a word or a list of single-letter A-Z tiles; None if it isn't one (or has 256+ of a letter)."""
+    vec = bytearray(26)
+    try:
+        items = iter(letters)
+    except TypeError:
+        return None
+    for ch in items:
+        i = ord(ch) - 65 if isinstance(ch, str) and len(ch) == 1 else -1
+        if not 0 <= i < 26 or vec[i] == 255:
+            return None
+        vec[i] += 1
+    return vec
+
+
+def expand(vec: bytearray) -> List[str]:
+    """Letters of a count vector, in alphabetical order."""
+    return [ALPHABET[i] for i, n in enumerate(vec) for _ in range(n)]
+
+
+def add(vec: bytearray, letter: str):
+    i = ord(letter) - 65 if isinstance(letter, str) and len(letter) == 1 else -1
+    if not 0 <= i < 26:
+        raise ValueError(f"Not a tile letter: {letter!r}")
+    if vec[i] == 255:
+        raise ValueError(f"Count vector is full for {letter!r} (255 tiles)")
+    vec[i] += 1
+
+
+def has(hand: bytearray, need: bytearray) -> bool:
+    """True if `hand` holds every tile in `need`."""
+    return all(h >= n for h, n in zip(hand, need))
+
+
+def consume(hand: bytearray, need: bytearray):
+    """Remove `need` from `hand` in place. Callers check has() first."""
+    for i, n in enumerate(need):
+        if n:
+            hand[i] -= n
+
+
+def diff(new: bytearray, base: bytearray) -> Optional[bytearray]:
+    """Letters `new` adds on top of `base`, or None if `new` doesn't contain all of `base`."""
+    added = bytearray(26)
+    for i, (a, b) in enumerate(zip(new, base)):
+        if a < b:
+            return None
+        added[i] = a - b
+    return added
@@ -0,0 +1,136 @@
+# backend/app/lobbies.py
+"""Lobby codes and quick-match seating."""
+import secrets
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from .state import GameState
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+CODE_LENGTH = 5
+CODE_SPACE = len(ALPHABET) ** CODE_LENGTH  # 11,881,376 codes
+HALF_BITS = 12                             # Feistel halves: 2**24 >= CODE_SPACE
+HALF_MASK = (1 << HALF_BITS) - 1
+ROUNDS = 4
+
+
+def encode(n: int) -> str:
+    """Code number n (0 <= n < CODE_SPACE) as letters."""
+    chars = []
+    for _ in range(CODE_LENGTH):
+        n, digit = divmod(n, len(ALPHABET))
+        chars.append(ALPHABET[digit])
+    return "".join(chars)
+
+
+# Code i is a keyed Feistel permutation of i, so the shuffled pool is never stored and a code only
+# comes round again after all the others. Workers draw their own keys; create_game's cluster claim
+# catches the rare clash.
+class LobbyCodes:
+    """Unique lobby codes, in an order shuffled by a per-worker key."""
+    def __init__(self, key: Optional[int] = None):
+        key = secrets.randbits(64) if key is None else key
+        self._round_keys = [(key >> (16 * i)) & 0xFFFF for i in range(ROUNDS)]
+        self._next = 0
+        # Counters
+        self.issued = 0
+        self.skipped = 0  # codes passed over because a live game still held them
+
+    def _permute(self, x: int) -> int:
+        left, right = x >> HALF_BITS, x & HALF_MASK
+        for k in self._round_keys:
+            # Any round function makes a permutation; this one just has to scatter neighbours
+            h = ((right ^ k) * 0x45D9F3B) & 0xFFFFFFFF
+            left, right = right, left ^ ((h ^ (h >> 15)) & HALF_MASK)
+        return (left << HALF_BITS) | right
+
+    def code_at(self, i: int) -> str:
+        """The i-th code of the shuffled sequence (a bijection on 0..CODE_SPACE-1)."""
+        x = self._permute(i)
+        while x >= CODE_SPACE:  # cycle-walk back into range; ~1.4 rounds on average
+            x = self._permute(x)
+        return encode(x)
+
+    def allocate(self, taken: Callable[[str], bool]) -> Optional[str]:
+        """The next code in the sequence that `taken` says is free (None if every code is in use)."""
+        for _ in range(CODE_SPACE):
+            code = self.code_at(self._next)
+            self._next = (self._next + 1) % CODE_SPACE
+            if not taken(code):
+                self.issued += 1
+                return code
+            self.skipped += 1
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {"issued": self.issued, "skipped": self.skipped}
+
+
+# take() fills the fullest lobby first, so lobbies start rather than spreading players thin. main.py calls
+# update() after every join, leave and start. Not journaled: restored lobbies come back private.
+class OpenLobbies:
+    """Public lobbies with a free seat, bucketed by seats taken."""
+    def __init__(self, max_players: int):
+        self.max_players = max_players
+        # buckets[n]: codes of lobbies with n seats taken, in the order they got there (OrderedDict:
+        # a plain dict's first key gets slower to find as keys are deleted from the front)
+        self.buckets: List["OrderedDict[str, None]"] = [OrderedDict() for _ in range(max_players)]
+        self._seats: Dict[str, List[int]] = {}  # code -> [players seated, seats promised by take()]
+        self._open: Dict[str, bool] = {}         # code -> not started or ended, for public lobbies
+        self._bucket: Dict[str, int] = {}        # code -> bucket it's listed in
+        # Counters
+        self.taken = 0
+
+    def __len__(self) -> int:
+        return len(self._bucket)
+
+    def add(self, game: GameState):
+        """List a new public lobby."""
+        self._seats[game.code] = [0, 0]
+        self.update(game)
+
+    def update(self, game: GameState):
+        """Re-bucket a public lobby after a join, leave or start (no-op for private games)."""
+        seats = self._seats.get(game.code)
+        if seats is None:
+            return
+        seats[0] = len(game.players)
+        self._open[game.code] = game.game_active and not game.started
+        self._place(game.code)
+
+    def remove(self, code: str):
+        self._seats.pop(code, None)
+        self._open.pop(code, None)
+        self._place(code)
+
+    def take(self) -> Optional[str]:
+        """Promise a seat in the fullest open lobby; the caller joins it, then calls release(code)."""
+        for n in range(self.max_players - 1, 0, -1):
+            bucket = self.buckets[n]
+            if bucket:
+                code = next(iter(bucket))
+                self._seats[code][1] += 1
+                self._place(code)
+                self.taken += 1
+                return code
+        return None
+
+    def release(self, code: str):
+        """The join for a seat promised by take() has run (whether it seated anyone or not)."""
+        seats = self._seats.get(code)
+        if seats is not None:  # else discarded meanwhile
+            seats[1] -= 1
+            self._place(code)
+
+    def _place(self, code: str):
+        old = self._bucket.pop(code, None)
+        if old is not None:
+            del self.buckets[old][code]
+        if self._open.get(code):
+            taken = sum(self._seats[code])
+            if 0 < taken < self.max_players:
+                self.buckets[taken][code] = None
+                self._bucket[code] = taken
+
+    def stats(self) -> Dict[str, object]:
+        return {"open": len(self._bucket), "by_seats": [len(b) for b in self.buckets[1:]], "taken": self.taken}
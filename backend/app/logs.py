@@ -0,0 +1,168 @@
+# backend/app/logs.py
+"""Structured JSON logging through a bounded queue that a writer thread drains, so logging never blocks the loop."""
+import atexit
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler
+from typing import Deque, Dict, Optional
+
+from . import metrics
+
+
+def _rates(spec: str) -> Dict[str, float]:
+    """Parse "event=value,event=value" into a dict."""
+    rates: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip():
+            rates[name.strip()] = float(value)
+    return rates
+
+
+# Environment configuration
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")                   # or "text" for local development
+LOG_SAMPLE = _rates(os.environ.get("LOG_SAMPLE", ""))               # event=fraction of its records kept
+LOG_RATE_LIMIT = _rates(os.environ.get("LOG_RATE_LIMIT", "chat_message=20,tile_flipped=50"))  # event=records/s
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))     # records queued before new ones are dropped
+LOG_FLUSH_INTERVAL = float(os.environ.get("LOG_FLUSH_INTERVAL", "0.1"))  # seconds between writes
+
+logger = logging.getLogger("bamandagrams")
+suppressed = metrics.Counter("log_records_suppressed_total", "Log records not written", ["reason"])
+
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, event, then the record's fields."""
+    def format(self, record: logging.LogRecord) -> str:
+        out = {"ts": round(record.created, 3), "level": record.levelname, "event": record.getMessage()}
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                out[key] = value
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{k}={v}" for k, v in vars(record).items() if k not in _RESERVED)
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:5s} {record.getMessage()} {fields}"
+        return f"{line}\n{record.exc_text}" if record.exc_text else line
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Appends to a deque (thread-safe, never blocks); the writer thread drains it."""
+    def __init__(self, records: Deque[logging.LogRecord], maxsize: int):
+        super().__init__(records)
+        self.maxsize = maxsize
+
+    def enqueue(self, record: logging.LogRecord):
+        if len(self.queue) >= self.maxsize:
+            suppressed.inc("queue_full")
+            return
+        self.queue.append(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread; just make the record safe to hand over
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _RateLimit:
+    """Token bucket: `rate` records per second, bursts of up to `rate`."""
+    __slots__ = ("rate", "tokens", "stamp")
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.stamp = time.monotonic()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class _Writer(threading.Thread):
+    """Background thread that periodically formats and writes queued records."""
+    def __init__(self, records: Deque[logging.LogRecord], formatter: logging.Formatter, stream=None):
+        super().__init__(name="log-writer", daemon=True)
+        self.records = records
+        self.formatter = formatter
+        self.stream = stream or sys.stdout
+        self.stopping = threading.Event()
+
+    def run(self):
+        while not self.stopping.wait(LOG_FLUSH_INTERVAL):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        lines = []
+        while self.records:
+            lines.append(self.formatter.format(self.records.popleft()))
+        if lines:
+            try:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            except (OSError, ValueError):
+                pass  # stdout closed; nothing sensible left to do
+
+
+_limits = {name: _RateLimit(rate) for name, rate in LOG_RATE_LIMIT.items()}
+_writer: Optional[_Writer] = None
+
+
+def setup():
+    """Route the app's logger through the queue; safe to call more than once."""
+    global _writer
+    if _writer is not None:
+        return
+    records: Deque[logging.LogRecord] = deque()
+    logger.addHandler(_NonBlockingQueueHandler(records, LOG_QUEUE_SIZE))
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    _writer = _Writer(records, JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+    _writer.start()
+    atexit.register(shutdown)
+
+
+def shutdown():
+    """Write out whatever is still queued and stop the writer thread."""
+    global _writer
+    if _writer is not None:
+        _writer.stopping.set()
+        _writer.join()
+        _writer = None
+
+
+def event(name: str, level: int = logging.INFO, exc_info=None, **fields):
+    """Log `name` with structured fields (code=..., sid=..., ...), subject to sampling and rate limits."""
+    if not logger.isEnabledFor(level):
+        return
+    if level < logging.WARNING:
+        rate = LOG_SAMPLE.get(name)
+        if rate is not None and random.random() >= rate:
+            suppressed.inc("sampled")
+            return
+        limit = _limits.get(name)
+        if limit is not None and not limit.allow():
+            suppressed.inc("rate_limited")
+            return
+    logger.log(level, name, exc_info=exc_info, extra=fields)
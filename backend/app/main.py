@@ -2,29 +2,60 @@
 import os
 import asyncio
 import secrets
-from typing import Dict, List, Optional
+import time
+import functools
+import logging
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 
+import jwt
 import socketio
-from fastapi import FastAPI, WebSocketException, Depends, HTTPException, status
+from fastapi import FastAPI, WebSocketException, Depends, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.websockets import WebSocketDisconnect
 
 from . import models, schemas, crud  # import ORM models, Pydantic schemas, DB CRUD ops (defined in other modules)
+from . import dictionary, anagram, letters, cluster, passwords, export, metrics, logs, wire, ratelimit, warmup, solver
+from .state import BOT_SID_PREFIX, GameState, PlayerState
+from .scheduler import TimerScheduler
+from .outbound import RoomDispatcher
+from .actor import GameActors
+from .persistence import MatchWriter, match_record
+from .journal import GameJournal
+from .reaper import GameReaper
+from .lobbies import LobbyCodes, OpenLobbies
 
 # Environment configuration
 WEB_ORIGIN = os.environ.get("WEB_ORIGIN", "*")  # Allowed front-end origin (use '*' for dev)
 ENABLE_FX = os.environ.get("ENABLE_FX", "0") == "1"  # Feature flag: enable animations/sounds
-JWT_SECRET = os.environ.get("JWT_SECRET", "super-secret")  # JWT signing key (set via env in prod)
-JWT_ALGORITHM = "HS256"
 TURN_TIMEOUT = 30  # seconds for turn timeout
 NO_MOVE_ROUNDS_TO_END = 3  # end after 3 full rounds of no moves
+RESUME_GRACE = float(os.environ.get("RESUME_GRACE", "20"))     # seconds a dropped player's seat is held (0: leave at once)
+RESTORE_GRACE = float(os.environ.get("RESTORE_GRACE", "120"))  # seconds restored players get to reconnect after a restart
+MAX_PLAYERS = 5  # seats per game
+MAX_NAME_LENGTH = 24  # characters in a player's display name
+BOT_THINK_TIME = float(os.environ.get("BOT_THINK_TIME", "2"))   # seconds a bot waits before moving
+BOT_BUDGET_MS = float(os.environ.get("BOT_BUDGET_MS", "10"))    # solver time per bot move (see solver.py)
+FIND_STEALS_BUDGET_MS = float(os.environ.get("FIND_STEALS_BUDGET_MS", "25"))  # search time per find_steals call
+BOT_NAMES = ["Ada", "Bix", "Cog", "Dot", "Eli", "Fay", "Gus", "Hal"]
+QUICK_MATCH_ATTEMPTS = 3  # open lobbies quick_match tries before opening a new one
+
+# JSON logs, written from a background thread (see logs.py for LOG_* settings)
+logs.setup()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Runs start_up() before the app serves and shut_down() after (both defined below)."""
+    await start_up()
+    yield
+    await shut_down()
 
 # FastAPI app and Socket.IO server initialization
-fastapi_app = FastAPI(title="BamandaGrams API", version="1.0.0")
+fastapi_app = FastAPI(title="BamandaGrams API", version="1.0.0", lifespan=lifespan)
 # Enable CORS for the front-end origin (and allow WebSocket upgrades)
 fastapi_app.add_middleware(
     CORSMiddleware,
@@ -33,43 +64,157 @@ fastapi_app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route latency histograms and 5xx counts (see /metrics)
+metrics.instrument_fastapi(fastapi_app)
 
 # Create Socket.IO Async server
-sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins=[WEB_ORIGIN] if WEB_ORIGIN != "*" else "*")
+# (with REDIS_URL set, the client manager fans emits out to sockets on every worker;
+# each connection is answered in msgpack or JSON, whichever it speaks - see wire.py)
+sio = wire.WireServer(async_mode="asgi", cors_allowed_origins=[WEB_ORIGIN] if WEB_ORIGIN != "*" else "*",
+                           client_manager=cluster.client_manager())
 # Wrap FastAPI app with Socket.IO ASGI app
 app = socketio.ASGIApp(sio, fastapi_app)  # 'app' is the ASGI application Uvicorn will run
 
 # In-memory game session store
-games: Dict[str, "GameState"] = {}
-
-class GameState:
-    """In-memory state of an active game."""
-    def __init__(self, code: str):
-        self.code = code
-        # Generate a shuffled bag of 144 tiles (same distribution as Bananagrams)
-        tile_counts = {
-            'A': 13, 'B': 3, 'C': 3, 'D': 6, 'E': 18, 'F': 3, 'G': 4, 'H': 3,
-            'I': 12, 'J': 2, 'K': 2, 'L': 5, 'M': 3, 'N': 8, 'O': 11, 'P': 3,
-            'Q': 2, 'R': 9, 'S': 6, 'T': 9, 'U': 6, 'V': 3, 'W': 3, 'X': 2,
-            'Y': 3, 'Z': 2
-        }
-        # Create the tile bag as a list of letters and shuffle it
-        self.tile_bag: List[str] = [letter for letter, count in tile_counts.items() for _ in range(count)]
-        secrets.SystemRandom().shuffle(self.tile_bag)
-        self.players: Dict[str, "PlayerState"] = {}  # key: sid (socket id), value: player state
-        self.turn_order: List[str] = []              # list of player sids in turn sequence
-        self.current_turn_index: int = 0
-        self.no_move_turns: int = 0                  # count of consecutive turns with no action
-        self.last_action_time: datetime = datetime.utcnow()
-        self.game_active: bool = True
-
-class PlayerState:
-    def __init__(self, sid: str, name: str, user_id: Optional[int] = None):
-        self.sid = sid
-        self.name = name
-        self.user_id = user_id  # user id if logged in, else None (guest)
-        self.letters: List[str] = []   # letters in hand (not yet used in placed words)
-        self.words: Dict[str, str] = {} # word_id -> word text for words this player has on the board
+games: Dict[str, GameState] = {}
+# Reverse index: sid -> (game code, player state) for every seated player
+sessions: Dict[str, Tuple[str, PlayerState]] = {}
+# sid -> lobby code, for sockets on this worker seated in a lobby owned by another worker
+remote_sessions: Dict[str, str] = {}
+# Broadcasts are queued per game and sent in the background, so handlers never wait on slow clients
+outbound = RoomDispatcher(sio)
+# One background task drives every game's turn timer (keyed by game code)
+turn_timers = TimerScheduler()
+# sid -> user id for sockets that connected with a valid login token (guests are absent)
+socket_users: Dict[str, int] = {}
+# Every command that reads or mutates a game runs on that game's actor, one at a time
+actors = GameActors()
+# Finished matches are written to the database in batches, off the game's critical path
+match_writer = MatchWriter()
+# Every game mutation is journaled (with JOURNAL_DIR set) so live games survive a restart
+journal = GameJournal()
+# Token buckets for chat and move events (per sid and per room) and for connects (per IP)
+event_limits = ratelimit.EventLimits()
+connect_limits = ratelimit.ConnectLimiter()
+# Expires idle games and keeps `games` within MAX_GAMES and the memory budget (see reaper.py)
+game_reaper = GameReaper(games, lambda code, reason, stamp: in_game(code, expire_game, code, reason, stamp))
+# Background task feeding metrics.loop_lag (started with the app)
+loop_lag_sampler: Optional[asyncio.Task] = None
+# Word list, DB pool and crypto, loaded in the background at startup; /ready reports when it's done
+warm_up = warmup.WarmUp()
+warm_up_task: Optional[asyncio.Task] = None
+# Lobby codes come from a shuffled sequence that never repeats (see lobbies.py)
+lobby_codes = LobbyCodes()
+# Public lobbies with a free seat, bucketed by seats taken, for quick_match
+open_lobbies = OpenLobbies(MAX_PLAYERS)
+
+# Lobby events that another worker may forward here (handler name -> undecorated handler)
+_routed_handlers: Dict[str, Callable] = {}
+# Handlers that seat a player: forwarded calls carry whether the socket is seated anywhere already
+_seating_handlers = {"handle_join_game", "handle_resume_game"}
+
+def routed(handler):
+    """Run a lobby event on the worker that owns the lobby, forwarding it there if needed."""
+    _routed_handlers[handler.__name__] = handler
+    @functools.wraps(handler)
+    async def wrapper(sid, data):
+        code = data.get("code") if isinstance(data, dict) else None
+        if isinstance(data, dict):
+            # Identity comes from the socket's worker, never from the client's payload
+            data = dict(data, user_id=socket_users.get(sid))
+            data.pop("seated", None)
+        if code and code not in games:
+            owner = await cluster.backend.owner(code)
+            if owner and owner != cluster.NODE_ID:
+                if handler.__name__ in _seating_handlers and isinstance(data, dict):
+                    # The owner only knows its own sessions; this worker knows where the socket sits
+                    data["seated"] = await seated(sid)
+                result = await cluster.backend.call(owner, handler.__name__, sid, data)
+                if isinstance(result, dict) and result.get("code") == code and "error" not in result:
+                    # Seated in a remote lobby: this worker holds the socket, so it holds the room membership
+                    sio.enter_room(sid, f"room/{code}")
+                    remote_sessions[sid] = code
+                return result
+        return await in_game(code, handler, sid, data)
+    return wrapper
+
+def rate_limited(event: str):
+    """Turn `event` away with a cheap ack when its sender or room is over the limit (see ratelimit.py)."""
+    def decorate(handler):
+        @functools.wraps(handler)
+        async def wrapper(sid, data):
+            code = data.get("code") if isinstance(data, dict) else None
+            wait = event_limits.check(event, sid, code)
+            if wait:
+                return {"error": "Too many requests", "retry_after": round(wait, 2)}
+            return await handler(sid, data)
+        return wrapper
+    return decorate
+
+async def dispatch_routed(event: str, sid: str, data):
+    """Entry point for lobby events forwarded from another worker."""
+    handler = _routed_handlers.get(event)
+    if handler is None:
+        return {"error": f"Unknown event {event}"}
+    code = data.get("code") if isinstance(data, dict) else None
+    return await in_game(code, handler, sid, data)
+
+def in_game(code: Optional[str], fn: Callable, *args):
+    """Run fn(*args) on the game's actor, after any commands already queued for that game."""
+    if code in games:
+        return actors.submit(code, fn, *args)
+    return fn(*args)  # no such game: nothing to serialize against
+
+async def seated(sid: str) -> bool:
+    """Whether the socket holds a seat, in a lobby on this worker or (asking its owner) on another one."""
+    if sid in sessions:
+        return True
+    code = remote_sessions.get(sid)
+    if code is None:
+        return False
+    owner = await cluster.backend.owner(code)
+    if owner and owner != cluster.NODE_ID and await cluster.backend.call(owner, "is_seated", sid, {"code": code}):
+        return True
+    remote_sessions.pop(sid, None)  # that game is over, or the seat was given up
+    return False
+
+async def is_seated(sid, data) -> bool:
+    """Whether sid holds a seat in lobby data["code"] (asked by the worker holding the socket)."""
+    entry = sessions.get(sid)
+    return bool(entry and entry[0] == data.get("code"))
+
+def join_room(sid: str, code: str):
+    # Sockets connected to another worker join the room there (see routed)
+    if sio.manager.is_connected(sid, "/"):
+        sio.enter_room(sid, f"room/{code}")
+
+def broadcast_change(game: GameState, event: str, data: dict):
+    """Emit a change to the game's state, stamped with its new version (clients that see a gap call sync)."""
+    outbound.emit(game.code, event, game.record_change(event, data))
+
+def game_view(game: GameState, sid: str) -> dict:
+    """Everything a client needs to draw the game from scratch, as seen by `sid`."""
+    player = game.players.get(sid)
+    return {"v": game.version, "started": game.started, "current": game.turn_order.current,
+            "tiles_left": len(game.tile_bag), "hand": player.letters if player else [], "players": [
+                {"sid": pid, "name": p.name, "words": [{"word_id": wid, "word": w} for wid, w in p.words.items()]}
+                for pid, p in game.players.items()
+            ]}
+
+def catch_up(game: GameState, sid: str, since) -> dict:
+    """Just the changes a client missed after version `since`, or the full view if they're not all kept."""
+    changes = game.changes_since(since) if isinstance(since, int) else None
+    if changes is None:
+        return {"v": game.version, "state": game_view(game, sid)}
+    return {"v": game.version, "changes": [[event, data] for event, data in changes]}
+
+def player_name(data: dict) -> Optional[str]:
+    """The display name from a create/join payload ("Player" if absent), or None if it isn't usable."""
+    name = data.get("name", "Player")
+    if not isinstance(name, str):
+        return None
+    name = name.strip()
+    return name if 0 < len(name) <= MAX_NAME_LENGTH else None
 
 # Helper: Get current game from code
 def get_game(code: str) -> GameState:
@@ -78,17 +223,16 @@ def get_game(code: str) -> GameState:
         raise WebSocketDisconnect()
     return game
 
-# Background task to enforce turn timeout
-async def turn_timer_task(game_code: str, turn_index: int, start_time: datetime):
-    await asyncio.sleep(TURN_TIMEOUT)
+# Turn timer callback, fired by turn_timers when a player runs out of time
+async def turn_timeout(game_code: str, turn: int):
     game = games.get(game_code)
     if not game or not game.game_active:
         return
-    # If the turn has not advanced since start_time, force advance (timeout)
-    if game.current_turn_index == turn_index and game.last_action_time <= start_time:
+    # Any action reschedules the game's timer, so this is only a safety check
+    if game.turn_order.turn == turn:
         # Skip the current player's turn due to timeout
-        current_sid = game.turn_order[game.current_turn_index]
-        await sio.emit("turn_timeout", {"sid": current_sid}, room=f"room/{game_code}")
+        current_sid = game.turn_order.current
+        outbound.emit(game_code, "turn_timeout", {"sid": current_sid})
         # Advance to next player's turn
         await advance_turn(game_code, action_taken=False)
 
@@ -106,19 +250,48 @@ async def advance_turn(game_code: str, action_taken: bool):
     if game.no_move_turns >= len(game.turn_order) * NO_MOVE_ROUNDS_TO_END:
         await end_game(game_code)
         return
-    # Advance turn index
-    game.current_turn_index = (game.current_turn_index + 1) % len(game.turn_order)
-    game.last_action_time = datetime.utcnow()
-    next_sid = game.turn_order[game.current_turn_index]
-    # Notify the next player it's their turn
-    await sio.emit("your_turn", {}, room=next_sid)
-    # Start a new turn timer
-    asyncio.create_task(turn_timer_task(game_code, game.current_turn_index, game.last_action_time))
+    # Advance turn
+    journal.advanced(game_code, game.no_move_turns)
+    game.turn_order.advance()
+    await begin_turn(game)
+
+async def begin_turn(game: GameState):
+    """Notify the player whose turn it now is and (re)start the game's turn timer."""
+    game.last_action_time = time.monotonic()
+    turn_timers.schedule(game.code, TURN_TIMEOUT, in_game, game.code, turn_timeout, game.code, game.turn_order.turn)
+    current = game.players.get(game.turn_order.current)
+    if current is not None and current.is_bot:
+        turn_timers.schedule(("bot", game.code), BOT_THINK_TIME, in_game, game.code, bot_turn, game.code,
+                             game.turn_order.turn)
+    else:
+        outbound.emit(game.code, "your_turn", {}, to=game.turn_order.current)
+
+async def bot_turn(game_code: str, turn: int):
+    """Play a bot's turn: its best move from the solver, else flip a tile, else pass."""
+    game = games.get(game_code)
+    if not game or not game.game_active or game.turn_order.turn != turn:
+        return
+    sid = game.turn_order.current
+    move = solver.best_move(game, sid, BOT_BUDGET_MS)
+    # The undecorated handlers: validated like a player's move, without re-queueing on this game's actor
+    if move is None:
+        result = None
+    elif move["type"] == "form":
+        result = await _routed_handlers["handle_form_word"](
+            sid, {"code": game_code, "word": move["word"], "tiles": list(move["word"])})
+    else:
+        result = await _routed_handlers["handle_steal_word"](sid, {
+            "code": game_code, "targetPlayerId": move["targetPlayerId"], "baseWordId": move["baseWordId"],
+            "newWord": move["word"]})
+    if result is None or "error" in result:
+        if game.tile_bag:
+            await _routed_handlers["handle_flip_tile"](sid, {"code": game_code})
+        else:
+            await advance_turn(game_code, action_taken=False)
 
 async def end_game(game_code: str):
     """End the game, calculate scores, persist results, and notify players."""
     game = get_game(game_code)
-    game.game_active = False
     # Calculate final scores: sum of (length^2) for each word a player has
     results = []
     for sid, pstate in game.players.items():
@@ -126,228 +299,441 @@ async def end_game(game_code: str):
         results.append({"name": pstate.name, "score": score})
     # Rank the results by score (simple sorting, higher is better)
     results.sort(key=lambda r: r["score"], reverse=True)
-    # Persist match results to DB (async)
-    try:
-        async with models.SessionLocal() as db_sess:  # AsyncSession from models.py
-            match = await crud.save_match_results(db_sess, game, results)
-    except Exception as e:
-        print(f"DB Error saving results: {e}")
+    # Persist match results and word history to DB (queued; written in the background).
+    # A lobby that ends before it starts (its other players left) was never a match.
+    if game.started:
+        match_writer.enqueue(match_record(game))
     # Broadcast game over event with scoreboard
-    await sio.emit("game_over", {"results": results}, room=f"room/{game_code}")
+    outbound.emit(game_code, "game_over", {"results": results})
     # Remove game from memory
-    games.pop(game_code, None)
+    await discard_game(game)
+
+async def expire_game(game_code: str, reason: str, last_action_time: float) -> bool:
+    """Drop a game the reaper picked (idle, or evicted for memory) without saving it: it never finished."""
+    game = games.get(game_code)
+    if game is None or game.last_action_time != last_action_time:
+        return False  # ended, or played on since the sweep looked at it
+    outbound.emit(game_code, "game_expired", {"reason": reason})
+    logs.event("game_expired", code=game_code, reason=reason, players=len(game.players), started=game.started)
+    await discard_game(game)
+    return True
+
+async def discard_game(game: GameState):
+    """Forget a finished or expired game: its timers, its players' sessions, its actor and its code."""
+    game.game_active = False
+    turn_timers.cancel(game.code)
+    turn_timers.cancel(("bot", game.code))
+    journal.ended(game.code)
+    for sid in game.players:
+        sessions.pop(sid, None)
+        turn_timers.cancel(("leave", sid))
+    games.pop(game.code, None)
+    open_lobbies.remove(game.code)
+    actors.discard(game.code)
+    event_limits.forget_room(game.code)
+    await cluster.backend.release(game.code)
 
 # Socket.IO Event Handlers
 @sio.event
-async def connect(sid, environ, auth):
+async def connect(sid, environ, auth=None):
     """New socket connection established."""
+    if not warm_up.ready:
+        raise socketio.exceptions.ConnectionRefusedError("Server is starting, try again shortly")
+    if not connect_limits.allow(environ):
+        raise socketio.exceptions.ConnectionRefusedError("Too many connections, try again shortly")
     # Basic origin check (prevent unknown origins if WebSocket sends it)
     origin = environ.get('HTTP_ORIGIN', '')
     if WEB_ORIGIN != "*" and WEB_ORIGIN not in origin:
-        print(f"Rejecting connection from origin: {origin}")
+        logs.event("socket_rejected", logging.WARNING, sid=sid, origin=origin)
         return False  # reject connection
-    print(f"Socket connected: {sid}")
+    # Logged-in clients pass their JWT as auth={"token": ...}; anyone else plays as a guest
+    token = auth.get("token") if isinstance(auth, dict) else None
+    user = await crud.user_from_token(token) if token else None
+    if user:
+        socket_users[sid] = user.id
+    logs.event("socket_connected", sid=sid, user_id=socket_users.get(sid))
     return True
 
 @sio.event
 async def disconnect(sid):
     """Socket disconnected. If player was in a game, notify others."""
-    # Find if this sid was in any game
-    for game in list(games.values()):
-        if sid in game.players:
-            player = game.players.pop(sid)
-            game.turn_order = [s for s in game.turn_order if s != sid]
-            # Notify remaining players
-            await sio.emit("player_left", {"sid": sid, "name": player.name}, room=f"room/{game.code}")
-            # If game still active but only one or zero players remain, end it early
-            if game.game_active and len(game.turn_order) < 2:
-                await end_game(game.code)
-    print(f"Socket disconnected: {sid}")
+    socket_users.pop(sid, None)
+    event_limits.forget_sid(sid)
+    code = remote_sessions.pop(sid, None)
+    owner = await cluster.backend.owner(code) if code else None
+    if owner and owner != cluster.NODE_ID:
+        await cluster.backend.call(owner, "player_disconnected", sid, {"code": code})
+    else:
+        entry = sessions.get(sid)
+        code = entry[0] if entry else None
+        await in_game(code, player_disconnected, sid, None)
+    logs.event("socket_disconnected", sid=sid, code=code)
+
+async def player_disconnected(sid, data, grace: float = RESUME_GRACE):
+    """Hold a dropped player's seat for `grace` seconds (see resume_game), then remove them."""
+    entry = sessions.get(sid)
+    if not entry:
+        return
+    if grace <= 0 or not games.get(entry[0]):
+        await remove_player(sid, data)
+        return
+    turn_timers.schedule(("leave", sid), grace, in_game, entry[0], remove_player, sid, None)
+
+async def remove_player(sid, data):
+    """Take a departed player out of their game (on the worker that owns it)."""
+    entry = sessions.pop(sid, None)
+    game = games.get(entry[0]) if entry else None
+    turn_timers.cancel(("leave", sid))
+    if game and sid in game.players:
+        player = game.players.pop(sid)
+        had_turn = game.turn_order.current == sid
+        game.turn_order.remove(sid)
+        journal.left(game.code, sid)
+        if player.words:
+            game.board.changed()
+        # Notify remaining players
+        broadcast_change(game, "player_left", {"sid": sid, "name": player.name})
+        open_lobbies.update(game)
+        # If game still active but only one or zero players (or only bots) remain, end it early
+        if game.game_active and (len(game.turn_order) < 2 or all(p.is_bot for p in game.players.values())):
+            await end_game(game.code)
+        elif game.game_active and game.started and had_turn:
+            # The leaver held the turn: hand it to the next player
+            await begin_turn(game)
+
+_routed_handlers["remove_player"] = remove_player
+_routed_handlers["player_disconnected"] = player_disconnected
+_routed_handlers["is_seated"] = is_seated
 
 @sio.on("create_game")
 async def handle_create_game(sid, data):
     """Create a new game lobby and join the creator to it."""
-    name = data.get("name", "Player")
-    # Generate a unique 5-letter lobby code
+    # Validate before touching any state, so a bad payload can't leave a half-made lobby
+    name = player_name(data)
+    if name is None:
+        return {"error": f"Name must be 1-{MAX_NAME_LENGTH} characters"}
+    if await seated(sid):
+        return {"error": "Already in a game"}
+    if not game_reaper.has_room():
+        return {"error": "Server is full, try again later"}
+    # Take the next unused 5-letter lobby code
+    # (claiming it cluster-wide pins the lobby to this worker; another worker may hold it already)
     code = None
     for _ in range(5):
-        code = ''.join(secrets.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(5))
-        if code not in games:
+        code = lobby_codes.allocate(games.__contains__)
+        if code and await cluster.backend.claim(code):
             break
-    if not code or code in games:
+        code = None
+    if not code:
         return {"error": "Could not generate lobby code"}
     # Create game state and add creator
     game = GameState(code=code)
     games[code] = game
     # Create player state for lobby creator
-    player = PlayerState(sid=sid, name=name)
+    player = PlayerState(sid=sid, name=name, user_id=socket_users.get(sid))
     game.players[sid] = player
     game.turn_order.append(sid)
+    sessions[sid] = (code, player)
+    journal.created(game)
+    journal.joined(code, player)
+    if data.get("public"):
+        open_lobbies.add(game)  # strangers may be seated here by quick_match
     # Join the socket.io room for this game
-    sio.enter_room(sid, f"room/{code}")
-    print(f"Game created: {code} by {name} ({sid})")
-    # Notify creator with the lobby code and initial state
-    return {"code": code, "player": {"sid": sid, "name": name}}
+    join_room(sid, code)
+    broadcast_change(game, "player_joined", {"sid": sid, "name": name})
+    logs.event("game_created", code=code, sid=sid, player=name)
+    # Notify creator with the lobby code and initial state (the token is for resume_game)
+    return {"code": code, "player": {"sid": sid, "name": name}, "token": player.token, "v": game.version}
 
 @sio.on("join_game")
+@routed
 async def handle_join_game(sid, data):
     """Join an existing game lobby via code."""
     code = data.get("code")
-    name = data.get("name", "Player")
+    name = player_name(data)
+    if name is None:
+        return {"error": f"Name must be 1-{MAX_NAME_LENGTH} characters"}
     game = games.get(code)
-    if not game or not game.game_active or len(game.players) >= 5:
+    if not game or not game.game_active or len(game.players) >= MAX_PLAYERS:
         return {"error": "Cannot join game (invalid code or game full/started)"}
+    if data.get("seated") or await seated(sid):
+        return {"error": "Already in a game"}
     # Add new player
-    player = PlayerState(sid=sid, name=name)
+    player = PlayerState(sid=sid, name=name, user_id=data.get("user_id"))
     game.players[sid] = player
     game.turn_order.append(sid)
-    sio.enter_room(sid, f"room/{code}")
+    sessions[sid] = (code, player)
+    journal.joined(code, player)
+    game.last_action_time = time.monotonic()  # lobby activity holds off the idle reaper
+    open_lobbies.update(game)
+    join_room(sid, code)
     # Broadcast to lobby that a new player joined
-    await sio.emit("player_joined", {"sid": sid, "name": name}, room=f"room/{code}")
-    print(f"Player {name} joined game {code}")
-    return {"code": code, "player": {"sid": sid, "name": name}, "players": [
-        {"sid": pid, "name": pstate.name} for pid, pstate in game.players.items()
-    ]}
+    broadcast_change(game, "player_joined", {"sid": sid, "name": name})
+    logs.event("player_joined", code=code, sid=sid, player=name)
+    # The roster is sent once, to the new player; everyone else just gets the player_joined change
+    return {"code": code, "player": {"sid": sid, "name": name}, "token": player.token, "v": game.version,
+            "players": [{"sid": pid, "name": pstate.name} for pid, pstate in game.players.items()]}
+
+@sio.on("quick_match")
+async def handle_quick_match(sid, data):
+    """Seat the player in the fullest open public lobby on this worker, or open a new public lobby."""
+    if await seated(sid):
+        return {"error": "Already in a game"}
+    data = dict(data or {}, user_id=socket_users.get(sid))
+    if player_name(data) is None:
+        return {"error": f"Name must be 1-{MAX_NAME_LENGTH} characters"}
+    for _ in range(QUICK_MATCH_ATTEMPTS):
+        code = open_lobbies.take()
+        if code is None:
+            break
+        try:
+            # Through the game's actor, like any other join; the seat is held in the index meanwhile
+            result = await in_game(code, _routed_handlers["handle_join_game"], sid, dict(data, code=code))
+        finally:
+            open_lobbies.release(code)
+        if "error" not in result:
+            return result
+        if sid in sessions:
+            return result  # seated elsewhere meanwhile
+    return await handle_create_game(sid, dict(data, public=True))
+
+@sio.on("resume_game")
+@routed
+async def handle_resume_game(sid, data):
+    """Take a seat back after a reconnect or server restart, using the token from create/join."""
+    code = data.get("code")
+    token = data.get("token")
+    game = games.get(code)
+    player = next((p for p in game.players.values() if p.token == token), None) if game and token else None
+    if not player or not game.game_active:
+        return {"error": "Cannot resume game"}
+    old_sid = player.sid
+    if old_sid != sid:
+        if data.get("seated") or await seated(sid):
+            return {"error": "Already in a game"}
+        turn_timers.cancel(("leave", old_sid))
+        sessions.pop(old_sid, None)
+        game.rename_player(old_sid, sid)
+        sessions[sid] = (code, player)
+        journal.resumed(code, old_sid, sid)
+        broadcast_change(game, "player_resumed", {"old_sid": old_sid, "sid": sid, "name": player.name})
+        game.last_action_time = time.monotonic()
+        logs.event("player_resumed", code=code, sid=sid, old_sid=old_sid)
+    join_room(sid, code)
+    # Pass the last version seen as `since` to get only what changed while away
+    return dict(catch_up(game, sid, data.get("since")), code=code, player={"sid": sid, "name": player.name},
+                token=player.token)
+
+@sio.on("sync")
+@routed
+async def handle_sync(sid, data):
+    """Changes since the client's last seen version `since` (or the full view if too far behind)."""
+    code = data.get("code")
+    game = get_game(code)
+    if sid not in game.players:
+        return {"error": "Not in this game"}
+    return catch_up(game, sid, data.get("since"))
 
 @sio.on("start_game")
+@routed
 async def handle_start_game(sid, data):
     """Start the game (initial turn assignment and tile distribution)."""
     code = data.get("code")
     game = get_game(code)
-    if game.current_turn_index != 0 or not game.game_active:
+    if game.started or not game.game_active:
         return  # already started or ended
     # If less than 2 players, cannot start
     if len(game.players) < 2:
-        await sio.emit("error_message", {"error": "Need at least 2 players to start."}, to=sid)
+        outbound.emit(code, "error_message", {"error": "Need at least 2 players to start."}, to=sid)
         return
     # Deal initial letters to players (optional: could start with none, here give each 1 letter to start)
     for pid, pstate in game.players.items():
         if game.tile_bag:
-            letter = game.tile_bag.pop()
-            pstate.letters.append(letter)
+            letter = game.draw_tile()
+            pstate.add_letter(letter)
+            journal.drawn(code, pid)
             # Notify that player got a starting letter
-            await sio.emit("tile_flipped", {"sid": pid, "letter": letter}, room=f"room/{code}")
+            broadcast_change(game, "tile_flipped", {"sid": pid, "letter": letter})
+    game.started = True
+    journal.started(code)
+    open_lobbies.update(game)
     # Notify all players that the game is starting
-    await sio.emit("game_started", {}, room=f"room/{code}")
-    # Emit first turn
-    game.last_action_time = datetime.utcnow()
-    first_sid = game.turn_order[game.current_turn_index]
-    await sio.emit("your_turn", {}, room=first_sid)
-    # Start turn timer
-    asyncio.create_task(turn_timer_task(code, game.current_turn_index, game.last_action_time))
-    print(f"Game {code} started with players: {[p.name for p in game.players.values()]}")
+    broadcast_change(game, "game_started", {})
+    # Emit first turn and start its timer
+    await begin_turn(game)
+    logs.event("game_started", code=code, sid=sid, players=len(game.players))
 
 @sio.on("flip_tile")
+@rate_limited("flip_tile")
+@routed
 async def handle_flip_tile(sid, data):
     """Flip a new tile from the communal pile (active player's turn)."""
     code = data.get("code")
     game = get_game(code)
     # Ensure it's the requesting player's turn
-    if game.turn_order[game.current_turn_index] != sid:
+    if game.turn_order.current != sid:
         return {"error": "Not your turn"}
     if not game.tile_bag:
         return {"error": "No tiles left"}
     # Draw a tile
-    letter = game.tile_bag.pop()
-    game.players[sid].letters.append(letter)
+    letter = game.draw_tile()
+    game.players[sid].add_letter(letter)
+    journal.drawn(code, sid)
     # Broadcast the flipped tile to all players
-    await sio.emit("tile_flipped", {"sid": sid, "letter": letter}, room=f"room/{code}")
-    print(f"Player {sid} flipped tile {letter} in game {code}")
+    broadcast_change(game, "tile_flipped", {"sid": sid, "letter": letter})
+    logs.event("tile_flipped", code=code, sid=sid, tiles_left=len(game.tile_bag))
     # End turn (no word formed, but flip counts as an action?)
-    game.last_action_time = datetime.utcnow()
+    game.last_action_time = time.monotonic()
     await advance_turn(code, action_taken=True)
     return {"letter": letter}
 
 @sio.on("form_word")
+@rate_limited("form_word")
+@routed
 async def handle_form_word(sid, data):
     """Form a new word from the current player's available letters."""
     code = data.get("code")
     game = get_game(code)
-    if game.turn_order[game.current_turn_index] != sid:
+    if game.turn_order.current != sid:
         return {"error": "Not your turn"}
     word_str = data.get("word", "")
     tiles = data.get("tiles", [])  # letters used from player's hand
+    if not isinstance(word_str, str) or not isinstance(tiles, list):
+        return {"error": "Invalid word or tiles"}
     word = word_str.upper()
-    # Validate that the player indeed has the tiles claimed
+    # Validate that the tiles spell the word and that the player indeed has them
     player_state = game.players[sid]
-    tiles_available = player_state.letters.copy()
-    for t in tiles:
-        if t not in tiles_available:
-            return {"error": "Tiles not available"}
-        tiles_available.remove(t)
-    # Validate the word against dictionary (using wordfreq's word list)
-    from wordfreq import zipf_frequency
-    if zipf_frequency(word, "en", wordlist="large") == 0.0:
+    needed = letters.counts(word)
+    if needed is None or letters.counts(tiles) != needed:
+        return {"error": f"Tiles do not spell '{word}'"}
+    if not letters.has(player_state.hand, needed):
+        return {"error": "Tiles not available"}
+    # Validate the word against the preloaded dictionary (built from wordfreq's word list)
+    if not dictionary.is_valid(word):
         return {"error": f"'{word}' is not a valid English word"}
     # Word is valid: remove used tiles from hand and add word to player's list
-    for t in tiles:
-        player_state.letters.remove(t)
-    word_id = secrets.token_hex(4)  # generate a short ID for the word
+    letters.consume(player_state.hand, needed)
+    word_id = game.new_word_id()
     player_state.words[word_id] = word
+    game.history.append((sid, word_id, word, False))
+    game.board.changed()
+    journal.formed(code, sid, word_id, word)
     # Broadcast to all players that a new word is placed
-    await sio.emit("word_placed", {"sid": sid, "word": word, "word_id": word_id}, room=f"room/{code}")
-    print(f"Player {player_state.name} formed word '{word}'")
+    broadcast_change(game, "word_placed", {"sid": sid, "word": word, "word_id": word_id})
+    logs.event("word_formed", code=code, sid=sid, word=word)
     # End turn (successful action)
-    game.last_action_time = datetime.utcnow()
+    game.last_action_time = time.monotonic()
     await advance_turn(code, action_taken=True)
     return {"word_id": word_id, "word": word}
 
 @sio.on("steal_word")
+@rate_limited("steal_word")
+@routed
 async def handle_steal_word(sid, data):
     """Steal another player's word by extending it with new letters."""
     code = data.get("code")
     game = get_game(code)
-    if game.turn_order[game.current_turn_index] != sid:
+    if game.turn_order.current != sid:
         return {"error": "Not your turn"}
     target_sid = data.get("targetPlayerId")
     base_word_id = data.get("baseWordId")
     new_word_str = data.get("newWord", "")
     if not target_sid or not base_word_id or not new_word_str:
         return {"error": "Missing data"}
+    if not isinstance(target_sid, str) or not isinstance(new_word_str, str):
+        return {"error": "Invalid steal"}
     target_player = game.players.get(target_sid)
     stealing_player = game.players[sid]
+    try:
+        base_word_id = int(base_word_id)
+    except (TypeError, ValueError):
+        return {"error": "Base word not found"}
     if not target_player or base_word_id not in target_player.words:
         return {"error": "Base word not found"}
     base_word = target_player.words[base_word_id]
     new_word = new_word_str.upper()
     # Check that new_word contains all letters of base_word plus at least one from stealer's hand
-    base_letters = list(base_word)
-    added_letters = []
-    temp_letters = stealing_player.letters.copy()
-    # Remove each letter of base_word from new_word's letters
-    new_word_letters = list(new_word)
-    for letter in base_letters:
-        if letter in new_word_letters:
-            new_word_letters.remove(letter)
-    # Now new_word_letters should be exactly the letters added
-    added_letters = new_word_letters
+    new_counts = letters.counts(new_word)
+    added = letters.diff(new_counts, letters.counts(base_word)) if new_counts is not None else None
+    if added is None or not any(added):
+        return {"error": f"'{new_word}' does not extend '{base_word}'"}
     # Verify the stealing player has those added letters
-    for letter in added_letters:
-        if letter not in temp_letters:
-            return {"error": "You do not have the required letters to form that word"}
-        temp_letters.remove(letter)
+    if not letters.has(stealing_player.hand, added):
+        return {"error": "You do not have the required letters to form that word"}
     # Verify new word is valid English word
-    from wordfreq import zipf_frequency
-    if zipf_frequency(new_word, "en", wordlist="large") == 0.0:
+    if not dictionary.is_valid(new_word):
         return {"error": f"'{new_word}' is not a valid word"}
     # Steal is valid: remove base word from target, remove added letters from stealer, and add new word to stealer
     del target_player.words[base_word_id]
-    for letter in added_letters:
-        stealing_player.letters.remove(letter)
-    new_word_id = secrets.token_hex(4)
+    letters.consume(stealing_player.hand, added)
+    new_word_id = game.new_word_id()
     stealing_player.words[new_word_id] = new_word
+    game.history.append((sid, new_word_id, new_word, True))
+    game.board.changed()
+    journal.stolen(code, sid, target_sid, base_word_id, new_word_id, new_word)
     # Broadcast word stolen event
-    await sio.emit("word_stolen", {
+    broadcast_change(game, "word_stolen", {
         "thief_sid": sid, "victim_sid": target_sid,
         "old_word_id": base_word_id, "new_word": new_word, "new_word_id": new_word_id
-    }, room=f"room/{code}")
-    print(f"Player {stealing_player.name} stole word '{base_word}' and formed '{new_word}'")
+    })
+    logs.event("word_stolen", code=code, sid=sid, victim=target_sid, base_word=base_word, word=new_word)
     # End turn
-    game.last_action_time = datetime.utcnow()
+    game.last_action_time = time.monotonic()
     await advance_turn(code, action_taken=True)
     return {"new_word": new_word, "new_word_id": new_word_id}
 
+@sio.on("find_steals")
+@rate_limited("find_steals")
+@routed
+async def handle_find_steals(sid, data):
+    """List the table words the player could steal with their hand, within FIND_STEALS_BUDGET_MS."""
+    code = data.get("code")
+    game = get_game(code)
+    player = game.players.get(sid)
+    if not player:
+        return {"error": "Not in this game"}
+    index = anagram.get_index()
+    deadline = time.perf_counter() + FIND_STEALS_BUDGET_MS / 1000
+    steals, complete = game.board.steals(index, player.letters, deadline)
+    return {"steals": steals, "complete": complete}
+
+@sio.on("get_hint")
+@rate_limited("get_hint")
+@routed
+async def handle_get_hint(sid, data):
+    """The best moves the requesting player could make now, ranked by points (see solver.py)."""
+    code = data.get("code")
+    game = get_game(code)
+    if sid not in game.players:
+        return {"error": "Not in this game"}
+    moves, complete = solver.solve(game, sid, limit=3)
+    return {"moves": moves, "complete": complete}
+
+@sio.on("add_bot")
+@routed
+async def handle_add_bot(sid, data):
+    """Fill an empty seat in a lobby with a bot player (it moves on its own turns, see bot_turn)."""
+    code = data.get("code")
+    game = get_game(code)
+    if sid not in game.players:
+        return {"error": "Not in this game"}
+    if game.started or not game.game_active or len(game.players) >= MAX_PLAYERS:
+        return {"error": "Cannot add a bot (game full or started)"}
+    taken = {p.name for p in game.players.values()}
+    name = next((f"Bot {n}" for n in BOT_NAMES if f"Bot {n}" not in taken), "Bot")
+    bot = PlayerState(sid=BOT_SID_PREFIX + secrets.token_hex(4), name=name)
+    game.players[bot.sid] = bot
+    game.turn_order.append(bot.sid)
+    journal.joined(code, bot)
+    game.last_action_time = time.monotonic()
+    open_lobbies.update(game)
+    broadcast_change(game, "player_joined", {"sid": bot.sid, "name": name})
+    logs.event("bot_added", code=code, sid=sid, bot=bot.sid)
+    return {"player": {"sid": bot.sid, "name": name}}
+
 @sio.on("send_chat")
+@rate_limited("send_chat")
+@routed
 async def handle_chat(sid, data):
     """Handle a chat message sent by a player."""
     code = data.get("code")
@@ -355,10 +741,83 @@ async def handle_chat(sid, data):
     game = get_game(code)
     player = game.players.get(sid)
     if player and text:
-        # Simple rate-limit: no more than 3 messages in 5 seconds (not implemented fully here, just a placeholder)
+        # (flooding is stopped before this point by rate_limited)
+        game.last_action_time = time.monotonic()
         # Broadcast chat message to the room
-        await sio.emit("chat_message", {"sid": sid, "name": player.name, "text": text}, room=f"room/{code}")
-        print(f"[{code}] {player.name}: {text}")
+        outbound.emit(code, "chat_message", {"sid": sid, "name": player.name, "text": text})
+        logs.event("chat_message", code=code, sid=sid, length=len(text))  # never the text itself
+
+# Time every Socket.IO handler registered above (latency, error acks, sampled payload sizes)
+metrics.instrument_sio(sio)
+
+# Gauges, read when /metrics is scraped
+metrics.Gauge("bamandagrams_active_games", "Games held in memory on this worker", lambda: len(games))
+metrics.Gauge("bamandagrams_connected_sids", "Sockets connected to this worker", lambda: len(sio.eio.sockets))
+metrics.Gauge("bamandagrams_tiles_remaining", "Tiles left in the bags of all games on this worker",
+              lambda: sum(len(g.tile_bag) for g in games.values()))
+metrics.Gauge("bamandagrams_pending_timers", "Turn timers waiting to fire", lambda: turn_timers.pending)
+metrics.Gauge("bamandagrams_actor_queue_depth", "Game commands waiting for their game's actor",
+              lambda: actors.stats()["queued"])
+metrics.Gauge("bamandagrams_outbound_queue_depth", "Broadcasts waiting to be sent", lambda: outbound.depth)
+metrics.Gauge("bamandagrams_match_write_queue_depth", "Finished matches waiting to be saved",
+              lambda: match_writer.depth)
+metrics.Gauge("bamandagrams_rate_limit_buckets", "Token buckets tracked for rate limits",
+              lambda: event_limits.tracked() + len(connect_limits))
+metrics.Gauge("bamandagrams_open_lobbies", "Public lobbies with a free seat (see quick_match)",
+              lambda: len(open_lobbies))
+metrics.Gauge("bamandagrams_game_state_bytes", "Estimated memory held by games (as of the last reaper sweep)",
+              lambda: game_reaper.estimated_bytes)
+metrics.Gauge("bamandagrams_journal_buffered_bytes", "Journal bytes not yet written", lambda: journal.stats()["buffered"])
+metrics.Gauge("bamandagrams_auth_cache_entries", "Cached tokens and user rows (see crud.py)",
+              lambda: len(crud.token_cache) + len(crud.user_cache))
+
+# App lifespan (see lifespan above)
+async def start_up():
+    """Join the cluster and restore journaled games before serving; warm up in the background."""
+    global loop_lag_sampler, warm_up_task
+    await join_cluster()
+    await restore_games()
+    loop_lag_sampler = asyncio.create_task(metrics.sample_loop_lag())
+    game_reaper.start()
+    # /health answers from here on; /ready (and Socket.IO connects) wait for the warm-up (see warmup.py)
+    warm_up_task = asyncio.create_task(warm_up.run())
+
+async def join_cluster():
+    await cluster.backend.start(dispatch_routed)
+
+async def restore_games():
+    """Bring back the games journaled before the last shutdown (or crash)."""
+    for code in await journal.open(games):
+        game = games.get(code)
+        if game is None:
+            continue
+        owner = await cluster.backend.owner(code)
+        if owner not in (None, cluster.NODE_ID) or (owner is None and not await cluster.backend.claim(code)):
+            # Another worker took the code over meanwhile; its game wins
+            games.pop(code)
+            journal.ended(code)
+            continue
+        # Nobody is connected yet: every player gets RESTORE_GRACE to resume_game before being removed
+        for sid, player in game.players.items():
+            if player.is_bot:
+                continue  # bots have no socket to come back on
+            sessions[sid] = (code, player)
+            turn_timers.schedule(("leave", sid), RESTORE_GRACE, in_game, code, remove_player, sid, None)
+        if game.started:
+            await begin_turn(game)
+
+async def shut_down():
+    if warm_up_task:
+        warm_up_task.cancel()
+    if loop_lag_sampler:
+        loop_lag_sampler.cancel()
+    await game_reaper.stop()
+    await turn_timers.stop()
+    await outbound.flush()
+    await journal.close()
+    await match_writer.close()
+    passwords.pool.shutdown()
+    await cluster.backend.stop()
 
 # FastAPI API endpoints (Auth and health-check)
 @fastapi_app.get("/", response_class=HTMLResponse)
@@ -369,7 +828,23 @@ async def index():
 async def health():
     return {"status": "ok"}
 
+@fastapi_app.get("/ready")
+async def ready():
+    """Whether the startup warm-up has finished (503 until then); for load balancer checks."""
+    return JSONResponse(warm_up.stats(), status_code=200 if warm_up.ready else 503)
+
+@fastapi_app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Auth scaffolding
+@fastapi_app.exception_handler(passwords.PasswordPoolBusy)
+async def password_pool_busy(request, exc):
+    # Too many sign-ups/logins in flight: shed load instead of queueing without bound
+    return JSONResponse(status_code=503, content={"detail": "Server busy, try again shortly"},
+                        headers={"Retry-After": "1"})
+
 @fastapi_app.post("/auth/signup", response_model=schemas.UserOut)
 async def signup(user_in: schemas.UserCreate):
     """Create a new user account (sign up)."""
@@ -385,15 +860,55 @@ async def login(form: schemas.LoginRequest):
     """Authenticate user and return JWT token."""
     async with models.SessionLocal() as session:
         user = await crud.get_user_by_username(session, form.username)
-        if not user or not crud.verify_password(form.password, user.password_hash):
+        if not user or not await crud.verify_password(session, user, form.password):
             raise HTTPException(status_code=401, detail="Invalid credentials")
         # Create JWT token
-        import jwt
         payload = {"sub": str(user.id), "exp": datetime.utcnow() + timedelta(hours=24)}
-        token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+        token = jwt.encode(payload, models.JWT_SECRET, algorithm=models.JWT_ALGORITHM)
         return {"access_token": token, "token_type": "bearer"}
 
 @fastapi_app.get("/auth/me", response_model=schemas.UserOut)
 async def get_current_user(current_user: models.User = Depends(crud.get_current_user)):
     """Get details of the current logged-in user (via JWT)."""
     return current_user
+
+# Stats endpoints (read from the user_stats summary table)
+@fastapi_app.get("/leaderboard", response_model=schemas.LeaderboardPage)
+async def leaderboard(limit: int = Query(20, ge=1, le=100), after: Optional[str] = None):
+    """Users ranked by wins, then total score. Pass next_cursor back as `after` for the next page."""
+    cursor = None
+    if after:
+        try:
+            wins, total, user_id = (int(part) for part in after.split("."))
+            cursor = (wins, total, user_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    async with models.SessionLocal() as session:
+        entries = await crud.get_leaderboard(session, limit, cursor)
+    next_cursor = None
+    if len(entries) == limit:
+        last = entries[-1]
+        next_cursor = f"{last.wins}.{last.total_score}.{last.user_id}"
+    return {"entries": entries, "next_cursor": next_cursor}
+
+@fastapi_app.get("/users/{user_id}/stats", response_model=schemas.UserStatsOut)
+async def user_stats(user_id: int):
+    """Lifetime stats for one user."""
+    async with models.SessionLocal() as session:
+        stats = await crud.get_user_stats(session, user_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return stats
+
+@fastapi_app.get("/export/matches")
+async def export_matches(format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+                         since: Optional[datetime] = None, until: Optional[datetime] = None,
+                         code: Optional[str] = None,
+                         current_user: models.User = Depends(crud.get_current_user)):
+    """Stream the caller's match history (ended in [since, until), optionally one lobby code) as NDJSON or CSV."""
+    media_type = export.FORMATS[format][1]
+    filename = f"matches.{format}"
+    # Everyone's history is for operators, through export_matches.py against the database
+    return StreamingResponse(export.stream(format, since=since, until=until, code=code, user_id=current_user.id),
+                             media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
@@ -0,0 +1,178 @@
+# backend/app/metrics.py
+"""Counters, gauges and histograms cheap enough to leave on, rendered in the Prometheus text format."""
+import asyncio
+import functools
+import json
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536)
+PAYLOAD_SAMPLE = 10  # measure the size of every Nth socket payload (json.dumps isn't free)
+
+_registry: List["_Metric"] = []
+
+
+def _labels(names: Sequence[str], values: Tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{str(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return "\n".join([f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()])
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, k)} {v}" for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    """Value read from a callback at scrape time (or set directly when no callback is given)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Optional[Callable[[], float]] = None):
+        super().__init__(name, help)
+        self.fn = fn
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def samples(self) -> List[str]:
+        value = self.value
+        if self.fn is not None:
+            try:
+                value = self.fn()
+            except Exception:
+                return []
+        return [f"{self.name} {value}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), series):
+                cumulative += n
+                le = _labels((*self.labelnames, "le"), (*labels, bound))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lab = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{lab} {series[-1]}")
+            lines.append(f"{self.name}_count{lab} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    return "\n".join(m.render() for m in _registry) + "\n"
+
+
+# Socket.IO and HTTP instruments
+socket_latency = Histogram("socketio_event_duration_seconds", "Socket.IO handler latency", ["event"])
+socket_errors = Counter("socketio_event_errors_total", "Socket.IO handlers that raised or acked an error", ["event"])
+socket_payload = Histogram("socketio_event_payload_bytes", "Sampled size of Socket.IO event payloads (JSON)",
+                           ["event"], buckets=SIZE_BUCKETS)
+http_latency = Histogram("http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"])
+http_errors = Counter("http_request_errors_total", "HTTP requests that failed with a 5xx or raised", ["method", "route"])
+loop_lag = Histogram("event_loop_lag_seconds", "How late the event loop ran a timer that was due")
+_payloads_seen = 0
+
+
+def timed_handler(event: str, handler: Callable) -> Callable:
+    """Wrap a Socket.IO handler to record its latency, errors and (sampled) payload size."""
+    @functools.wraps(handler)
+    async def wrapper(*args):
+        global _payloads_seen
+        _payloads_seen += 1
+        if _payloads_seen % PAYLOAD_SAMPLE == 0 and len(args) == 2:  # (sid, data); connect gets environ
+            try:
+                socket_payload.observe(len(json.dumps(args[1], separators=(",", ":"))), event)
+            except (TypeError, ValueError):
+                pass
+        t0 = time.perf_counter()
+        try:
+            result = await handler(*args)
+        except Exception:
+            socket_errors.inc(event)
+            raise
+        finally:
+            socket_latency.observe(time.perf_counter() - t0, event)
+        if isinstance(result, dict) and "error" in result:
+            socket_errors.inc(event)
+        return result
+    wrapper.timed = True
+    return wrapper
+
+
+def instrument_sio(sio, namespace: str = "/"):
+    """Wrap every handler registered on the namespace with timed_handler."""
+    handlers = sio.handlers.get(namespace, {})
+    for event, handler in handlers.items():
+        if not getattr(handler, "timed", False):
+            handlers[event] = timed_handler(event, handler)
+
+
+def instrument_fastapi(app):
+    """Record latency and 5xx/exception counts for every HTTP route (by route template)."""
+    @app.middleware("http")
+    async def record_request(request, call_next):
+        t0 = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_latency.observe(time.perf_counter() - t0, request.method, path, status)
+            if status >= 500:
+                http_errors.inc(request.method, path)
+
+
+async def sample_loop_lag(interval: float = 0.5):
+    """Run forever, observing how late each sleep(interval) wakes up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        t0 = loop.time()
+        await asyncio.sleep(interval)
+        loop_lag.observe(max(0.0, loop.time() - t0 - interval))
@@ -1,12 +1,14 @@
 # backend/app/models.py
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import declarative_base, relationship, Mapped, mapped_column, Session
-from sqlalchemy import String, Integer, ForeignKey, DateTime, func, Text
+from sqlalchemy import String, Integer, ForeignKey, DateTime, func, Text, Index
 import os
 from typing import Optional, List
 import datetime
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite+aiosqlite:///./test.db")
+JWT_SECRET = os.environ.get("JWT_SECRET", "super-secret")  # JWT signing key (set via env in prod)
+JWT_ALGORITHM = "HS256"
 
 # Async SQLAlchemy setup
 engine: AsyncEngine = create_async_engine(DATABASE_URL, echo=False)
@@ -24,13 +26,14 @@ class User(Base):
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     # Relationships
     matches: Mapped[List["MatchPlayer"]] = relationship("MatchPlayer", back_populates="user")
+    stats: Mapped[Optional["UserStats"]] = relationship("UserStats", back_populates="user", uselist=False)
 
 class Match(Base):
     __tablename__ = "matches"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    code: Mapped[str] = mapped_column(String(10), nullable=False)  # lobby code used
+    code: Mapped[str] = mapped_column(String(10), nullable=False, index=True)  # lobby code used
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    ended_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True))
+    ended_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), index=True)
     # Relationships
     players: Mapped[List["MatchPlayer"]] = relationship("MatchPlayer", back_populates="match", cascade="all, delete-orphan")
     words: Mapped[List["WordPlayed"]] = relationship("WordPlayed", back_populates="match", cascade="all, delete-orphan")
@@ -38,8 +41,8 @@ class Match(Base):
 class MatchPlayer(Base):
     __tablename__ = "match_players"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id", ondelete="CASCADE"))
-    user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     name: Mapped[str] = mapped_column(String(50))  # player name used in the game
     score: Mapped[int] = mapped_column(Integer)
     # Relationships
@@ -51,10 +54,25 @@ class WordPlayed(Base):
     __tablename__ = "words_played"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     match_id: Mapped[int] = mapped_column(ForeignKey("matches.id", ondelete="CASCADE"))
-    player_id: Mapped[int] = mapped_column(ForeignKey("match_players.id", ondelete="CASCADE"))
-    word: Mapped[str] = mapped_column(String(32))
+    player_id: Mapped[int] = mapped_column(ForeignKey("match_players.id", ondelete="CASCADE"), index=True)
+    word: Mapped[str] = mapped_column(String(64))  # the word list's longest word is 34 letters
     points: Mapped[int] = mapped_column(Integer)
     was_stolen: Mapped[bool] = mapped_column(nullable=False, default=False)  # indicate if this word was a result of a steal
     # Relationships
     match: Mapped["Match"] = relationship("Match", back_populates="words")
     player: Mapped["MatchPlayer"] = relationship("MatchPlayer", back_populates="words")
+
+class UserStats(Base):
+    """Per-user totals, updated as each match is saved (so reads never aggregate match history)."""
+    __tablename__ = "user_stats"
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    games_played: Mapped[int] = mapped_column(Integer, default=0)
+    wins: Mapped[int] = mapped_column(Integer, default=0)  # matches finished with a top score above 0 (ties count)
+    total_score: Mapped[int] = mapped_column(Integer, default=0)
+    best_score: Mapped[int] = mapped_column(Integer, default=0)
+    longest_word: Mapped[str] = mapped_column(String(64), default="")
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Relationships
+    user: Mapped["User"] = relationship("User", back_populates="stats")
+    # Leaderboard order, walked with keyset pagination
+    __table_args__ = (Index("ix_user_stats_leaderboard", "wins", "total_score", "user_id"),)
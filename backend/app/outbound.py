@@ -0,0 +1,146 @@
+# backend/app/outbound.py
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import socketio
+
+from . import logs, metrics
+
+# Environment configuration
+OUTBOUND_MAX_DEPTH = int(os.environ.get("OUTBOUND_MAX_DEPTH", "256"))          # queued events per game
+OUTBOUND_CLIENT_BACKLOG = int(os.environ.get("OUTBOUND_CLIENT_BACKLOG", "64"))  # unsent packets before a client counts as slow
+OUTBOUND_SLOW_POLICY = os.environ.get("OUTBOUND_SLOW_POLICY", "drop")          # "drop" (skip slow clients) or "disconnect"
+
+send_latency = metrics.Histogram("bamandagrams_outbound_send_seconds",
+                                 "Time from a broadcast being queued to it being handed to engine.io")
+dropped = metrics.Counter("bamandagrams_outbound_dropped_total",
+                          "Events dropped from full queues and sends withheld from slow clients", ["reason"])
+
+# (target room or sid, event, payload, enqueue time)
+_Item = Tuple[str, str, Any, float]
+
+
+class RoomDispatcher:
+    """Per-game outbound queues drained by an on-demand sender, so handlers never wait on socket writes."""
+    def __init__(self, sio: socketio.AsyncServer, max_depth: int = OUTBOUND_MAX_DEPTH,
+                 client_backlog: int = OUTBOUND_CLIENT_BACKLOG, slow_policy: str = OUTBOUND_SLOW_POLICY):
+        self.sio = sio
+        self.max_depth = max_depth
+        self.client_backlog = client_backlog
+        self.slow_policy = slow_policy
+        self._queues: Dict[str, Deque[_Item]] = {}
+        self._senders: Dict[str, asyncio.Task] = {}
+        # Counters
+        self.enqueued = 0
+        self.sent_events = 0
+        self.sent_messages = 0
+        self.dropped_events = 0       # oldest events dropped because a game's queue was full
+        self.skipped_clients = 0      # sends withheld from slow clients
+        self.disconnected_clients = 0
+        self.max_depth_seen = 0
+        self.latency_total = 0.0      # seconds from emit() to the message being handed to engine.io
+        self.latency_max = 0.0
+
+    def emit(self, code: str, event: str, data: Any = None, to: Optional[str] = None):
+        """Queue an event for a game's room (or for one sid in it, via `to`)."""
+        queue = self._queues.get(code)
+        if queue is None:
+            queue = self._queues[code] = deque()
+        if len(queue) >= self.max_depth:
+            queue.popleft()
+            self.dropped_events += 1
+            dropped.inc("queue_full")
+        queue.append((to or f"room/{code}", event, data, time.perf_counter()))
+        self.enqueued += 1
+        if len(queue) > self.max_depth_seen:
+            self.max_depth_seen = len(queue)
+        if code not in self._senders:
+            self._senders[code] = asyncio.create_task(self._drain(code))
+
+    @property
+    def depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.depth, "max_depth_seen": self.max_depth_seen, "enqueued": self.enqueued,
+            "sent_events": self.sent_events, "sent_messages": self.sent_messages,
+            "dropped_events": self.dropped_events, "skipped_clients": self.skipped_clients,
+            "disconnected_clients": self.disconnected_clients,
+            "send_latency_avg_ms": self.latency_total / self.sent_events * 1000 if self.sent_events else 0.0,
+            "send_latency_max_ms": self.latency_max * 1000,
+        }
+
+    async def flush(self):
+        """Wait until everything queued so far has been sent."""
+        while self._senders:
+            await asyncio.gather(*list(self._senders.values()), return_exceptions=True)
+
+    async def _drain(self, code: str):
+        # Consecutive events for one target go out as a single "batch" message
+        queue = self._queues[code]
+        try:
+            while queue:
+                items = list(queue)
+                queue.clear()
+                for target, run in _runs(items):
+                    await self._send(target, run)
+        except Exception as e:
+            logs.event("outbound_send_failed", logging.ERROR, exc_info=e, code=code)
+        finally:
+            del self._senders[code]
+            if not queue:
+                self._queues.pop(code, None)
+
+    async def _send(self, target: str, run: List[_Item]):
+        if len(run) == 1:
+            event, data = run[0][1], run[0][2]
+        else:
+            event, data = "batch", [[item[1], item[2]] for item in run]
+        skip = self._slow_clients(target)
+        await self.sio.emit(event, data, room=target, skip_sid=skip or None)
+        now = time.perf_counter()
+        self.sent_messages += 1
+        self.sent_events += len(run)
+        for item in run:
+            latency = now - item[3]
+            send_latency.observe(latency)
+            self.latency_total += latency
+            if latency > self.latency_max:
+                self.latency_max = latency
+
+    def _slow_clients(self, target: str) -> List[str]:
+        """Sids in `target` connected to this worker whose send queue is backed up."""
+        slow: List[str] = []
+        if "/" not in self.sio.manager.rooms:
+            return slow  # nobody connected yet
+        eio_sockets = self.sio.eio.sockets
+        for sid, eio_sid in self.sio.manager.get_participants("/", target):
+            sock = eio_sockets.get(eio_sid)
+            queue = getattr(sock, "queue", None)
+            if queue is None or queue.qsize() <= self.client_backlog:
+                continue
+            slow.append(sid)
+            self.skipped_clients += 1
+            dropped.inc("slow_client")
+            if self.slow_policy == "disconnect":
+                self.disconnected_clients += 1
+                dropped.inc("slow_disconnect")
+                asyncio.create_task(self.sio.disconnect(sid))
+        return slow
+
+
+def _runs(items: List[_Item]):
+    """Split queued items into consecutive runs with the same target, preserving order."""
+    run: List[_Item] = []
+    for item in items:
+        if run and item[0] != run[0][0]:
+            yield run[0][0], run
+            run = []
+        run.append(item)
+    if run:
+        yield run[0][0], run
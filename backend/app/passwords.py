@@ -0,0 +1,98 @@
+# backend/app/passwords.py
+"""Password hashing on a bounded thread pool, off the event loop that runs every game (bcrypt releases the GIL)."""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from . import metrics
+
+# Environment configuration
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))                          # cost for new hashes
+PASSWORD_WORKERS = int(os.environ.get("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))  # 0 = hash inline
+PASSWORD_MAX_PENDING = int(os.environ.get("PASSWORD_MAX_PENDING", "32"))            # queued requests before rejecting
+PASSWORD_REHASH = os.environ.get("PASSWORD_REHASH", "1") == "1"                      # upgrade hashes at login when cost changes
+
+# Hashes made with a different cost than BCRYPT_ROUNDS report needs_update()
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+rejected = metrics.Counter("bamandagrams_password_rejected_total", "Password checks turned away (PasswordPoolBusy)")
+
+T = TypeVar("T")
+
+
+class PasswordPoolBusy(Exception):
+    """Too many password operations are already waiting."""
+
+
+class PasswordPool:
+    """Bounded pool that runs pwd_context calls on worker threads."""
+    def __init__(self, workers: int = PASSWORD_WORKERS, max_pending: int = PASSWORD_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        # Counters
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.wait_max = 0.0  # longest time a request queued for a worker (seconds)
+
+    def stats(self) -> Dict[str, float]:
+        return {"workers": self.workers, "waiting": self._waiting, "completed": self.completed,
+                "rejected": self.rejected, "rehashed": self.rehashed, "wait_max_ms": self.wait_max * 1000}
+
+    def start(self):
+        """Create the worker threads now (warm-up) instead of on the first hash."""
+        if self.workers <= 0 or self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="bcrypt")
+        self._slots = asyncio.Semaphore(self.workers)
+        for _ in range(self.workers):
+            self._executor.submit(int)  # each submit to a pool without idle threads spawns one
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        if self.workers <= 0:
+            self.completed += 1
+            return fn(*args)  # inline: blocks the event loop
+        self.start()
+        if self._slots.locked() and self._waiting >= self.max_pending:
+            self.rejected += 1
+            rejected.inc()
+            raise PasswordPoolBusy()
+        self._waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self.wait_max = max(self.wait_max, time.perf_counter() - queued_at)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._slots.release()
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Check a password; also returns a new hash when the stored one should be upgraded."""
+        if PASSWORD_REHASH:
+            ok, new_hash = await self._run(pwd_context.verify_and_update, password, hashed)
+            if new_hash:
+                self.rehashed += 1
+            return ok, new_hash
+        return await self._run(pwd_context.verify, password, hashed), None
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+pool = PasswordPool()
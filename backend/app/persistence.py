@@ -0,0 +1,128 @@
+# backend/app/persistence.py
+"""Write-behind persistence: end_game() queues a snapshot of each match and a background task saves them in batches."""
+import asyncio
+import datetime
+import logging
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from . import crud, logs, metrics, models
+
+# Environment configuration
+PERSIST_BATCH_SIZE = int(os.environ.get("PERSIST_BATCH_SIZE", "50"))            # matches per transaction
+PERSIST_FLUSH_INTERVAL = float(os.environ.get("PERSIST_FLUSH_INTERVAL", "1.0"))  # seconds a match may wait in the queue
+PERSIST_MAX_RETRIES = int(os.environ.get("PERSIST_MAX_RETRIES", "5"))           # attempts per batch before it is dropped
+
+write_retries = metrics.Counter("bamandagrams_match_write_retries_total", "Failed match batch writes (each is retried)")
+matches_dropped = metrics.Counter("bamandagrams_matches_dropped_total", "Finished matches never saved (retries used up)")
+
+
+def match_record(game) -> Dict[str, Any]:
+    """Snapshot of a finished game for save_match_results, with every word played (stolen ones score 0)."""
+    words: Dict[str, List[Dict]] = {sid: [] for sid in game.players}
+    for sid, word_id, word, was_stolen in game.history:
+        player = game.players.get(sid)
+        if player is None:
+            continue  # left before the end; has no result row
+        points = len(word) ** 2 if word_id in player.words else 0
+        words[sid].append({"word": word, "points": points, "was_stolen": was_stolen})
+    return {
+        "code": game.code,
+        "ended_at": datetime.datetime.now(datetime.timezone.utc),
+        "players": [
+            {"name": p.name, "user_id": p.user_id, "score": sum(w["points"] for w in words[sid]), "words": words[sid]}
+            for sid, p in game.players.items()
+        ],
+    }
+
+
+class MatchWriter:
+    """Queue of finished matches, written to the database in batches by one background task."""
+    def __init__(self, batch_size: int = PERSIST_BATCH_SIZE, flush_interval: float = PERSIST_FLUSH_INTERVAL,
+                 max_retries: int = PERSIST_MAX_RETRIES):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        # Counters
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.dropped = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": self.depth, "enqueued": self.enqueued, "written": self.written,
+                "batches": self.batches, "retries": self.retries, "dropped": self.dropped}
+
+    def enqueue(self, record: Dict[str, Any]):
+        """Queue a match_record() for writing; never waits on the database."""
+        self._queue.append(record)
+        self.enqueued += 1
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    async def close(self):
+        """Write everything still queued, then stop the writer task."""
+        self._closing = True
+        if self._task:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+    async def _run(self):
+        while True:
+            if len(self._queue) < self.batch_size and not self._closing:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                await self._write(batch)
+                if len(self._queue) < self.batch_size and not self._closing:
+                    break  # partial batch: wait for more or for the interval
+            if self._closing and not self._queue:
+                return
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        for attempt in range(self.max_retries):
+            error = await self._save(batch)
+            if error is None:
+                return
+            self.retries += 1
+            write_retries.inc()
+            logs.event("match_write_failed", logging.WARNING, matches=len(batch), attempt=attempt + 1, error=error)
+            if self._closing and attempt >= 1:
+                break  # shutting down: don't hold the process hostage
+            if attempt + 1 < self.max_retries:
+                await asyncio.sleep(min(0.5 * 2 ** attempt, 10))
+        # One bad match fails the whole transaction: save them one at a time and drop only those that fail
+        failed = [record for record in batch if await self._save([record]) is not None] if len(batch) > 1 else batch
+        if failed:
+            self.dropped += len(failed)
+            matches_dropped.inc(amount=len(failed))
+            logs.event("match_write_dropped", logging.ERROR, matches=len(failed), codes=[r["code"] for r in failed])
+
+    async def _save(self, records: List[Dict[str, Any]]) -> Optional[str]:
+        """Save records in one transaction; the error if that failed, else None."""
+        try:
+            async with models.SessionLocal() as session:
+                await crud.save_match_results(session, records)
+        except Exception as e:
+            return str(e)
+        self.batches += 1
+        self.written += len(records)
+        return None
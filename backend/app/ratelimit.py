@@ -0,0 +1,133 @@
+# backend/app/ratelimit.py
+"""Token-bucket rate limits for game events (per sid and per room) and for connects (per IP)."""
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from . import metrics
+
+
+def _limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """Parse "event=rate:burst,..." into {event: (rate, burst)}."""
+    limits: Dict[str, Tuple[float, float]] = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        rate, _, burst = value.partition(":")
+        if name.strip() and rate.strip():
+            limits[name.strip()] = (float(rate), float(burst or rate))
+    return limits
+
+
+# Environment configuration ("event=rate:burst" lists; room limits are per worker, on its share of the lobby)
+RATE_LIMIT_SID = _limits(os.environ.get(
+    "RATE_LIMIT_SID", "send_chat=0.6:3,flip_tile=2:5,form_word=2:5,steal_word=2:5,get_hint=0.5:3,find_steals=2:5"))
+RATE_LIMIT_ROOM = _limits(os.environ.get(
+    "RATE_LIMIT_ROOM", "send_chat=5:15,flip_tile=10:20,form_word=10:20,steal_word=10:20"))
+CONNECT_RATE_LIMIT = _limits("connect=" + os.environ.get("CONNECT_RATE_LIMIT", "1:20")).get("connect")  # empty: off
+CONNECT_IP_HEADER = os.environ.get("CONNECT_IP_HEADER", "").lower()  # e.g. "fly-client-ip"; unset: socket peer
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", "100000"))
+
+rejected = metrics.Counter("rate_limited_total", "Events and connects turned away by rate limits", ["event", "scope"])
+
+
+class _Bucket:
+    __slots__ = ("tokens", "stamp")
+
+    def __init__(self, tokens: float, stamp: float):
+        self.tokens = tokens
+        self.stamp = stamp
+
+
+class RateLimiter:
+    """Token buckets keyed by sid, room code or IP: `rate` per second, bursts of up to `burst`."""
+    def __init__(self, rate: float, burst: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, key: str) -> float:
+        """Take a token for `key`: 0.0 if allowed, else the seconds until one is available."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            bucket = self._buckets[key] = _Bucket(self.burst, now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.stamp) * self.rate)
+            bucket.stamp = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return 0.0
+        return (1 - bucket.tokens) / self.rate if self.rate else 60.0
+
+    def forget(self, key: str):
+        self._buckets.pop(key, None)
+
+    def _prune(self, now: float):
+        # Drop buckets that have refilled (they carry no information); if that isn't enough, the oldest half
+        full = (self.burst - 1) / self.rate if self.rate else float("inf")
+        for key in [k for k, b in self._buckets.items() if now - b.stamp >= full]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            for key in list(self._buckets)[:len(self._buckets) // 2]:
+                del self._buckets[key]
+
+
+class EventLimits:
+    """The per-sid and per-room limiters of every limited event."""
+    def __init__(self, per_sid: Dict[str, Tuple[float, float]] = RATE_LIMIT_SID,
+                 per_room: Dict[str, Tuple[float, float]] = RATE_LIMIT_ROOM):
+        self.per_sid = {event: RateLimiter(*limit) for event, limit in per_sid.items()}
+        self.per_room = {event: RateLimiter(*limit) for event, limit in per_room.items()}
+
+    def check(self, event: str, sid: str, room: Optional[str]) -> float:
+        """0.0 if `sid` may send `event` to `room` now, else the seconds to wait."""
+        limiter = self.per_sid.get(event)
+        wait = limiter.take(sid) if limiter is not None else 0.0
+        if wait:
+            rejected.inc(event, "sid")
+            return wait
+        limiter = self.per_room.get(event)
+        wait = limiter.take(room) if limiter is not None and room else 0.0
+        if wait:
+            rejected.inc(event, "room")
+        return wait
+
+    def forget_sid(self, sid: str):
+        for limiter in self.per_sid.values():
+            limiter.forget(sid)
+
+    def forget_room(self, room: str):
+        for limiter in self.per_room.values():
+            limiter.forget(room)
+
+    def tracked(self) -> int:
+        return sum(len(l) for l in self.per_sid.values()) + sum(len(l) for l in self.per_room.values())
+
+
+def client_ip(environ: dict) -> str:
+    """The connecting client's IP: from CONNECT_IP_HEADER when behind a proxy, else the socket peer."""
+    if CONNECT_IP_HEADER:
+        forwarded = environ.get("HTTP_" + CONNECT_IP_HEADER.upper().replace("-", "_"))
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = environ.get("asgi.scope", {}).get("client")
+    return client[0] if client else environ.get("REMOTE_ADDR", "")
+
+
+class ConnectLimiter(RateLimiter):
+    """Connects per client IP (CONNECT_RATE_LIMIT); a no-op when the limit is unset."""
+    def __init__(self, limit: Optional[Tuple[float, float]] = CONNECT_RATE_LIMIT):
+        super().__init__(*(limit or (0.0, 0.0)))
+        self.enabled = limit is not None
+
+    def allow(self, environ: dict) -> bool:
+        if not self.enabled or not self.take(client_ip(environ)):
+            return True
+        rejected.inc("connect", "ip")
+        return False
@@ -0,0 +1,133 @@
+# backend/app/reaper.py
+"""Keeps the in-memory game registry bounded: expires idle games, evicts the least active over budget."""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from . import logs, metrics
+from .state import GameState
+
+# Environment configuration
+REAPER_INTERVAL = float(os.environ.get("REAPER_INTERVAL", "15"))            # seconds between sweeps
+LOBBY_IDLE_TIMEOUT = float(os.environ.get("LOBBY_IDLE_TIMEOUT", "900"))     # seconds an unstarted lobby may sit idle
+GAME_IDLE_TIMEOUT = float(os.environ.get("GAME_IDLE_TIMEOUT", "1800"))      # seconds a started game may go without a turn
+MAX_GAMES = int(os.environ.get("MAX_GAMES", "20000"))                       # live games per worker
+GAME_MEMORY_BUDGET = int(float(os.environ.get("GAME_MEMORY_BUDGET_MB", "0")) * 2**20)  # bytes of game state (0: no budget)
+
+# approx_bytes is a formula (a few len() calls per game), not a measurement. Its coefficients are tracemalloc
+# figures (benchmarks/bench_reaper.py) rounded up for what lives outside GameState (actor, journal cache, sessions)
+GAME_BYTES = 1400     # GameState, its bag, turn order and board index
+PLAYER_BYTES = 700    # PlayerState, hand, words dict and session entry
+WORD_BYTES = 150      # a history entry plus the word in a player's words
+DELTA_BYTES = 250     # a remembered (event, data) change
+SWEEP_CHUNK = 2000    # games scanned between yields to the event loop
+
+reaped = metrics.Counter("bamandagrams_games_reaped_total", "Games expired by the reaper", ["reason"])
+
+
+def approx_bytes(game: GameState) -> int:
+    """Rough size of a game's state in memory."""
+    return (GAME_BYTES + PLAYER_BYTES * len(game.players) + WORD_BYTES * len(game.history)
+            + DELTA_BYTES * (len(game.deltas) if game.deltas else 0))
+
+
+class GameReaper:
+    """Expires idle games and evicts the least recently active ones when over budget."""
+    def __init__(self, games: Dict[str, GameState], expire: Callable[[str, str, float], Awaitable[bool]],
+                 interval: float = REAPER_INTERVAL, lobby_idle: float = LOBBY_IDLE_TIMEOUT,
+                 game_idle: float = GAME_IDLE_TIMEOUT, max_games: int = MAX_GAMES,
+                 memory_budget: int = GAME_MEMORY_BUDGET):
+        self.games = games
+        self.expire = expire  # expire(code, reason, last_action_time) -> False if the game has moved on
+        self.interval = interval
+        self.lobby_idle = lobby_idle
+        self.game_idle = game_idle
+        self.max_games = max_games
+        self.memory_budget = memory_budget
+        self._task = None
+        # Counters
+        self.sweeps = 0
+        self.reaped: Dict[str, int] = {"idle": 0, "memory": 0}
+        self.refused = 0              # create_game calls turned away at max_games
+        self.estimated_bytes = 0      # as of the last sweep
+        self.sweep_ms_max = 0.0
+
+    def has_room(self) -> bool:
+        """Whether another game may be created (counts refusals)."""
+        if len(self.games) < self.max_games:
+            return True
+        self.refused += 1
+        return False
+
+    def stats(self) -> Dict[str, float]:
+        return {"games": len(self.games), "sweeps": self.sweeps, "reaped_idle": self.reaped["idle"],
+                "reaped_memory": self.reaped["memory"], "refused": self.refused,
+                "estimated_bytes": self.estimated_bytes, "sweep_ms_max": self.sweep_ms_max}
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logs.event("reaper_sweep_failed", logging.ERROR, exc_info=e)
+
+    async def sweep(self) -> int:
+        """One pass: expire idle games, then evict for memory. Returns how many games went."""
+        started = time.perf_counter()
+        now = time.monotonic()
+        idle: List[Tuple[str, float]] = []
+        active: List[Tuple[float, int, str]] = []  # (last_action_time, approx bytes, code) of the rest
+        total = 0
+        snapshot = list(self.games.items())
+        for i, (code, game) in enumerate(snapshot):
+            if i and i % SWEEP_CHUNK == 0:
+                await asyncio.sleep(0)  # don't hold the loop for a whole scan of a big registry
+            limit = self.game_idle if game.started else self.lobby_idle
+            if now - game.last_action_time >= limit:
+                idle.append((code, game.last_action_time))
+                continue
+            size = approx_bytes(game)
+            total += size
+            active.append((game.last_action_time, size, code))
+        self.estimated_bytes = total
+        gone = 0
+        for code, stamp in idle:
+            gone += await self._expire(code, "idle", stamp)
+        if self.memory_budget and total > self.memory_budget:
+            target = self.memory_budget * 0.9
+            active.sort()
+            for stamp, size, code in active:
+                if total <= target:
+                    break
+                if await self._expire(code, "memory", stamp):
+                    gone += 1
+                    total -= size
+            self.estimated_bytes = total
+        self.sweeps += 1
+        self.sweep_ms_max = max(self.sweep_ms_max, (time.perf_counter() - started) * 1000)
+        if gone:
+            logs.event("games_reaped", count=gone, games=len(self.games), estimated_bytes=self.estimated_bytes)
+        return gone
+
+    async def _expire(self, code: str, reason: str, stamp: float) -> bool:
+        if code not in self.games or not await self.expire(code, reason, stamp):
+            return False
+        self.reaped[reason] += 1
+        reaped.inc(reason)
+        return True
@@ -0,0 +1,109 @@
+# backend/app/scheduler.py
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from . import logs, metrics
+
+timers_fired = metrics.Counter("bamandagrams_timers_fired_total", "Timers that fired (turn timeouts, bot moves, seat grace)")
+
+
+class TimerScheduler:
+    """Keyed timeouts (at most one pending per key) served by one background task and a heap."""
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._timers: Dict[Hashable, Tuple[float, int, Callable, tuple]] = {}  # key -> (deadline, seq, callback, args)
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()  # fired callbacks still in flight
+        # Counters
+        self.scheduled = 0
+        self.cancelled = 0
+        self.fired = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._timers)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": self.pending, "scheduled": self.scheduled,
+                "cancelled": self.cancelled, "fired": self.fired}
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable, *args: Any):
+        """Run callback(*args) after `delay` seconds, replacing any timer pending for `key`."""
+        loop = asyncio.get_running_loop()
+        self._ensure_running(loop)
+        if key in self._timers:
+            self.cancelled += 1
+        deadline = loop.time() + delay
+        seq = next(self._seq)
+        self._timers[key] = (deadline, seq, callback, args)
+        wake = not self._heap or deadline < self._heap[0][0]
+        heapq.heappush(self._heap, (deadline, seq, key))
+        self.scheduled += 1
+        if len(self._heap) > 2 * len(self._timers) + 64:
+            self._compact()
+        if wake:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> bool:
+        # The heap entry stays behind and is skipped when it surfaces
+        if self._timers.pop(key, None) is None:
+            return False
+        self.cancelled += 1
+        return True
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._heap.clear()
+        self._timers.clear()
+
+    def _ensure_running(self, loop: asyncio.AbstractEventLoop):
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    def _compact(self):
+        self._heap = [(deadline, seq, key) for key, (deadline, seq, _, _) in self._timers.items()]
+        heapq.heapify(self._heap)
+
+    def _fire_due(self, now: float):
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            timer = self._timers.get(key)
+            if timer is None or timer[1] != seq:
+                continue  # replaced or cancelled
+            del self._timers[key]
+            self.fired += 1
+            timers_fired.inc()
+            _, _, callback, args = timer
+            try:
+                result = callback(*args)
+            except Exception as e:
+                logs.event("timer_callback_failed", logging.ERROR, exc_info=e, key=key)
+                continue
+            if asyncio.iscoroutine(result) or asyncio.isfuture(result):
+                task = asyncio.ensure_future(result)
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._fire_due(loop.time())
+            # Sleep until the earliest deadline, or until schedule() brings one forward
+            handle = loop.call_at(self._heap[0][0], self._wakeup.set) if self._heap else None
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if handle:
+                handle.cancel()
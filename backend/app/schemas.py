@@ -1,7 +1,7 @@
 # backend/app/schemas.py
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 # User-related schemas
 class UserBase(BaseModel):
@@ -27,3 +27,17 @@ class Token(BaseModel):
     token_type: str
 
 # For simplicity, we use UserOut for /auth/me responses (could create separate schema if needed)
+
+# Stats and leaderboard
+class UserStatsOut(BaseModel):
+    user_id: int
+    username: str
+    games_played: int = 0
+    wins: int = 0
+    total_score: int = 0
+    best_score: int = 0
+    longest_word: str = ""
+
+class LeaderboardPage(BaseModel):
+    entries: List[UserStatsOut]
+    next_cursor: Optional[str] = None  # pass as ?after= to fetch the next page
@@ -0,0 +1,54 @@
+# backend/app/solver.py
+"""Best moves for one player within a time budget: steals off the table first, then words from their hand."""
+import heapq
+import os
+import time
+from typing import List, Optional, Tuple
+
+from . import anagram
+from .state import GameState
+
+# Environment configuration
+SOLVER_BUDGET_MS = float(os.environ.get("SOLVER_BUDGET_MS", "25"))  # per get_hint call
+MIN_WORD_LEN = 3  # shorter words are legal but not worth suggesting
+
+
+def solve(game: GameState, sid: str, budget_ms: float = SOLVER_BUDGET_MS, limit: int = 5,
+          min_len: int = MIN_WORD_LEN) -> Tuple[List[dict], bool]:
+    """The `limit` best legal moves for `sid`, and whether the search finished within the budget."""
+    player = game.players.get(sid)
+    if player is None:
+        return [], True
+    hand = player.letters
+    if not hand:
+        return [], True
+    deadline = time.perf_counter() + budget_ms / 1000
+    index = anagram.get_index()
+    # (points, 0 for a steal / 1 for a form, word, steal) - move dicts are only built for the winners.
+    # Points are the change in end_game scores: the mover's gain plus what a steal's victim loses
+    candidates: List[tuple] = []
+    steals, complete = game.board.steals(index, hand, deadline)
+    for steal in steals:
+        base = len(steal["baseWord"]) ** 2
+        own = steal["targetPlayerId"] == sid
+        for word in steal["newWords"]:
+            candidates.append((len(word) ** 2 - base if own else len(word) ** 2 + base, 0, word, steal))
+    if complete:
+        words, complete = index.words_from(hand, min_len, deadline)
+        # A big hand spells thousands of words, and only the longest can make the cut
+        for word in heapq.nlargest(limit, words, key=len):
+            candidates.append((len(word) ** 2, 1, word, None))
+    moves = []
+    for points, _, word, steal in heapq.nsmallest(limit, candidates, key=lambda c: (-c[0], c[1], c[2])):
+        if steal is None:
+            moves.append({"type": "form", "word": word, "points": points})
+        else:
+            moves.append({"type": "steal", "word": word, "targetPlayerId": steal["targetPlayerId"],
+                          "baseWordId": steal["baseWordId"], "baseWord": steal["baseWord"], "points": points})
+    return moves, complete
+
+
+def best_move(game: GameState, sid: str, budget_ms: float) -> Optional[dict]:
+    """The top-ranked move for `sid` (a bot), or None when there is nothing to play."""
+    moves, _ = solve(game, sid, budget_ms, limit=1)
+    return moves[0] if moves and moves[0]["points"] > 0 else None
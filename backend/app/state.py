@@ -0,0 +1,113 @@
+# backend/app/state.py
+import secrets
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from . import letters
+from .anagram import BoardIndex
+from .turns import TurnOrder
+
+# Tile distribution (same as Bananagrams): 144 tiles
+TILE_COUNTS = {
+    'A': 13, 'B': 3, 'C': 3, 'D': 6, 'E': 18, 'F': 3, 'G': 4, 'H': 3,
+    'I': 12, 'J': 2, 'K': 2, 'L': 5, 'M': 3, 'N': 8, 'O': 11, 'P': 3,
+    'Q': 2, 'R': 9, 'S': 6, 'T': 9, 'U': 6, 'V': 3, 'W': 3, 'X': 2,
+    'Y': 3, 'Z': 2
+}
+# Unshuffled bag as ASCII bytes; each game copies and shuffles it
+FULL_BAG = b"".join(letter.encode() * count for letter, count in TILE_COUNTS.items())
+# State changes each game keeps so a client that missed some can catch up with just those (see sync)
+DELTA_HISTORY = 64
+# Seats filled by a bot (see add_bot) have sids with this prefix; no socket stands behind them
+BOT_SID_PREFIX = "bot:"
+
+
+class GameState:
+    """In-memory state of an active game."""
+    __slots__ = ("code", "tile_bag", "players", "turn_order", "started", "no_move_turns",
+                 "last_action_time", "game_active", "board", "last_word_id", "history", "version", "deltas")
+
+    def __init__(self, code: str, tile_bag: Optional[bytes] = None):
+        self.code = code
+        # Shuffled bag of tiles, one ASCII byte per tile; draw with chr(tile_bag.pop())
+        # (a restored game passes its journaled bag instead of paying for a fresh shuffle)
+        if tile_bag is None:
+            self.tile_bag = bytearray(FULL_BAG)
+            secrets.SystemRandom().shuffle(self.tile_bag)
+        else:
+            self.tile_bag = bytearray(tile_bag)
+        self.players: Dict[str, "PlayerState"] = {}  # key: sid (socket id), value: player state
+        self.turn_order = TurnOrder()                # ring of player sids in turn sequence
+        self.started: bool = False
+        self.no_move_turns: int = 0                  # count of consecutive turns with no action
+        self.last_action_time: float = time.monotonic()
+        self.game_active: bool = True
+        self.board = BoardIndex(self.players)        # groups the words on the table for steal queries
+        self.last_word_id: int = 0                   # word ids are small per-game integers
+        # Every word played, in order: (sid, word_id, word, was_stolen); persisted when the game ends
+        self.history: List[Tuple[str, int, str, bool]] = []
+        self.version: int = 0                        # bumped by every state change broadcast to the room
+        self.deltas: Optional[Deque[Tuple[str, Dict[str, Any]]]] = None  # recent (event, data), created on first change
+
+    def new_word_id(self) -> int:
+        self.last_word_id += 1
+        return self.last_word_id
+
+    def record_change(self, event: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp a state-change event with the next version and remember it for sync."""
+        self.version += 1
+        data["v"] = self.version
+        if self.deltas is None:
+            self.deltas = deque(maxlen=DELTA_HISTORY)
+        self.deltas.append((event, data))
+        return data
+
+    def changes_since(self, version: int) -> Optional[List[Tuple[str, Dict[str, Any]]]]:
+        """The (event, data) changes after `version`, or None if they're no longer all remembered."""
+        if version == self.version:
+            return []
+        if not self.deltas or not 0 <= version < self.version or self.deltas[0][1]["v"] > version + 1:
+            return None
+        return [change for change in self.deltas if change[1]["v"] > version]
+
+    def draw_tile(self) -> str:
+        return chr(self.tile_bag.pop())
+
+    def rename_player(self, old_sid: str, new_sid: str):
+        """Move a player to a new socket id (after a reconnect), keeping their seat, words and history."""
+        player = self.players.get(old_sid)
+        if player is None or new_sid in self.players:
+            return
+        # Rebuild in place: the board index holds a reference to this dict, and join order matters
+        seated = [(new_sid if sid == old_sid else sid, p) for sid, p in self.players.items()]
+        self.players.clear()
+        self.players.update(seated)
+        player.sid = new_sid
+        self.turn_order.rename(old_sid, new_sid)
+        self.history = [(new_sid if sid == old_sid else sid, *rest) for sid, *rest in self.history]
+        self.board.changed()
+
+
+class PlayerState:
+    __slots__ = ("sid", "name", "user_id", "token", "hand", "words")
+
+    def __init__(self, sid: str, name: str, user_id: Optional[int] = None):
+        self.sid = sid
+        self.name = name
+        self.user_id = user_id  # user id if logged in, else None (guest)
+        self.token = secrets.token_urlsafe(16)  # lets the player take their seat back (resume_game)
+        self.hand = bytearray(26)       # letters in hand (not yet used in placed words), count per A-Z
+        self.words: Dict[int, str] = {} # word_id -> word text for words this player has on the board
+
+    @property
+    def is_bot(self) -> bool:
+        return self.sid.startswith(BOT_SID_PREFIX)
+
+    @property
+    def letters(self) -> List[str]:
+        """Letters in hand, expanded and in alphabetical order."""
+        return letters.expand(self.hand)
+
+    def add_letter(self, letter: str):
+        letters.add(self.hand, letter)
@@ -0,0 +1,80 @@
+# backend/app/turns.py
+from typing import Dict, Iterator, Optional
+
+
+class TurnOrder:
+    """Circular turn order (a doubly-linked ring keyed by sid) with O(1) append, remove and advance."""
+    __slots__ = ("_next", "_prev", "_head", "current", "turn")
+
+    def __init__(self):
+        self._next: Dict[str, str] = {}
+        self._prev: Dict[str, str] = {}
+        self._head: Optional[str] = None     # first player in join order (for iteration)
+        self.current: Optional[str] = None   # sid whose turn it is
+        self.turn: int = 0                   # bumped whenever the turn changes hands
+
+    def __len__(self) -> int:
+        return len(self._next)
+
+    def __contains__(self, sid: str) -> bool:
+        return sid in self._next
+
+    def __iter__(self) -> Iterator[str]:
+        sid = self._head
+        for _ in range(len(self._next)):
+            yield sid
+            sid = self._next[sid]
+
+    def append(self, sid: str):
+        """Add a player at the end of the order (just before the first player)."""
+        if sid in self._next:
+            return
+        if self._head is None:
+            self._next[sid] = self._prev[sid] = sid
+            self._head = self.current = sid
+            return
+        last = self._prev[self._head]
+        self._next[last] = sid
+        self._prev[sid] = last
+        self._next[sid] = self._head
+        self._prev[self._head] = sid
+
+    def remove(self, sid: str):
+        if sid not in self._next:
+            return
+        nxt = self._next.pop(sid)
+        prev = self._prev.pop(sid)
+        if nxt == sid:  # last player left
+            self._head = self.current = None
+            return
+        self._next[prev] = nxt
+        self._prev[nxt] = prev
+        if self._head == sid:
+            self._head = nxt
+        if self.current == sid:
+            self.current = nxt
+            self.turn += 1
+
+    def rename(self, old: str, new: str):
+        """Give a player a new sid, keeping their place in the ring (and the turn, if it's theirs)."""
+        if old not in self._next or new in self._next:
+            return
+        nxt = self._next.pop(old)
+        prev = self._prev.pop(old)
+        if nxt == old:  # only player
+            self._next[new] = self._prev[new] = new
+        else:
+            self._next[new], self._prev[new] = nxt, prev
+            self._next[prev] = new
+            self._prev[nxt] = new
+        if self._head == old:
+            self._head = new
+        if self.current == old:
+            self.current = new
+
+    def advance(self) -> Optional[str]:
+        """Pass the turn to the next player and return their sid."""
+        if self.current is not None:
+            self.current = self._next[self.current]
+            self.turn += 1
+        return self.current
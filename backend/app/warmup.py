@@ -0,0 +1,113 @@
+# backend/app/warmup.py
+"""Startup warm-up (words, DB pool, crypto); /ready answers 503 and connects are refused until it finishes."""
+import asyncio
+import datetime
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import jwt
+from sqlalchemy import text
+
+from . import anagram, dictionary, logs, models, passwords
+
+# Environment configuration
+WARMUP_DB_CONNECTIONS = int(os.environ.get("WARMUP_DB_CONNECTIONS", "2"))  # pooled connections opened at startup
+WARMUP_ATTEMPTS = int(os.environ.get("WARMUP_ATTEMPTS", "5"))                # tries per required step before exiting
+WARMUP_RETRY_DELAY = float(os.environ.get("WARMUP_RETRY_DELAY", "1"))        # seconds before the first retry (doubles, max 30)
+
+
+def load_words():
+    dictionary.get_dictionary()
+    anagram.get_index()
+
+
+async def warm_words():
+    await asyncio.to_thread(load_words)
+
+
+async def warm_db():
+    pool = models.engine.pool
+    count = min(WARMUP_DB_CONNECTIONS, pool.size()) if hasattr(pool, "size") else 1
+
+    async def ping():
+        async with models.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # All at once, so the pool ends up holding `count` open connections
+    await asyncio.gather(*(ping() for _ in range(max(1, count))))
+
+
+async def warm_crypto():
+    await asyncio.to_thread(passwords.pwd_context.handler("bcrypt").get_backend)
+    passwords.pool.start()
+    payload = {"sub": "0", "exp": datetime.datetime.utcnow() + datetime.timedelta(minutes=1)}
+    jwt.decode(jwt.encode(payload, models.JWT_SECRET, algorithm=models.JWT_ALGORITHM),
+               models.JWT_SECRET, algorithms=[models.JWT_ALGORITHM])
+
+
+def exit_process():
+    """Give up on this worker: flush the logs and exit with status 1 for the supervisor to restart it."""
+    logs.shutdown()
+    os._exit(1)
+
+
+# (name, step, required for readiness). A required step that keeps failing exits the process for a restart;
+# a failed optional step is only reported, and its work happens lazily later
+STEPS: List[Tuple[str, Callable[[], Awaitable[None]], bool]] = [
+    ("words", warm_words, True),
+    ("db", warm_db, False),
+    ("crypto", warm_crypto, False),
+]
+
+
+class WarmUp:
+    """Runs the warm-up steps in order and remembers how each went."""
+    def __init__(self, steps: List[Tuple[str, Callable[[], Awaitable[None]], bool]] = STEPS,
+                 attempts: int = WARMUP_ATTEMPTS, retry_delay: float = WARMUP_RETRY_DELAY,
+                 give_up: Callable[[], None] = exit_process):
+        self.steps = steps
+        self.attempts = max(1, attempts)
+        self.retry_delay = retry_delay
+        self.give_up = give_up  # called when a required step has failed every attempt
+        self.ready = False
+        self.timings: Dict[str, float] = {}  # step -> seconds taken
+        self.errors: Dict[str, str] = {}     # step -> error, for steps that failed
+        self.started_at: Optional[float] = None
+        self.ready_after: Optional[float] = None  # seconds from start to ready
+
+    async def run(self):
+        self.started_at = time.perf_counter()
+        ready = True
+        for name, step, required in self.steps:
+            t0 = time.perf_counter()
+            for attempt in range(1, self.attempts + 1 if required else 2):
+                try:
+                    await step()
+                except Exception as e:
+                    self.errors[name] = repr(e)
+                    logs.event("warmup_step_failed", logging.ERROR if required else logging.WARNING,
+                               exc_info=e, step=name, attempt=attempt)
+                    if required and attempt < self.attempts:
+                        await asyncio.sleep(min(self.retry_delay * 2 ** (attempt - 1), 30))
+                else:
+                    self.errors.pop(name, None)
+                    break
+            else:
+                ready = ready and not required
+            self.timings[name] = time.perf_counter() - t0
+            if not ready:
+                break  # no point warming the rest of a worker that is about to exit
+        self.ready = ready
+        if ready:
+            self.ready_after = time.perf_counter() - self.started_at
+        logs.event("warmup_finished", logging.INFO if ready else logging.CRITICAL, ready=ready,
+                   seconds=round(time.perf_counter() - self.started_at, 3),
+                   **{f"{name}_ms": round(t * 1000, 1) for name, t in self.timings.items()})
+        if not ready:
+            self.give_up()
+
+    def stats(self) -> Dict[str, object]:
+        return {"ready": self.ready, "steps_ms": {name: round(t * 1000, 1) for name, t in self.timings.items()},
+                "errors": self.errors, "ready_after_ms": round(self.ready_after * 1000, 1) if self.ready_after else None}
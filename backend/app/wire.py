@@ -0,0 +1,90 @@
+# backend/app/wire.py
+"""Socket.IO packets in msgpack or JSON, answering each connection in the encoding it first sent."""
+from typing import Dict
+
+import msgpack
+import socketio
+from socketio import packet
+
+from . import metrics
+
+wire_bytes = metrics.Counter("socketio_wire_bytes_total", "Encoded Socket.IO packet bytes", ["format", "direction"])
+wire_connections = metrics.Counter("socketio_wire_connections_total", "Connections by negotiated encoding", ["format"])
+
+
+class WirePacket(packet.Packet):
+    """Decodes either encoding; encoding is picked by WireServer per recipient."""
+    # Game payloads are plain JSON types, so skip the per-packet scan for bytes attachments
+    uses_binary_events = False
+
+    compact = False  # layout of the last msgpack packet decoded
+
+    def decode(self, encoded_packet):
+        if isinstance(encoded_packet, bytes):
+            decoded = msgpack.unpackb(encoded_packet)
+            if isinstance(decoded, list):
+                self.compact = True
+                self.packet_type, self.data = decoded[0], decoded[1]
+                self.id = decoded[2] if len(decoded) > 2 else None
+                self.namespace = decoded[3] if len(decoded) > 3 else "/"
+            else:
+                self.packet_type = decoded["type"]
+                self.data = decoded.get("data")
+                self.id = decoded.get("id")
+                self.namespace = decoded.get("nsp", "/")
+            return 0
+        return super().decode(encoded_packet)
+
+    def encode_msgpack(self, compact: bool = False) -> bytes:
+        # Standard: a map of type/data/nsp/id (python-socketio's MsgPackPacket, socket.io-msgpack-parser).
+        # Compact: [type, data, id?, nsp?], cheaper than map keys for small game payloads (frontend/src/wire.ts)
+        if not compact:
+            return msgpack.packb(self._to_dict())
+        if self.namespace not in (None, "/"):
+            return msgpack.packb([self.packet_type, self.data, self.id, self.namespace])
+        if self.id is not None:
+            return msgpack.packb([self.packet_type, self.data, self.id])
+        return msgpack.packb([self.packet_type, self.data])
+
+
+class CompactPacket(WirePacket):
+    """Client-side packet class for python-socketio clients speaking the compact layout."""
+    def encode(self):
+        return self.encode_msgpack(compact=True)
+
+
+class WireServer(socketio.AsyncServer):
+    """AsyncServer that answers each connection in the encoding it speaks."""
+    def __init__(self, **kwargs):
+        super().__init__(serializer=WirePacket, **kwargs)
+        self.msgpack_sids: Dict[str, bool] = {}  # Engine.IO sid of a msgpack connection -> compact layout
+
+    async def _handle_eio_message(self, eio_sid, data):
+        # The JSON protocol only sends binary frames as announced attachments, so an unannounced one means msgpack
+        if isinstance(data, bytes) and eio_sid not in self._binary_packet:
+            wire_bytes.inc("msgpack", "in", amount=len(data))
+            if eio_sid not in self.msgpack_sids:
+                # Decode here once to learn the layout, then dispatch as usual
+                pkt = self.packet_class(encoded_packet=data)
+                self.msgpack_sids[eio_sid] = pkt.compact
+                wire_connections.inc("msgpack-compact" if pkt.compact else "msgpack")
+        elif isinstance(data, str):
+            wire_bytes.inc("json", "in", amount=len(data))
+            if data[:1] == "0":  # CONNECT
+                wire_connections.inc("json")
+        await super()._handle_eio_message(eio_sid, data)
+
+    async def _send_packet(self, eio_sid, pkt):
+        compact = self.msgpack_sids.get(eio_sid)
+        if compact is not None:
+            encoded = pkt.encode_msgpack(compact)
+            wire_bytes.inc("msgpack", "out", amount=len(encoded))
+            await self.eio.send(eio_sid, encoded)
+            return
+        encoded = pkt.encode()
+        wire_bytes.inc("json", "out", amount=len(encoded))
+        await self.eio.send(eio_sid, encoded)
+
+    async def _handle_eio_disconnect(self, eio_sid):
+        await super()._handle_eio_disconnect(eio_sid)
+        self.msgpack_sids.pop(eio_sid, None)
@@ -0,0 +1,51 @@
+# backend/benchmarks/bench_anagram.py
+"""Latency of find_steals (BoardIndex.steals) at full table size.
+
+Run from the backend directory:  python -m benchmarks.bench_anagram
+"""
+import random
+import statistics
+import time
+
+from app import anagram
+from app.state import GameState, PlayerState
+
+PLAYERS = 5
+WORDS_PER_PLAYER = 12
+QUERIES = 200
+
+
+def main():
+    t0 = time.perf_counter()
+    index = anagram.get_index()
+    print(f"index build: {(time.perf_counter() - t0) * 1000:.0f} ms ({len(index)} words)")
+
+    rng = random.Random(0)
+    candidates = [w for w in index._words if 3 <= len(w) <= 8]
+    game = GameState("BENCH")
+    for p in range(PLAYERS):
+        game.players[f"p{p}"] = PlayerState(f"p{p}", f"Player{p}")
+    for i in range(PLAYERS * WORDS_PER_PLAYER):
+        game.players[f"p{i % PLAYERS}"].words[game.new_word_id()] = rng.choice(candidates)
+    board = game.board
+    # Letters follow the real tile distribution
+    bag = "A" * 13 + "BBBCCC" + "D" * 6 + "E" * 18 + "FFFGGGGHHH" + "I" * 12 + "JJKKLLLLLMMM" + \
+          "N" * 8 + "O" * 11 + "PPPQQ" + "R" * 9 + "S" * 6 + "T" * 9 + "U" * 6 + "VVVWWWXXYYYZZ"
+
+    print(f"board: {sum(len(entries) for entries in board.groups().values())} words")
+    for hand_size in (1, 3, 6, 10, 15):
+        times = []
+        found = 0
+        for _ in range(QUERIES):
+            hand = rng.sample(bag, hand_size)
+            t0 = time.perf_counter()
+            steals, _ = board.steals(index, hand)
+            times.append(time.perf_counter() - t0)
+            found += len(steals)
+        times.sort()
+        print(f"hand={hand_size:2d}  p50={statistics.median(times) * 1000:6.2f} ms  "
+              f"p99={times[int(len(times) * 0.99) - 1] * 1000:6.2f} ms  avg steals={found / QUERIES:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# backend/benchmarks/bench_dictionary.py
+"""Word validation: preloaded Dictionary vs. per-call wordfreq.zipf_frequency.
+
+Run from the backend directory:  python -m benchmarks.bench_dictionary
+"""
+import random
+import time
+import timeit
+
+from wordfreq import zipf_frequency
+
+from app.dictionary import load_dictionary
+
+N = 20_000
+
+
+def main():
+    t0 = time.perf_counter()
+    d = load_dictionary()
+    load_s = time.perf_counter() - t0
+    print(f"dictionary load: {load_s * 1000:.0f} ms ({len(d)} words)")
+
+    # Mix of valid words and random junk, like real move traffic
+    rng = random.Random(0)
+    valid = rng.sample(sorted(d.words), N // 2)
+    junk = ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(3, 8)))
+            for _ in range(N // 2)]
+    sample = valid + junk
+    rng.shuffle(sample)
+
+    # Sanity check: both paths agree on the sample
+    mismatches = sum((zipf_frequency(w, "en", wordlist="large") > 0.0) != d.is_valid(w) for w in sample[:2000])
+    print(f"mismatches on 2000 words: {mismatches}")
+
+    old = min(timeit.repeat(lambda: [zipf_frequency(w, "en", wordlist="large") for w in sample], number=1, repeat=3))
+    new = min(timeit.repeat(lambda: [d.is_valid(w) for w in sample], number=1, repeat=3))
+    print(f"zipf_frequency: {old / N * 1e6:8.2f} us/word")
+    print(f"is_valid:       {new / N * 1e6:8.2f} us/word  ({old / new:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# backend/benchmarks/bench_flood.py
+"""One client flooding chat vs. everyone else's latency, with and without rate limits.
+
+Starts app.main:app in-process (uvicorn, fresh SQLite database). A flooder sits
+alone in its own lobby and sends send_chat as fast as it can (FLOODERS sockets,
+no waiting for acks). Meanwhile a player in a quiet lobby elsewhere on the
+node keeps asking for find_steals (exempt from its own limit here), and we
+record its ack latency. Run once with the default limits and once with them
+switched off (each mode in its own process, since limits are read at import).
+
+Run from the backend directory:  python -m benchmarks.bench_flood
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+FLOODERS = 4
+DURATION = 4.0
+
+
+async def measure() -> dict:
+    import socketio
+    import uvicorn
+
+    from app import main as server, metrics, models
+    from benchmarks.load_socketio import free_port, percentile
+
+    async with models.engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    server.event_limits.per_sid.pop("find_steals", None)  # the probe asks every 10 ms, past its own limit
+    port = free_port()
+    uv = uvicorn.Server(uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning"))
+    serve = asyncio.create_task(uv.serve())
+    while not uv.started or not server.warm_up.ready:  # sockets are refused until warm-up is done
+        await asyncio.sleep(0.05)
+    url = f"http://127.0.0.1:{port}"
+
+    async def client():
+        sio = socketio.AsyncClient()
+        await sio.connect(url, transports=["websocket"])
+        return sio
+
+    stop = asyncio.Event()
+    sent = 0
+
+    async def flood(sio, code):
+        nonlocal sent
+        while not stop.is_set():
+            await sio.emit("send_chat", {"code": code, "text": "spam" * 20})
+            sent += 1
+            await asyncio.sleep(0)
+
+    flooders = [await client() for _ in range(FLOODERS)]
+    spam_code = (await flooders[0].call("create_game", {"name": "Spammer"}))["code"]
+    for sio in flooders[1:]:
+        await sio.call("join_game", {"code": spam_code, "name": "Spammer"})
+
+    a, b = await client(), await client()
+    code = (await a.call("create_game", {"name": "A"}))["code"]
+    await b.call("join_game", {"code": code, "name": "B"})
+    latencies = []
+    tasks = [asyncio.create_task(flood(sio, spam_code)) for sio in flooders]
+    t_end = time.perf_counter() + DURATION
+    while time.perf_counter() < t_end:
+        t0 = time.perf_counter()
+        await a.call("find_steals", {"code": code}, timeout=30)
+        latencies.append(time.perf_counter() - t0)
+        await asyncio.sleep(0.01)
+    stop.set()
+    await asyncio.gather(*tasks)
+    limited = sum(float(line.rsplit(" ", 1)[1]) for line in metrics.render().splitlines()
+                  if line.startswith("rate_limited_total"))
+    for sio in flooders + [a, b]:
+        await sio.disconnect()
+    uv.should_exit = True
+    await serve
+    return {"spam_sent": sent, "spam_rejected": int(limited), "requests": len(latencies),
+            "p50": percentile(latencies, .5), "p95": percentile(latencies, .95), "p99": percentile(latencies, .99)}
+
+
+def run_mode(limits: bool) -> dict:
+    env = dict(os.environ)
+    db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    env["DATABASE_URL"] = f"sqlite+aiosqlite:///{db.name}"
+    env["LOG_LEVEL"] = "WARNING"
+    if not limits:
+        env.update(RATE_LIMIT_SID="", RATE_LIMIT_ROOM="", CONNECT_RATE_LIMIT="")
+    try:
+        out = subprocess.run([sys.executable, "-m", "benchmarks.bench_flood", "--child"], env=env,
+                             capture_output=True, text=True, check=True).stdout
+    finally:
+        os.unlink(db.name)
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    if parser.parse_args().child:
+        print(json.dumps(asyncio.run(measure())))
+        return
+    print(f"{FLOODERS} sockets flooding send_chat for {DURATION:.0f} s; latency of another lobby's find_steals:")
+    for limits in (False, True):
+        r = run_mode(limits)
+        print(f"limits {'on ' if limits else 'off'}: {r['spam_sent']:6d} spam sent, {r['spam_rejected']:6d} rejected; "
+              f"{r['requests']:4d} requests p50 {r['p50']:.2f} ms  p95 {r['p95']:.2f} ms  p99 {r['p99']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# backend/benchmarks/bench_login_storm.py
+"""Game-event latency while a burst of logins is being checked.
+
+A two-player game sends a find_steals request every 20 ms (through the
+game's actor, as a socket event would). After a quiet second, LOGINS logins hit
+/auth/login at once. Runs twice: bcrypt inline on the event loop (the old
+behaviour, PASSWORD_WORKERS=0) and on the password pool. Reports game-event
+latency before and during the storm, and how the logins fared.
+
+Uses a throwaway SQLite database. Run from the backend directory:
+    python -m benchmarks.bench_login_storm
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db.name}"
+os.environ.setdefault("BCRYPT_ROUNDS", "12")
+
+from fastapi import HTTPException  # noqa: E402
+
+from app import main, models, passwords, schemas  # noqa: E402
+
+LOGINS = 24
+EVENT_INTERVAL = 0.02
+QUIET = 1.0  # seconds of game traffic before the storm
+
+
+async def no_emit(*args, **kwargs):
+    pass
+
+
+def pct(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+
+
+async def play(code: str, sid: str, stop: asyncio.Event, samples: list):
+    # Latency is measured from when each event was due, so a blocked loop counts against it
+    due = time.perf_counter()
+    while not stop.is_set():
+        await main.handle_find_steals(sid, {"code": code})
+        samples.append((due, time.perf_counter() - due))
+        due += EVENT_INTERVAL
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+
+async def login(results: list):
+    t0 = time.perf_counter()
+    try:
+        await main.login(schemas.LoginRequest(username="storm", password="hunter22"))
+        results.append(("ok", time.perf_counter() - t0))
+    except passwords.PasswordPoolBusy:
+        results.append(("busy", time.perf_counter() - t0))
+    except HTTPException:
+        results.append(("denied", time.perf_counter() - t0))
+
+
+async def run(mode: str):
+    passwords.pool = passwords.PasswordPool(workers=0 if mode == "inline" else passwords.PASSWORD_WORKERS)
+    code = (await main.handle_create_game("p1", {"name": "One"}))["code"]
+    await main.handle_join_game("p2", {"code": code, "name": "Two"})
+    await main.handle_start_game("p1", {"code": code})
+
+    stop = asyncio.Event()
+    samples: list = []
+    player = asyncio.create_task(play(code, "p1", stop, samples))
+    await asyncio.sleep(QUIET)
+    t0 = time.perf_counter()
+    results: list = []
+    await asyncio.gather(*(login(results) for _ in range(LOGINS)))
+    storm_time = time.perf_counter() - t0
+    stop.set()
+    await player
+    quiet = [lat for due, lat in samples if due < t0]
+    storm = [lat for due, lat in samples if due >= t0]
+    await main.disconnect("p1")
+    await main.disconnect("p2")
+
+    ok = [t for r, t in results if r == "ok"]
+    print(f"{mode:6s} game events: quiet p50={pct(quiet, .5):7.1f} ms p99={pct(quiet, .99):7.1f} ms | "
+          f"storm p50={pct(storm, .5):7.1f} ms p99={pct(storm, .99):7.1f} ms max={max(storm) * 1000:7.1f} ms")
+    print(f"       logins: {len(ok)} ok, {sum(r == 'busy' for r, _ in results)} turned away, "
+          f"median {statistics.median(ok) * 1000:.0f} ms, storm over in {storm_time:.2f} s; pool {passwords.pool.stats()}")
+    passwords.pool.shutdown()
+
+
+async def bench():
+    async with models.engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    await main.signup(schemas.UserCreate(username="storm", password="hunter22"))
+    main.dictionary.get_dictionary()
+    main.anagram.get_index()
+    main.event_limits.per_sid.pop("find_steals", None)  # the probe asks every 20 ms, past the socket limit
+    print(f"bcrypt cost {passwords.BCRYPT_ROUNDS}, {passwords.PASSWORD_WORKERS} workers, {LOGINS} concurrent logins")
+    for mode in ("inline", "pool"):
+        await run(mode)
+    await main.match_writer.close()
+    await models.engine.dispose()
+
+
+def main_():
+    main.sio.emit = no_emit
+    main.sio.enter_room = lambda *args, **kwargs: None
+    try:
+        asyncio.run(bench())
+    finally:
+        os.unlink(_db.name)
+
+
+if __name__ == "__main__":
+    main_()
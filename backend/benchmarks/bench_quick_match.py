@@ -0,0 +1,147 @@
+# backend/benchmarks/bench_quick_match.py
+"""Quick-match seating and lobby-code allocation.
+
+1. Codes: the first --codes codes from LobbyCodes are checked for repeats and
+   timed against the old scheme (5 random letters from secrets.choice), which
+   reissues a code at random, including ones players were just given.
+2. Queued joins: --joins quick_match calls are issued at once through the real
+   handler (no network; emits are dropped), so they queue on the game actors
+   together. Reports throughput and per-call latency, and checks that every
+   player got a seat, no lobby is over MAX_PLAYERS and lobbies were filled
+   before new ones were opened.
+3. Churn: --rounds rounds of concurrent quick_match joins, leaves and starts,
+   checking after each round that the open-lobby index matches a full scan of
+   `games`.
+4. Picking an open lobby from the index vs. scanning `games` for one.
+
+Run from the backend directory:  LOG_LEVEL=WARNING python -m benchmarks.bench_quick_match [--joins 100000]
+"""
+import argparse
+import asyncio
+import random
+import secrets
+import time
+from typing import Dict, List
+
+from app import lobbies, main as server
+from benchmarks.load_socketio import percentile
+
+
+def compare_codes(n: int):
+    pool = lobbies.LobbyCodes()
+    t0 = time.perf_counter()
+    issued = [pool.code_at(i) for i in range(n)]
+    pool_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    rolled = [''.join(secrets.choice(lobbies.ALPHABET) for _ in range(5)) for _ in range(n)]
+    random_s = time.perf_counter() - t0
+    print(f"{n} codes: pool {pool_s / n * 1e6:.2f} us/code, {n - len(set(issued))} repeats; "
+          f"random {random_s / n * 1e6:.2f} us/code, {n - len(set(rolled))} repeats")
+    assert len(set(issued)) == n and all(len(c) == 5 and c.isalpha() for c in issued[:1000])
+
+
+def open_by_scan() -> Dict[str, int]:
+    """Open public lobbies -> players seated, from a scan of every game (all lobbies here are public)."""
+    return {code: len(g.players) for code, g in server.games.items()
+            if g.game_active and not g.started and 0 < len(g.players) < server.MAX_PLAYERS}
+
+
+def check_index():
+    listed = {code: n for n, bucket in enumerate(server.open_lobbies.buckets) for code in bucket}
+    expected = open_by_scan()
+    assert listed == expected, (len(listed), len(expected), set(listed) ^ set(expected))
+    for sid, (code, player) in server.sessions.items():
+        assert server.games[code].players.get(sid) is player
+    assert all(len(g.players) <= server.MAX_PLAYERS for g in server.games.values())
+
+
+async def quick_match(sid: str, latencies: List[float]):
+    t0 = time.perf_counter()
+    result = await server.handle_quick_match(sid, {"name": sid})
+    latencies.append(time.perf_counter() - t0)
+    assert "error" not in result, result
+
+
+async def queued_joins(n: int):
+    latencies: List[float] = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(quick_match(f"p{i}", latencies) for i in range(n)))
+    elapsed = time.perf_counter() - t0
+    check_index()
+    sizes = [len(g.players) for g in server.games.values()]
+    print(f"\n{n} queued quick_match joins in {elapsed:.1f} s ({n / elapsed:,.0f}/s); latency "
+          f"p50 {percentile(latencies, .5):.0f} ms, p99 {percentile(latencies, .99):.0f} ms "
+          f"(includes the wait behind every earlier join)")
+    print(f"{len(sizes)} lobbies, {sizes.count(server.MAX_PLAYERS)} full; {len(server.open_lobbies)} open")
+    assert len(server.sessions) == n and len(sizes) == -(-n // server.MAX_PLAYERS)
+
+
+async def churn(rounds: int, per_round: int, rng: random.Random):
+    next_sid = len(server.sessions)
+    counts = {"joins": 0, "leaves": 0, "starts": 0}
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        ops = []
+        seated = rng.sample(list(server.sessions), min(per_round, len(server.sessions)))
+        for sid in seated[:per_round // 3]:
+            ops.append(server.in_game(server.sessions[sid][0], server.remove_player, sid, None))
+            counts["leaves"] += 1
+        waiting = [code for code, g in server.games.items() if not g.started]
+        for code in rng.sample(waiting, min(per_round // 10, len(waiting))):
+            host = next(iter(server.games[code].players))
+            ops.append(server.in_game(code, server._routed_handlers["handle_start_game"], host, {"code": code}))
+            counts["starts"] += 1
+        for _ in range(per_round // 2):
+            ops.append(quick_match(f"p{next_sid}", []))
+            next_sid += 1
+            counts["joins"] += 1
+        rng.shuffle(ops)
+        await asyncio.gather(*ops)
+        check_index()
+    print(f"\nchurn: {rounds} rounds, {counts['joins']} joins, {counts['leaves']} leaves, {counts['starts']} starts "
+          f"in {time.perf_counter() - t0:.1f} s; index matched a full scan after every round")
+
+
+def pick_cost():
+    n = 2000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        code = server.open_lobbies.take()
+        if code:
+            server.open_lobbies.release(code)
+    index_us = (time.perf_counter() - t0) / n * 1e6
+    t0 = time.perf_counter()
+    for _ in range(n // 100):
+        max((g for g in server.games.values() if g.game_active and not g.started
+             and len(g.players) < server.MAX_PLAYERS), key=lambda g: len(g.players), default=None)
+    scan_us = (time.perf_counter() - t0) / (n // 100) * 1e6
+    print(f"\npick an open lobby among {len(server.games)} games: index {index_us:.1f} us, scan {scan_us:,.0f} us")
+
+
+async def run(args):
+    async def emit(*a, **k):
+        pass
+
+    server.sio.emit = emit
+    server.sio.manager.is_connected = lambda *a, **k: False
+    server.game_reaper.max_games = args.joins  # room for every lobby the joins open
+    await queued_joins(args.joins)
+    await churn(args.rounds, args.per_round, random.Random(3))
+    pick_cost()
+    await server.outbound.flush()
+    await server.turn_timers.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--codes", type=int, default=1_000_000)
+    parser.add_argument("--joins", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--per-round", type=int, default=3000)
+    args = parser.parse_args()
+    compare_codes(args.codes)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# backend/benchmarks/bench_reaper.py
+"""Reaper sweep cost on a full registry, and how close approx_bytes is to tracemalloc.
+
+1. Builds games mid-play (players with hands, words on the table, remembered
+   changes) and compares reaper.approx_bytes with what tracemalloc attributes
+   to them, GameState and session entries only.
+2. Creates --games lobbies through the real create_game/join_game handlers (no
+   network; emits are dropped), marks a quarter of them idle, sets a memory
+   budget a third below the estimate, and runs one sweep: games reaped, sweep
+   time, and the longest stretch the sweep held the event loop.
+
+Run from the backend directory:  python -m benchmarks.bench_reaper [--games 20000]
+"""
+import argparse
+import asyncio
+import random
+import secrets
+import time
+import tracemalloc
+
+from app import main as server, reaper
+from app.state import GameState, PlayerState
+
+SAMPLE_WORDS = ["CAT", "TREES", "BANANA", "STEAL", "QUIZ", "ORANGE", "PLANTS", "GRAMS"]
+
+
+def build_game(code, n_players, n_words, n_changes, rng, sessions):
+    game = GameState(code)
+    for p in range(n_players):
+        sid = secrets.token_urlsafe(15)
+        player = PlayerState(sid, f"Player{p}")
+        for _ in range(6):
+            player.add_letter(game.draw_tile())
+        game.players[sid] = player
+        game.turn_order.append(sid)
+        sessions[sid] = (code, player)
+    sids = list(game.players)
+    for _ in range(n_words):
+        sid, word_id, word = rng.choice(sids), game.new_word_id(), rng.choice(SAMPLE_WORDS)
+        game.players[sid].words[word_id] = word
+        game.history.append((sid, word_id, word, False))
+        game.record_change("word_placed", {"sid": sid, "word": word, "word_id": word_id})
+    for _ in range(n_changes):
+        game.record_change("tile_flipped", {"sid": rng.choice(sids), "letter": "E"})
+    return game
+
+
+def estimate_accuracy():
+    print(f"{'players':>7s} {'words':>5s} {'changes':>7s} {'tracemalloc':>12s} {'approx_bytes':>13s}")
+    for n_players, n_words, n_changes in ((1, 0, 1), (2, 4, 10), (4, 12, 40), (5, 30, 64)):
+        rng, sessions = random.Random(0), {}
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        games = [build_game(f"G{i:05d}", n_players, n_words, n_changes, rng, sessions) for i in range(1000)]
+        measured = (tracemalloc.get_traced_memory()[0] - before) / len(games)
+        tracemalloc.stop()
+        approx = sum(reaper.approx_bytes(g) for g in games) / len(games)
+        print(f"{n_players:7d} {n_words:5d} {n_changes:7d} {measured:10.0f} B {approx:11.0f} B")
+
+
+async def sweep_cost(n_games: int):
+    async def emit(*args, **kwargs):
+        pass
+
+    server.sio.emit = emit
+    server.sio.manager.is_connected = lambda *a, **k: False
+    t0 = time.perf_counter()
+    for i in range(n_games):
+        code = (await server.handle_create_game(f"host{i}", {"name": "Host"}))["code"]
+        await server.handle_join_game(f"guest{i}", {"code": code, "name": "Guest"})
+    print(f"\ncreated {n_games} lobbies in {time.perf_counter() - t0:.1f} s")
+
+    now = time.monotonic()
+    for game in list(server.games.values())[::4]:
+        game.last_action_time = now - reaper.LOBBY_IDLE_TIMEOUT - 1
+    estimate = sum(reaper.approx_bytes(g) for g in server.games.values())
+    r = server.game_reaper
+    r.memory_budget = int(estimate * 2 / 3)
+
+    longest = 0.0
+    stop = asyncio.Event()
+
+    async def watch_loop():
+        nonlocal longest
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0)
+            t = time.perf_counter()
+            longest, last = max(longest, t - last), t
+
+    watcher = asyncio.create_task(watch_loop())
+    t0 = time.perf_counter()
+    gone = await r.sweep()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await watcher
+    stats = r.stats()
+    print(f"sweep: {gone} games reaped ({stats['reaped_idle']} idle, {stats['reaped_memory']} for memory) "
+          f"in {elapsed * 1000:.0f} ms; longest loop hold {longest * 1000:.1f} ms")
+    print(f"estimate {estimate / 2**20:.1f} MiB -> {stats['estimated_bytes'] / 2**20:.1f} MiB "
+          f"(budget {r.memory_budget / 2**20:.1f} MiB); {len(server.games)} games and {len(server.sessions)} "
+          f"sessions left")
+    t0 = time.perf_counter()
+    await r.sweep()
+    print(f"steady-state sweep of {len(server.games)} games: {(time.perf_counter() - t0) * 1000:.1f} ms")
+    await server.outbound.flush()
+    await server.turn_timers.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20000)
+    args = parser.parse_args()
+    estimate_accuracy()
+    asyncio.run(sweep_cost(args.games))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# backend/benchmarks/bench_solver.py
+"""Solver latency across hand sizes and table sizes, with and without the time budget.
+
+For each hand size, SAMPLES random positions are built: a hand drawn from a
+shuffled bag and a table of dictionary words (3-8 letters) spread over 3
+opponents. Each position is solved with no budget (the full search) and with
+the bot and hint budgets, reporting p50/p99/max latency and how often the
+budgeted search still finished. For small hands, a brute-force reference
+(every ordering of every subset of the hand, checked against the dictionary)
+shows what the signature walk replaces.
+
+Run from the backend directory:  python -m benchmarks.bench_solver [--samples 200]
+"""
+import argparse
+import itertools
+import random
+import time
+from typing import List
+
+from app import anagram, dictionary, main as server, solver
+from app.state import GameState, PlayerState
+from benchmarks.load_socketio import percentile
+
+HAND_SIZES = [3, 5, 7, 10, 14, 20, 30]
+TABLE_SIZES = [0, 12, 40]
+
+
+def position(rng: random.Random, hand_size: int, table_size: int, table_words: List[str]) -> GameState:
+    game = GameState("BENCH")
+    me = PlayerState("me", "Me")
+    for _ in range(hand_size):
+        me.add_letter(game.draw_tile())
+    game.players["me"] = me
+    opponents = [PlayerState(f"op{i}", f"Op{i}") for i in range(3)]
+    for op in opponents:
+        game.players[op.sid] = op
+    for _ in range(table_size):
+        rng.choice(opponents).words[game.new_word_id()] = rng.choice(table_words)
+    return game
+
+
+def brute_force(hand: List[str], words: frozenset, min_len: int) -> set:
+    found = set()
+    for n in range(min_len, len(hand) + 1):
+        for perm in itertools.permutations(hand, n):
+            word = "".join(perm)
+            if word in words:
+                found.add(word)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    words = dictionary.get_dictionary().words
+    anagram.get_index()
+    rng = random.Random(7)
+    table_words = sorted(w for w in words if 3 <= len(w) <= 8)
+    budgets = [("full", 1e9), (f"bot {server.BOT_BUDGET_MS:g}ms", server.BOT_BUDGET_MS),
+               (f"hint {solver.SOLVER_BUDGET_MS:g}ms", solver.SOLVER_BUDGET_MS)]
+
+    print(f"{'hand':>4s} {'table':>5s} {'budget':>11s} {'p50 ms':>8s} {'p99 ms':>8s} {'max ms':>8s} "
+          f"{'complete':>9s} {'moves':>6s}")
+    for table_size in TABLE_SIZES:
+        for hand_size in HAND_SIZES:
+            games = [position(rng, hand_size, table_size, table_words) for _ in range(args.samples)]
+            for label, budget in budgets:
+                latencies, complete, found = [], 0, 0
+                for game in games:
+                    t0 = time.perf_counter()
+                    moves, done = solver.solve(game, "me", budget, limit=5)
+                    latencies.append(time.perf_counter() - t0)
+                    complete += done
+                    found += bool(moves)
+                print(f"{hand_size:4d} {table_size:5d} {label:>11s} {percentile(latencies, .5):8.2f} "
+                      f"{percentile(latencies, .99):8.2f} {percentile(latencies, 1):8.2f} "
+                      f"{complete / len(games):9.0%} {found / len(games):6.0%}")
+
+    print("\nforms only, signature walk vs. brute-force permutations (median of 20 hands):")
+    for hand_size in (5, 7, 8):
+        walk, brute = [], []
+        for _ in range(20):
+            hand = position(rng, hand_size, 0, table_words).players["me"].letters
+            t0 = time.perf_counter()
+            fast = set(anagram.get_index().words_from(hand, solver.MIN_WORD_LEN)[0])
+            walk.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            slow = brute_force(hand, words, solver.MIN_WORD_LEN)
+            brute.append(time.perf_counter() - t0)
+            assert fast == slow, (hand, fast ^ slow)
+        print(f"  {hand_size} letters: walk {percentile(walk, .5):7.2f} ms   brute force {percentile(brute, .5):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
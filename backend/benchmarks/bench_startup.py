@@ -0,0 +1,107 @@
+# backend/benchmarks/bench_startup.py
+"""Cold start: import time of app.main by module, then time to /health and to /ready.
+
+1. Runs `python -X importtime -c "import app.main"` in fresh processes (best of
+   --runs) and breaks the total down by top-level package (self time, so the
+   rows add up to the total) and by app module (cumulative, including what
+   each one pulls in first).
+2. Starts uvicorn app.main:app in a subprocess on a fresh SQLite database and
+   polls /health and /ready, reporting when each first answered 200 and the
+   warm-up step timings /ready returns.
+
+Run from the backend directory:  python -m benchmarks.bench_startup [--runs 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from benchmarks.load_socketio import free_port
+
+
+def import_times() -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every module imported by `import app.main`."""
+    env = dict(os.environ, LOG_LEVEL="WARNING")
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], env=env,
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def report_imports(runs: int, top: int):
+    best = min((import_times() for _ in range(runs)), key=lambda rows: sum(r[1] for r in rows))
+    total = sum(r[1] for r in best)
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in best:
+        by_package[name.split(".")[0]] += self_us
+    print(f"import app.main: {total / 1000:.0f} ms, {len(best)} modules (best of {runs})")
+    print(f"{'package':24s} {'self ms':>8s} {'share':>6s}")
+    for package, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"{package:24s} {us / 1000:8.1f} {us / total:6.0%}")
+    print(f"\n{'app module':24s} {'cumulative ms':>13s}")
+    for name, _, cumulative in sorted((r for r in best if r[0].startswith("app.")), key=lambda r: -r[2]):
+        print(f"{name:24s} {cumulative / 1000:13.1f}")
+
+
+def poll(url: str) -> Tuple[int, dict]:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as resp:
+            return resp.status, json.loads(resp.read() or b"{}")
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def report_cold_start(timeout: float = 60):
+    port = free_port()
+    db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{db.name}", LOG_LEVEL="WARNING")
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+                             "--log-level", "warning"], env=env)
+    health = ready = None
+    body: dict = {}
+    try:
+        while ready is None and time.perf_counter() - t0 < timeout:
+            try:
+                if health is None and poll(f"http://127.0.0.1:{port}/health")[0] == 200:
+                    health = time.perf_counter() - t0
+                status, body = poll(f"http://127.0.0.1:{port}/ready")
+                if status == 200:
+                    ready = time.perf_counter() - t0
+            except OSError:
+                pass  # not listening yet
+            time.sleep(0.02)
+    finally:
+        proc.terminate()
+        proc.wait()
+        os.unlink(db.name)
+    if ready is None:
+        raise RuntimeError(f"not ready after {timeout:.0f} s: {body}")
+    print(f"\ncold start: /health after {health * 1000:.0f} ms, /ready after {ready * 1000:.0f} ms")
+    print("warm-up steps (ms):", ", ".join(f"{k} {v}" for k, v in body["steps_ms"].items()),
+          f"- errors: {body['errors']}" if body["errors"] else "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="import measurements (the fastest is shown)")
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    args = parser.parse_args()
+    report_imports(args.runs, args.top)
+    report_cold_start()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# backend/benchmarks/bench_state_memory.py
+"""Bytes per game for the compact GameState/PlayerState vs. the original list/datetime layout.
+
+Each game is measured mid-play: every player holds 6 letters and has 4 words on
+the table. Run from the backend directory:  python -m benchmarks.bench_state_memory
+
+Last run: 2308 vs 3292 B/game at 2 players (1.4x), 6074 vs 8022 at 8 (1.3x).
+The bag and hands shrank ~1.6x when they were packed; since then a game also
+carries its O(1) turn ring (~440 B), a resume token per player (~70 B), the
+board index and the word history, none of which the legacy layout had.
+"""
+import random
+import secrets
+import tracemalloc
+from datetime import datetime
+
+from app.state import GameState, PlayerState, TILE_COUNTS
+
+GAMES = 2_000
+HAND = 6
+WORDS = 4
+SAMPLE_WORDS = ["CAT", "TREES", "BANANA", "STEAL", "QUIZ", "ORANGE", "PLANTS", "GRAMS"]
+
+
+class LegacyGameState:
+    """The original representation, kept here for comparison."""
+    def __init__(self, code):
+        self.code = code
+        self.tile_bag = [letter for letter, count in TILE_COUNTS.items() for _ in range(count)]
+        secrets.SystemRandom().shuffle(self.tile_bag)
+        self.players = {}
+        self.turn_order = []
+        self.current_turn_index = 0
+        self.no_move_turns = 0
+        self.last_action_time = datetime.utcnow()
+        self.game_active = True
+
+
+class LegacyPlayerState:
+    def __init__(self, sid, name, user_id=None):
+        self.sid = sid
+        self.name = name
+        self.user_id = user_id
+        self.letters = []
+        self.words = {}
+
+
+def build_legacy(code, n_players, rng):
+    game = LegacyGameState(code)
+    for p in range(n_players):
+        sid = secrets.token_urlsafe(15)
+        player = LegacyPlayerState(sid, f"Player{p}")
+        for _ in range(HAND):
+            player.letters.append(game.tile_bag.pop())
+        for _ in range(WORDS):
+            player.words[secrets.token_hex(4)] = rng.choice(SAMPLE_WORDS)
+        game.players[sid] = player
+        game.turn_order.append(sid)
+    game.last_action_time = datetime.utcnow()
+    return game
+
+
+def build_compact(code, n_players, rng):
+    game = GameState(code)
+    for p in range(n_players):
+        sid = secrets.token_urlsafe(15)
+        player = PlayerState(sid, f"Player{p}")
+        for _ in range(HAND):
+            player.add_letter(game.draw_tile())
+        for _ in range(WORDS):
+            word_id = game.new_word_id()
+            word = rng.choice(SAMPLE_WORDS)
+            player.words[word_id] = word
+        game.players[sid] = player
+        game.turn_order.append(sid)
+    return game
+
+
+def bytes_per_game(builder, n_players):
+    rng = random.Random(0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = [builder(f"G{i:05d}", n_players, rng) for i in range(GAMES)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del games
+    return (after - before) / GAMES
+
+
+def main():
+    for n in (2, 5, 8):
+        legacy = bytes_per_game(build_legacy, n)
+        compact = bytes_per_game(build_compact, n)
+        print(f"{n} players: legacy {legacy:8.0f} B/game   compact {compact:8.0f} B/game   "
+              f"({legacy / compact:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/benchmarks/bench_timers.py
+"""Turn timers for 10k concurrent games: one sleeping task per turn vs. TimerScheduler.
+
+Every game takes a move every ~100 ms for a few seconds, which is what a busy
+node looks like: each move starts a fresh 30 s turn timer. Reports the number of
+live asyncio tasks and the event-loop lag while the games are running.
+
+Run from the backend directory:  python -m benchmarks.bench_timers
+"""
+import asyncio
+import random
+import statistics
+import time
+
+from app.scheduler import TimerScheduler
+
+GAMES = 10_000
+TURN_TIMEOUT = 30
+MOVE_INTERVAL = 0.1
+DURATION = 3.0
+
+
+async def on_timeout(code):
+    pass
+
+
+async def sleeping_timer(code):
+    # The old per-turn task: sleeps the full timeout even after the turn moved on
+    await asyncio.sleep(TURN_TIMEOUT)
+    await on_timeout(code)
+
+
+async def measure_lag(stop: asyncio.Event, samples: list):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        t0 = loop.time()
+        await asyncio.sleep(0.01)
+        samples.append(loop.time() - t0 - 0.01)
+
+
+async def run(mode: str):
+    scheduler = TimerScheduler()
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    lag: list = []
+    sampler = asyncio.create_task(measure_lag(stop, lag))
+    rng = random.Random(0)
+    next_move = [loop.time() + rng.random() * MOVE_INTERVAL for _ in range(GAMES)]
+    old_tasks = []
+    end = loop.time() + DURATION
+    moves = 0
+    while loop.time() < end:
+        now = loop.time()
+        for code in range(GAMES):
+            if next_move[code] <= now:
+                next_move[code] = now + MOVE_INTERVAL
+                moves += 1
+                if mode == "tasks":
+                    old_tasks.append(asyncio.create_task(sleeping_timer(code)))
+                else:
+                    scheduler.schedule(code, TURN_TIMEOUT, on_timeout, code)
+        await asyncio.sleep(0.005)
+    live_tasks = len(asyncio.all_tasks())
+    stop.set()
+    await sampler
+    for t in old_tasks:
+        t.cancel()
+    await asyncio.gather(*old_tasks, return_exceptions=True)
+    pending = scheduler.pending
+    await scheduler.stop()
+    lag.sort()
+    print(f"{mode:9s} moves={moves:6d} live tasks={live_tasks:6d} pending timers={pending:6d} "
+          f"loop lag p50={statistics.median(lag) * 1000:6.2f} ms p99={lag[int(len(lag) * 0.99) - 1] * 1000:6.2f} ms")
+
+
+def main():
+    for mode in ("tasks", "scheduler"):
+        t0 = time.perf_counter()
+        asyncio.run(run(mode))
+        print(f"          wall {time.perf_counter() - t0:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# backend/benchmarks/bench_wire.py
+"""Bytes on the wire and encode/decode CPU: JSON vs msgpack packets over a full simulated game.
+
+Plays complete 4-player games through the real handlers (no network; emits
+and acks are captured), recording every Socket.IO packet the game produces:
+client requests, acks and broadcasts. Each packet is then encoded and decoded
+with python-socketio's stock JSON Packet, with WirePacket's JSON path (which
+skips the scan for binary attachments) and with both of WirePacket's msgpack
+layouts (standard map and compact array).
+Room broadcasts are counted once, not once per recipient.
+
+It also compares catching up after missing a few changes: the full game view
+(what a reconnect had to send before) vs. sync's list of missed changes.
+
+Run from the backend directory:  python -m benchmarks.bench_wire [--games 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import List
+
+# Simulated players act far faster than people; rate limits (app/ratelimit.py) would turn them away
+os.environ.setdefault("RATE_LIMIT_SID", "")
+os.environ.setdefault("RATE_LIMIT_ROOM", "")
+
+from socketio import packet  # noqa: E402
+
+from app import anagram, main as server  # noqa: E402
+from app.wire import WirePacket  # noqa: E402
+
+REPEAT = 20  # encode/decode passes over the captured packets
+
+
+async def play_game(packets: List[packet.Packet], resync: List[tuple], players: int, max_turns: int):
+    def request(sid, event, data):
+        packets.append((packet.EVENT, [event, data], 1))
+
+    async def call(handler, sid, event, data):
+        request(sid, event, data)
+        ack = await handler(sid, data)
+        packets.append((packet.ACK, [ack], 1))
+        return ack
+
+    sids = [f"s{i}-{time.perf_counter_ns()}" for i in range(players)]
+    code = (await call(server.handle_create_game, sids[0], "create_game", {"name": "Host"}))["code"]
+    for i, sid in enumerate(sids[1:]):
+        await call(server.handle_join_game, sid, "join_game", {"code": code, "name": f"Guest{i}"})
+    await call(server.handle_start_game, sids[0], "start_game", {"code": code})
+    index = anagram.get_index()
+    for _ in range(max_turns):
+        game = server.games.get(code)
+        if game is None:
+            break
+        sid = game.turn_order.current
+        hand = game.players[sid].letters
+        words, _ = index.words_from(hand, min_len=3)
+        steals = game.board.steals(index, hand)[0] if not words else []
+        if words:
+            word = max(words, key=len).upper()
+            await call(server.handle_form_word, sid, "form_word", {"code": code, "word": word, "tiles": list(word)})
+        elif steals:
+            steal = steals[0]
+            await call(server.handle_steal_word, sid, "steal_word", {
+                "code": code, "targetPlayerId": steal["targetPlayerId"], "baseWordId": steal["baseWordId"],
+                "newWord": steal["newWords"][0].upper()})
+        else:
+            await call(server.handle_flip_tile, sid, "flip_tile", {"code": code})
+        game = server.games.get(code)
+        if game is not None and game.version > 4:
+            other = next(s for s in game.players if s != game.turn_order.current)
+            resync.append((server.game_view(game, other), server.catch_up(game, other, game.version - 4)))
+    for sid in sids:
+        await server.remove_player(sid, None)
+    await server.outbound.flush()
+
+
+def measure(name: str, encode, decode, packets) -> dict:
+    encoded = [encode(p) for p in packets]
+    size = sum(len(e.encode() if isinstance(e, str) else e) for e in encoded)
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        for p in packets:
+            encode(p)
+    enc = (time.perf_counter() - t0) / REPEAT
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        for e in encoded:
+            decode(e)
+    dec = (time.perf_counter() - t0) / REPEAT
+    return {"name": name, "bytes": size, "encode_ms": enc * 1000, "decode_ms": dec * 1000}
+
+
+async def run(args):
+    captured = []
+
+    async def emit(event, data=None, room=None, to=None, skip_sid=None, **kwargs):
+        captured.append((packet.EVENT, [event, data], None))
+
+    server.sio.emit = emit
+    server.sio.manager.is_connected = lambda *a, **k: False
+    records: List[tuple] = []
+    resync: List[tuple] = []
+    for _ in range(args.games):
+        await play_game(records, resync, args.players, args.turns)
+    await server.turn_timers.stop()
+    raw = records + captured
+
+    stock = [packet.Packet(t, data=d, namespace="/", id=i) for t, d, i in raw]
+    wire = [WirePacket(t, data=d, namespace="/", id=i) for t, d, i in raw]
+    results = [
+        measure("JSON (stock Packet)", lambda p: p.encode(), lambda e: packet.Packet(encoded_packet=e), stock),
+        measure("JSON (WirePacket)", lambda p: p.encode(), lambda e: WirePacket(encoded_packet=e), wire),
+        measure("msgpack (standard)", lambda p: p.encode_msgpack(), lambda e: WirePacket(encoded_packet=e), wire),
+        measure("msgpack (compact)", lambda p: p.encode_msgpack(True), lambda e: WirePacket(encoded_packet=e), wire),
+    ]
+    base = results[0]
+    print(f"{args.games} games x {args.players} players: {len(raw)} packets "
+          f"({len(records)} requests/acks, {len(captured)} broadcasts)")
+    print(f"{'encoding':22s} {'bytes':>9s} {'vs JSON':>8s} {'encode ms':>10s} {'decode ms':>10s}")
+    for r in results:
+        print(f"{r['name']:22s} {r['bytes']:9d} {r['bytes'] / base['bytes']:8.0%} "
+              f"{r['encode_ms']:10.2f} {r['decode_ms']:10.2f}")
+
+    full = sum(len(json.dumps(view, separators=(",", ":"))) for view, _ in resync)
+    delta = sum(len(json.dumps(changes, separators=(",", ":"))) for _, changes in resync)
+    print(f"catching up 4 changes behind ({len(resync)} samples, JSON): full view {full / len(resync):.0f} B, "
+          f"changes only {delta / len(resync):.0f} B ({delta / full:.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=200, help="stop a game after this many turns")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
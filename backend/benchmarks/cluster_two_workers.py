@@ -0,0 +1,148 @@
+# backend/benchmarks/cluster_two_workers.py
+"""Play one game across two uvicorn workers that share a Redis store.
+
+The lobby is created on worker A. The second player connects to worker B, and
+every one of their events has to be forwarded to A. Checks that both players see
+each other's events and that the game ends cleanly when a player leaves. Without
+REDIS_URL, a fakeredis TCP server stands in for Redis.
+
+Run from the backend directory:  python -m benchmarks.cluster_two_workers
+(tests/test_cluster.py runs it as part of the test suite)
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import socketio
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_fake_redis() -> str:
+    from fakeredis import TcpFakeServer
+    port = free_port()
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"redis://127.0.0.1:{port}/0"
+
+
+def migrate(db_path: str):
+    # The app doesn't create tables itself; deploys run the migrations first
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], check=True, cwd=BACKEND_DIR,
+                   env=dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{db_path}"))
+
+
+def start_worker(node: str, port: int, redis_url: str, db_path: str) -> subprocess.Popen:
+    # RESUME_GRACE=0: a disconnect leaves the game at once, which is what the test checks
+    env = dict(os.environ, NODE_ID=node, REDIS_URL=redis_url, RESUME_GRACE="0",
+               DATABASE_URL=f"sqlite+aiosqlite:///{db_path}")
+    # From the backend directory, so app.main imports wherever this is run from (e.g. pytest at the repo root)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, cwd=BACKEND_DIR)
+
+
+def wait_ready(port: int, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"worker on port {port} did not start")
+
+
+class Player:
+    def __init__(self, name: str):
+        self.name = name
+        self.sio = socketio.AsyncClient()
+        self.events = []
+        self.my_turn = asyncio.Event()
+
+        @self.sio.on("*")
+        async def any_event(event, data=None):
+            # The server coalesces an action's events into one "batch" message
+            for name, _ in (data if event == "batch" else [(event, data)]):
+                self.events.append(name)
+                if name == "your_turn":
+                    self.my_turn.set()
+
+    def saw(self, event: str) -> bool:
+        return event in self.events
+
+
+async def play(port_a: int, port_b: int):
+    alice, bob = Player("Alice"), Player("Bob")
+    await alice.sio.connect(f"http://127.0.0.1:{port_a}", transports=["websocket"])
+    await bob.sio.connect(f"http://127.0.0.1:{port_b}", transports=["websocket"])
+
+    created = await alice.sio.call("create_game", {"name": "Alice"})
+    code = created["code"]
+    joined = await bob.sio.call("join_game", {"code": code, "name": "Bob"})
+    assert joined.get("code") == code, joined
+    await bob.sio.call("start_game", {"code": code})
+    await asyncio.sleep(0.5)
+    assert alice.saw("game_started") and bob.saw("game_started"), "game_started not seen by both players"
+
+    # A few turns of tile flips, whoever's turn it is
+    for _ in range(4):
+        player = await next_turn(alice, bob)
+        ack = await player.sio.call("flip_tile", {"code": code})
+        assert "letter" in ack, ack
+    await bob.sio.call("send_chat", {"code": code, "text": "hello from worker B"})
+    await asyncio.sleep(0.5)
+    assert alice.saw("chat_message") and bob.saw("chat_message"), "chat did not cross workers"
+    assert alice.events.count("tile_flipped") == bob.events.count("tile_flipped")
+
+    # Bob leaves from worker B: the owner (A) must end the game for Alice
+    await bob.sio.disconnect()
+    await asyncio.sleep(1.0)
+    assert alice.saw("player_left") and alice.saw("game_over"), alice.events
+    await alice.sio.disconnect()
+
+
+async def next_turn(*players: Player) -> Player:
+    done, _ = await asyncio.wait([asyncio.create_task(p.my_turn.wait()) for p in players],
+                                 timeout=5, return_when=asyncio.FIRST_COMPLETED)
+    for p in players:
+        if p.my_turn.is_set():
+            p.my_turn.clear()
+            return p
+    raise AssertionError("nobody got a turn")
+
+
+def main():
+    redis_url = os.environ.get("REDIS_URL") or start_fake_redis()
+    port_a, port_b = free_port(), free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "cluster.db")
+        migrate(db_path)
+        workers = [start_worker("worker-a", port_a, redis_url, db_path),
+                   start_worker("worker-b", port_b, redis_url, db_path)]
+        try:
+            wait_ready(port_a)
+            wait_ready(port_b)
+            t0 = time.perf_counter()
+            asyncio.run(play(port_a, port_b))
+            print(f"PASS: game played across two workers in {time.perf_counter() - t0:.1f} s")
+        finally:
+            for w in workers:
+                w.terminate()
+                w.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# backend/benchmarks/load_socketio.py
+"""Socket.IO load test: N simulated players against an in-process server.
+
+Starts app.main:app under uvicorn in this process (fresh SQLite database) and
+connects N python-socketio clients over websockets, grouped into games of
+--per-game players. Each game is created, joined and started, then players
+take turns: form a word from their hand if the dictionary allows one, else
+steal a word off the table (via find_steals), else flip a tile; every few
+turns they also chat. With --wire msgpack (standard layout) or --wire compact the
+clients speak msgpack instead of JSON (see app/wire.py). The clients share the server's event loop, so absolute
+numbers include client overhead; compare runs on the same machine.
+
+Reports ack latency p50/p95/p99 per event, events/s and peak RSS, and writes
+them as JSON. With --compare, exits 1 if any event's p95 regressed by more
+than --tolerance against a saved baseline.
+
+Run from the backend directory:
+    python -m benchmarks.load_socketio --clients 40 --save benchmarks/baselines/load_socketio.json
+    python -m benchmarks.load_socketio --compare benchmarks/baselines/load_socketio.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import socket
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db.name}"
+# Simulated players act far faster than people; rate limits (app/ratelimit.py) would turn them away
+for _limit in ("RATE_LIMIT_SID", "RATE_LIMIT_ROOM", "CONNECT_RATE_LIMIT"):
+    os.environ.setdefault(_limit, "")
+
+import socketio  # noqa: E402
+import uvicorn  # noqa: E402
+
+from app import anagram, letters, main as server, models  # noqa: E402
+from app.wire import CompactPacket  # noqa: E402
+
+EVENTS = ["create_game", "join_game", "start_game", "flip_tile", "form_word", "steal_word", "find_steals",
+          "send_chat"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(samples: List[float], p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000 if samples else 0.0
+
+
+class Client:
+    """One simulated player; records the ack latency of every event it sends."""
+    def __init__(self, name: str, latencies: Dict[str, List[float]], wire: str = "json"):
+        self.name = name
+        self.latencies = latencies
+        serializer = {"json": "default", "msgpack": "msgpack", "compact": CompactPacket}[wire]
+        self.sio = socketio.AsyncClient(serializer=serializer)
+        self.sid = None
+        self.hand = bytearray(26)
+        self.my_turn = asyncio.Event()
+        self.over = asyncio.Event()
+
+        @self.sio.on("*")
+        async def any_event(event, data=None):
+            # The server coalesces an action's events into one "batch" message
+            for name, payload in (data if event == "batch" else [(event, data)]):
+                self.on_event(name, payload)
+
+    def on_event(self, event: str, data):
+        if event == "tile_flipped" and data["sid"] == self.sid:
+            letters.add(self.hand, data["letter"])
+        elif event == "your_turn":
+            self.my_turn.set()
+        elif event == "game_over":
+            self.over.set()
+            self.my_turn.set()
+
+    async def call(self, event: str, data: dict):
+        t0 = time.perf_counter()
+        ack = await self.sio.call(event, data, timeout=30)
+        self.latencies[event].append(time.perf_counter() - t0)
+        return ack
+
+    async def take_turn(self, code: str, index: anagram.AnagramIndex):
+        words, _ = index.words_from(letters.expand(self.hand), min_len=3)
+        if words:
+            word = max(words, key=len).upper()
+            ack = await self.call("form_word", {"code": code, "word": word, "tiles": list(word)})
+            if "error" not in ack:
+                letters.consume(self.hand, letters.counts(word))
+                return
+        steals = (await self.call("find_steals", {"code": code})).get("steals", [])  # [] if rate-limited
+        if steals:
+            steal = steals[0]
+            new_word = steal["newWords"][0].upper()
+            ack = await self.call("steal_word", {"code": code, "targetPlayerId": steal["targetPlayerId"],
+                                                 "baseWordId": steal["baseWordId"], "newWord": new_word})
+            if "error" not in ack:
+                letters.consume(self.hand, letters.diff(letters.counts(new_word), letters.counts(steal["baseWord"])))
+                return
+        await self.call("flip_tile", {"code": code})
+
+
+async def play_game(url: str, players: List[Client], turns: int, chat_every: int, index):
+    for p in players:
+        await p.sio.connect(url, transports=["websocket"])
+        p.sid = p.sio.get_sid()
+    host, guests = players[0], players[1:]
+    code = (await host.call("create_game", {"name": host.name}))["code"]
+    for g in guests:
+        await g.call("join_game", {"code": code, "name": g.name})
+    await host.call("start_game", {"code": code})
+
+    async def seat(p: Client):
+        taken = 0
+        while taken < turns and not p.over.is_set():
+            await p.my_turn.wait()
+            p.my_turn.clear()
+            if p.over.is_set():
+                break
+            taken += 1
+            if chat_every and taken % chat_every == 0:
+                await p.call("send_chat", {"code": code, "text": f"gg {taken}"})
+            await p.take_turn(code, index)
+
+    # Everyone plays `turns` turns (or until the bag runs out and the game ends), then leaves
+    await asyncio.gather(*(seat(p) for p in players))
+    for p in players:
+        await p.sio.disconnect()
+
+
+async def run(args) -> dict:
+    async with models.engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    port = free_port()
+    config = uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning", lifespan="on")
+    uv = uvicorn.Server(config)
+    serve = asyncio.create_task(uv.serve())
+    while not uv.started or not server.warm_up.ready:  # sockets are refused until warm-up is done
+        await asyncio.sleep(0.05)
+    index = anagram.get_index()
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    clients = [Client(f"P{i}", latencies, args.wire) for i in range(args.clients)]
+    games = [clients[i:i + args.per_game] for i in range(0, len(clients), args.per_game)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(play_game(f"http://127.0.0.1:{port}", g, args.turns, args.chat_every, index)
+                           for g in games if len(g) >= 2))
+    elapsed = time.perf_counter() - t0
+
+    uv.should_exit = True
+    await serve
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "clients": args.clients, "per_game": args.per_game, "turns": args.turns, "wire": args.wire,
+        "python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count(),
+        "elapsed_s": round(elapsed, 3),
+        "events": total,
+        "events_per_s": round(total / elapsed, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "latency_ms": {
+            event: {"count": len(latencies[event]), "p50": round(percentile(latencies[event], .50), 3),
+                    "p95": round(percentile(latencies[event], .95), 3),
+                    "p99": round(percentile(latencies[event], .99), 3)}
+            for event in EVENTS if latencies[event]
+        },
+    }
+
+
+def report(result: dict):
+    print(f"{result['clients']} clients, {result['events']} events in {result['elapsed_s']:.1f} s: "
+          f"{result['events_per_s']:.0f} events/s, peak RSS {result['peak_rss_mb']:.0f} MB")
+    print(f"{'event':12s} {'count':>7s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    for event, s in result["latency_ms"].items():
+        print(f"{event:12s} {s['count']:7d} {s['p50']:8.2f} {s['p95']:8.2f} {s['p99']:8.2f}")
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> bool:
+    """Print p95 changes against the baseline; False if any event regressed beyond tolerance."""
+    ok = True
+    for event, s in result["latency_ms"].items():
+        base = baseline["latency_ms"].get(event)
+        if not base or not base["p95"]:
+            continue
+        change = s["p95"] / base["p95"] - 1
+        flag = "REGRESSION" if change > tolerance else ""
+        ok = ok and not flag
+        print(f"{event:12s} p95 {base['p95']:8.2f} -> {s['p95']:8.2f} ms ({change:+.0%}) {flag}")
+    eps = result["events_per_s"] / baseline["events_per_s"] - 1
+    print(f"events/s {baseline['events_per_s']:.0f} -> {result['events_per_s']:.0f} ({eps:+.0%})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Socket.IO load test against an in-process server")
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--per-game", type=int, default=2)
+    parser.add_argument("--turns", type=int, default=30, help="turns each player takes")
+    parser.add_argument("--wire", choices=["json", "msgpack", "compact"], default="json", help="packet encoding the clients use")
+    parser.add_argument("--chat-every", type=int, default=5, help="chat on every Nth turn (0: never)")
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 slowdown before failing")
+    args = parser.parse_args()
+    try:
+        result = asyncio.run(run(args))
+    finally:
+        os.unlink(_db.name)
+    report(result)
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            if not compare(result, json.load(f), args.tolerance):
+                raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# backend/export_matches.py
+"""Export match history (matches, players and words) as NDJSON or CSV.
+
+Streams from the database named by DATABASE_URL, so it runs in constant
+memory. Run from the backend directory, like alembic:
+
+    python export_matches.py --format csv --since 2026-01-01 --until 2026-02-01 -o january.csv
+    python export_matches.py --code ABCDE
+"""
+import argparse
+import asyncio
+import datetime
+import sys
+
+from app import export, models
+
+
+def parse_time(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value)
+
+
+async def run(args):
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        async for chunk in export.stream(args.format, since=args.since, until=args.until, code=args.code):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        await models.engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", choices=sorted(export.FORMATS), default="ndjson")
+    parser.add_argument("--since", type=parse_time, help="only matches that ended at or after this ISO time")
+    parser.add_argument("--until", type=parse_time, help="only matches that ended before this ISO time")
+    parser.add_argument("--code", help="only matches played in this lobby code")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
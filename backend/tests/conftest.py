@@ -0,0 +1,56 @@
+# backend/tests/conftest.py
+"""Shared fixtures. Tests run from the repo root (pytest -q backend/tests) or from backend/."""
+import asyncio
+import os
+import sys
+
+import pytest
+from sqlalchemy.pool import NullPool
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """app.main with fresh in-memory state and no network: emits are dropped, no socket is connected."""
+    from app import main
+    from app.actor import GameActors
+    from app.lobbies import OpenLobbies
+    from app.outbound import RoomDispatcher
+    from app.scheduler import TimerScheduler
+
+    async def emit(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(main.sio, "emit", emit)
+    monkeypatch.setattr(main.sio.manager, "is_connected", lambda *args, **kwargs: False)
+    monkeypatch.setattr(main, "outbound", RoomDispatcher(main.sio))
+    monkeypatch.setattr(main, "actors", GameActors())
+    monkeypatch.setattr(main, "turn_timers", TimerScheduler())
+    monkeypatch.setattr(main, "open_lobbies", OpenLobbies(main.MAX_PLAYERS))
+    yield main
+    main.games.clear()
+    main.sessions.clear()
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A fresh SQLite database with every table, standing in for models.engine and models.SessionLocal."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from app import models
+
+    # NullPool: each test scenario runs in its own event loop, so connections must not outlive it
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+
+    asyncio.run(create())
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    monkeypatch.setattr(models, "engine", engine)
+    monkeypatch.setattr(models, "SessionLocal", sessions)
+    yield sessions
+    asyncio.run(engine.dispose())
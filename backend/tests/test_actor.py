@@ -0,0 +1,82 @@
+# backend/tests/test_actor.py
+import asyncio
+
+import pytest
+
+from app.actor import GameActors
+
+
+def test_concurrent_commands_on_one_game_do_not_interleave():
+    async def scenario():
+        actors, game, order = GameActors(), {"score": 0}, []
+
+        async def add(n):
+            score = game["score"]
+            await asyncio.sleep(0)  # a handler awaiting mid-update (a DB call, an emit)
+            game["score"] = score + n
+            order.append(n)
+            return game["score"]
+
+        results = await asyncio.gather(*(actors.submit("AAAAA", add, n) for n in range(1, 51)))
+        return game["score"], order, results, actors.stats()
+
+    score, order, results, stats = asyncio.run(scenario())
+    assert score == sum(range(1, 51)) and order == list(range(1, 51))
+    assert results[-1] == score and stats["processed"] == 50 and stats["queued"] == 0
+
+
+def test_games_run_independently():
+    async def scenario():
+        actors, started = GameActors(), []
+        release = asyncio.Event()
+
+        async def wait(code):
+            started.append(code)
+            await release.wait()
+
+        slow = actors.submit("AAAAA", wait, "AAAAA")
+        queued = actors.submit("AAAAA", wait, "AAAAA-2")
+        other = actors.submit("BBBBB", wait, "BBBBB")
+        await asyncio.sleep(0.01)
+        seen = list(started)  # BBBBB isn't held up behind AAAAA's first command
+        release.set()
+        await asyncio.gather(slow, queued, other)
+        return seen
+
+    assert asyncio.run(scenario()) == ["AAAAA", "BBBBB"]
+
+
+def test_errors_reach_their_caller_and_later_commands_still_run():
+    async def scenario():
+        actors = GameActors()
+
+        async def fail():
+            raise ValueError("bad move")
+
+        async def ok():
+            return "ok"
+
+        failed, after = actors.submit("AAAAA", fail), actors.submit("AAAAA", ok)
+        with pytest.raises(ValueError):
+            await failed
+        return await after
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_commands_whose_caller_gave_up_are_skipped():
+    async def scenario():
+        actors, ran = GameActors(), []
+
+        async def record(n):
+            ran.append(n)
+
+        first = actors.submit("AAAAA", record, 1)
+        actors.submit("AAAAA", record, 2).cancel()
+        await actors.submit("AAAAA", record, 3)
+        await first
+        actors.discard("AAAAA")
+        return ran, actors.stats()
+
+    ran, stats = asyncio.run(scenario())
+    assert ran == [1, 3] and (stats["actors"], stats["processed"]) == (0, 2)  # totals outlive the actor
@@ -0,0 +1,37 @@
+# backend/tests/test_cache.py
+import time
+
+from app import metrics
+from app.cache import TTLCache
+
+
+def sample(name: str) -> float:
+    line = next((l for l in metrics.render().splitlines() if l.startswith(name + " ")), None)
+    return float(line.split()[1]) if line else 0.0
+
+
+def test_lru_eviction_and_expiry():
+    cache = TTLCache(2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # b is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("c") == 3
+    cache.set("d", 4, expires_at=time.monotonic() - 1)
+    assert cache.get("d") is None and "d" not in cache._data
+    assert cache.stats() == {"size": 1, "hits": 2, "misses": 2, "evictions": 2}  # d pushed out a, then expired
+
+
+def test_named_caches_report_to_metrics():
+    hits = 'bamandagrams_cache_lookups_total{cache="test",result="hit"}'
+    misses = 'bamandagrams_cache_lookups_total{cache="test",result="miss"}'
+    evictions = 'bamandagrams_cache_evictions_total{cache="test"}'
+    before = [sample(hits), sample(misses), sample(evictions)]
+    cache = TTLCache(1, 60, "test")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.set("b", 2)
+    cache.get("a")
+    assert [sample(hits), sample(misses), sample(evictions)] == [before[0] + 1, before[1] + 1, before[2] + 1]
+    TTLCache(1, 60).get("a")  # unnamed: counted in stats() only
+    assert sample(misses) == before[1] + 1
@@ -0,0 +1,107 @@
+# backend/tests/test_cluster.py
+"""Lobby ownership in the Redis backend, seats held across workers, and a game played across two worker processes."""
+import asyncio
+
+import fakeredis
+
+from app import cluster
+from benchmarks import cluster_two_workers
+
+
+def test_claims_are_exclusive_and_only_the_owner_releases():
+    async def scenario():
+        redis = fakeredis.aioredis.FakeRedis()
+        backend = cluster.RedisBackend(redis, prefix="test")
+        assert await backend.claim("ABCDE")
+        assert not await backend.claim("ABCDE")
+        assert await backend.owner("ABCDE") == cluster.NODE_ID
+        await backend.release("ABCDE")
+        assert await backend.owner("ABCDE") is None
+        assert await backend.claim("ABCDE")  # a released code can be claimed again
+        # Another worker holds this code: this one can neither claim nor release it
+        await redis.set(backend._key("FGHIJ"), "other-node")
+        assert not await backend.claim("FGHIJ")
+        await backend.release("FGHIJ")
+        assert await backend.owner("FGHIJ") == "other-node"
+    asyncio.run(scenario())
+
+
+def test_events_are_forwarded_to_the_owning_worker():
+    async def scenario():
+        backend = cluster.RedisBackend(fakeredis.aioredis.FakeRedis(), prefix="test")
+        seen = []
+
+        async def dispatch(event, sid, data):
+            seen.append((event, sid, data))
+            return {"ok": data["code"]}
+
+        await backend.start(dispatch)
+        try:
+            result = await backend.call(cluster.NODE_ID, "handle_sync", "sid1", {"code": "ABCDE"})
+        finally:
+            await backend.stop()
+        return result, seen
+    result, seen = asyncio.run(scenario())
+    assert result == {"ok": "ABCDE"} and seen == [("handle_sync", "sid1", {"code": "ABCDE"})]
+
+
+def test_game_across_two_workers():
+    # Two uvicorn processes sharing a fakeredis server: lobby on A, second player on B (see the script)
+    cluster_two_workers.main()
+
+
+class OtherWorker:
+    """cluster.backend stand-in: lobbies in `remote` belong to "node-b", which answers calls from `answers`."""
+    def __init__(self, remote, answers):
+        self.remote, self.answers, self.calls = remote, answers, []
+
+    async def owner(self, code):
+        return "node-b" if code in self.remote else cluster.NODE_ID
+
+    async def claim(self, code):
+        return code not in self.remote
+
+    async def release(self, code):
+        pass
+
+    async def call(self, node, event, sid, data):
+        self.calls.append((event, sid, data))
+        return self.answers[event]
+
+
+def test_a_socket_seated_on_another_worker_cannot_take_a_second_seat(server, monkeypatch):
+    backend = OtherWorker({"XXXXX"}, {"is_seated": True})
+    monkeypatch.setattr(cluster, "backend", backend)
+    monkeypatch.setattr(server, "remote_sessions", {"s1": "XXXXX"})
+
+    async def scenario():
+        refused = [await server.handle_create_game("s1", {"name": "Ann"}),
+                   await server.handle_quick_match("s1", {"name": "Ann"})]
+        backend.answers["is_seated"] = False  # that game has ended on node-b
+        created = await server.handle_create_game("s1", {"name": "Ann"})
+        await server.outbound.flush()
+        return refused, created
+
+    refused, created = asyncio.run(scenario())
+    assert [r.get("error") for r in refused] == ["Already in a game"] * 2
+    assert "code" in created and "s1" not in server.remote_sessions
+    assert backend.calls[0] == ("is_seated", "s1", {"code": "XXXXX"})
+
+
+def test_forwarded_joins_carry_a_seat_held_on_this_worker(server, monkeypatch):
+    backend = OtherWorker({"YYYYY"}, {"handle_join_game": {"error": "Already in a game"}})
+    monkeypatch.setattr(cluster, "backend", backend)
+
+    async def scenario():
+        await server.handle_create_game("s1", {"name": "Ann"})
+        ack = await server.handle_join_game("s1", {"code": "YYYYY", "name": "Ann", "seated": False})
+        # On the owner, the forwarded flag stands in for the sessions it can't see
+        owner_ack = await server._routed_handlers["handle_join_game"](
+            "s2", {"code": next(iter(server.games)), "name": "Bo", "seated": True})
+        await server.outbound.flush()
+        return ack, owner_ack
+
+    ack, owner_ack = asyncio.run(scenario())
+    [(event, sid, data)] = backend.calls
+    assert event == "handle_join_game" and data["seated"] is True  # the client's own "seated" is ignored
+    assert ack["error"] == owner_ack["error"] == "Already in a game"
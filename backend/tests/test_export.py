@@ -0,0 +1,64 @@
+# backend/tests/test_export.py
+import asyncio
+import csv
+import datetime
+import io
+import json
+
+from app import crud, export, models
+
+ENDED = datetime.datetime(2026, 3, 1, tzinfo=datetime.timezone.utc)
+
+
+def player(user_id, name, *words):
+    return {"name": name, "user_id": user_id, "score": sum(len(w) ** 2 for w in words),
+            "words": [{"word": w, "points": len(w) ** 2, "was_stolen": False} for w in words]}
+
+
+async def seed(database):
+    async with database() as session:
+        session.add_all(models.User(id=i, username=f"u{i}", password_hash="x") for i in (1, 2, 3))
+        await session.commit()
+        await crud.save_match_results(session, [
+            {"code": "AAAAA", "ended_at": ENDED, "players": [player(1, "Ann", "CAT", "DOGS"), player(2, "Bo")]},
+            {"code": "BBBBB", "ended_at": ENDED + datetime.timedelta(days=1),
+             "players": [player(2, "Bo", "QI"), player(3, "Cy", "ZEBRA")]},
+            {"code": "CCCCC", "ended_at": ENDED, "players": [player(None, "Guest", "AXE")]},
+        ])
+
+
+def download(server, user_id, **query):
+    async def scenario():
+        response = await server.export_matches(**dict({"format": "ndjson", "since": None, "until": None,
+                                                        "code": None}, **query),
+                                               current_user=models.User(id=user_id))
+        return response.media_type, "".join([chunk async for chunk in response.body_iterator])
+    return asyncio.run(scenario())
+
+
+def test_ndjson_export_has_only_the_callers_matches(server, database):
+    asyncio.run(seed(database))
+    media_type, body = download(server, 1)
+    assert media_type == "application/x-ndjson"
+    [match] = [json.loads(line) for line in body.splitlines()]
+    assert match["code"] == "AAAAA" and match["ended_at"].startswith("2026-03-01")
+    assert [(p["name"], [w["word"] for w in p["words"]]) for p in match["players"]] == [
+        ("Ann", ["CAT", "DOGS"]), ("Bo", [])]  # every player of the caller's match is included
+
+
+def test_csv_export_filters_by_time_and_code(server, database):
+    asyncio.run(seed(database))
+    media_type, body = download(server, 2, format="csv", since=ENDED + datetime.timedelta(hours=1))
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert media_type == "text/csv" and list(rows[0]) == export.CSV_COLUMNS
+    assert [(r["code"], r["name"], r["word"]) for r in rows] == [("BBBBB", "Bo", "QI"), ("BBBBB", "Cy", "ZEBRA")]
+    _, body = download(server, 3, format="csv", code="aaaaa")
+    assert body.splitlines() == [",".join(export.CSV_COLUMNS)]  # user 3 didn't play in AAAAA
+
+
+def test_operator_export_has_every_match(database):
+    async def scenario():
+        await seed(database)
+        return [json.loads(line)["code"] for chunk in [c async for c in export.stream("ndjson")]
+                for line in chunk.splitlines()]
+    assert asyncio.run(scenario()) == ["AAAAA", "BBBBB", "CCCCC"]
@@ -0,0 +1,123 @@
+# backend/tests/test_journal.py
+"""Journal: snapshot + log replay rebuilds the same games, and bad data doesn't stop a restart."""
+import asyncio
+import os
+
+from app import journal
+from app.journal import GameJournal, encode_game
+from app.state import GameState, PlayerState
+
+
+def game_with(code, *names):
+    game = GameState(code)
+    for i, name in enumerate(names):
+        sid = f"{code}-{i}"
+        game.players[sid] = PlayerState(sid, name)
+        game.turn_order.append(sid)
+    return game
+
+
+def restore(directory):
+    async def scenario():
+        games = {}
+        fresh = GameJournal(directory, snapshot_interval=float("inf"))
+        await fresh.open(games)
+        await fresh.close()
+        return games
+    return asyncio.run(scenario())
+
+
+def test_long_multibyte_names_are_cut_on_a_character_boundary(tmp_path):
+    async def scenario():
+        games = {}
+        j = GameJournal(str(tmp_path), snapshot_interval=float("inf"))
+        await j.open(games)
+        game = games["UTFEE"] = game_with("UTFEE", "é" * 200)
+        j.created(game)
+        j.joined(game.code, game.players["UTFEE-0"])
+        await j.close()
+    asyncio.run(scenario())
+    name = restore(str(tmp_path))["UTFEE"].players["UTFEE-0"].name
+    assert name == "é" * 127
+
+
+def test_unreadable_game_in_a_snapshot_is_skipped(tmp_path, monkeypatch):
+    good = game_with("GOODS", "Ann", "Bo")
+    # A snapshot written before names were cut on character boundaries
+    monkeypatch.setattr(journal, "_s", lambda v: bytes((min(len(v.encode()), 255),)) + v.encode()[:255])
+    bad = encode_game(game_with("BADDY", "é" * 200))
+    monkeypatch.undo()
+    with open(os.path.join(tmp_path, "snapshot-00000001.bin"), "wb") as f:
+        f.write(journal.SNAPSHOT_MAGIC + bad + encode_game(good))
+    restored = restore(str(tmp_path))
+    assert list(restored) == ["GOODS"]
+    assert encode_game(restored["GOODS"]) == encode_game(good)
+
+
+class RiggedShuffle:
+    """Stands in for SystemRandom: puts `draws` at the end of the bag, so they're drawn in that order."""
+    draws = "CSEAXETQE"
+
+    def shuffle(self, bag):
+        rest = bytearray(bag)
+        for letter in self.draws:
+            rest.remove(ord(letter))
+        bag[:] = rest + self.draws[::-1].encode()
+
+
+def test_restart_restores_games_played_through_the_handlers(server, tmp_path, monkeypatch):
+    from app import state
+    monkeypatch.setattr(state.secrets, "SystemRandom", RiggedShuffle)
+    handlers = server._routed_handlers
+
+    async def scenario():
+        live = GameJournal(str(tmp_path), snapshot_interval=float("inf"))
+        monkeypatch.setattr(server, "journal", live)
+        await live.open(server.games)
+        code = (await server.handle_create_game("alice", {"name": "Alice"}))["code"]
+        for sid in ("bob", "carol"):
+            await handlers["handle_join_game"](sid, {"code": code, "name": sid.title()})
+        await live.snapshot()  # the lobby comes from the snapshot, every move after it from the log tail
+        await handlers["handle_start_game"]("alice", {"code": code})  # deals C, S, E
+        for sid in ("alice", "bob", "carol", "alice", "bob", "carol"):  # A X E T Q E
+            assert "letter" in await handlers["handle_flip_tile"](sid, {"code": code})
+        formed = await handlers["handle_form_word"]("alice", {"code": code, "word": "CAT", "tiles": list("CAT")})
+        stolen = await handlers["handle_steal_word"]("bob", {
+            "code": code, "targetPlayerId": "alice", "baseWordId": formed["word_id"], "newWord": "CATS"})
+        assert stolen["new_word"] == "CATS"
+        await server.remove_player("carol", None)
+        token = server.games[code].players["alice"].token
+        await handlers["handle_resume_game"]("alice2", {"code": code, "token": token})
+        await live.flush()
+        live._task.cancel()  # "crash": no final snapshot
+        live._file.close()
+        await server.outbound.flush()
+        await server.turn_timers.stop()
+        return code
+
+    code = asyncio.run(scenario())
+    game = server.games[code]
+    restored = restore(str(tmp_path))[code]
+    assert restored.version == game.version > 0
+    assert encode_game(restored) == encode_game(game)
+
+
+def test_disabled_journal_does_not_encode_records():
+    disabled = GameJournal(None)
+    disabled.joined("ABCDE", PlayerState("sid", None))  # would raise if the name were encoded
+    assert disabled.records == 0
+
+
+def test_bad_names_are_refused_before_any_state_changes(server):
+    async def scenario():
+        for bad in (None, 42, "", "   ", "x" * (server.MAX_NAME_LENGTH + 1)):
+            assert "error" in await server.handle_create_game("alice", {"name": bad})
+            assert "error" in await server.handle_quick_match("alice", {"name": bad})
+        assert not server.games and not server.sessions
+        created = await server.handle_create_game("alice", {"name": "  Ann  "})
+        refused = await server._routed_handlers["handle_join_game"]("bob", {"code": created["code"], "name": None})
+        await server.outbound.flush()
+        return created, refused
+    created, refused = asyncio.run(scenario())
+    assert created["player"]["name"] == "Ann" and "error" in refused
+    assert list(server.sessions) == ["alice"]
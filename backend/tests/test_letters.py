@@ -0,0 +1,82 @@
+# backend/tests/test_letters.py
+import asyncio
+
+import pytest
+
+from app import letters, ratelimit
+
+
+def test_counts_and_expand_round_trip():
+    vec = letters.counts("BANANAS")
+    assert vec[0] == 3 and vec[ord("N") - 65] == 2 and sum(vec) == 7
+    assert letters.expand(vec) == sorted("BANANAS")
+    assert letters.counts(["C", "A", "T"]) == letters.counts("TAC")
+    assert letters.counts("") == bytearray(26)
+
+
+@pytest.mark.parametrize("bad", ["cat", "CA T", "ÉTÉ", ["CA", "T"], ["C", 1], [None], 42, None, "A" * 256])
+def test_counts_rejects_what_is_not_a_letter_multiset(bad):
+    assert letters.counts(bad) is None
+
+
+def test_counts_takes_up_to_255_of_a_letter():
+    assert letters.counts("E" * 255)[4] == 255
+
+
+def test_has_consume_and_diff():
+    hand = letters.counts("SATIRE")
+    need = letters.counts("STAR")
+    assert letters.has(hand, need) and not letters.has(hand, letters.counts("STARS"))
+    letters.consume(hand, need)
+    assert letters.expand(hand) == ["E", "I"]
+    assert letters.expand(letters.diff(letters.counts("CATS"), letters.counts("CAT"))) == ["S"]
+    assert letters.diff(letters.counts("CAT"), letters.counts("CATS")) is None
+
+
+def test_add_rejects_bad_tiles_with_a_clear_error():
+    hand = bytearray(26)
+    letters.add(hand, "Q")
+    assert letters.expand(hand) == ["Q"]
+    for bad in ("q", "QU", 7, None):
+        with pytest.raises(ValueError, match="Not a tile letter"):
+            letters.add(hand, bad)
+    hand[0] = 255
+    with pytest.raises(ValueError, match="full"):
+        letters.add(hand, "A")
+
+
+def started_game(server):
+    async def setup():
+        code = (await server.handle_create_game("alice", {"name": "Alice"}))["code"]
+        await server.handle_join_game("bob", {"code": code, "name": "Bob"})
+        await server.handle_start_game("alice", {"code": code})
+        return code
+    return asyncio.run(setup())
+
+
+@pytest.mark.parametrize("event, payload", [
+    ("form_word", {"word": 5, "tiles": ["C"]}),
+    ("form_word", {"word": None, "tiles": []}),
+    ("form_word", {"word": "CAT", "tiles": "CAT"}),
+    ("form_word", {"word": "CAT", "tiles": {"C": 1}}),
+    ("form_word", {"word": ["C", "A", "T"], "tiles": ["C", "A", "T"]}),
+    ("steal_word", {"targetPlayerId": "bob", "baseWordId": 1, "newWord": 5}),
+    ("steal_word", {"targetPlayerId": "bob", "baseWordId": 1, "newWord": ["CATS"]}),
+    ("steal_word", {"targetPlayerId": ["bob"], "baseWordId": 1, "newWord": "CATS"}),
+])
+def test_moves_with_malformed_words_get_an_error_ack(server, monkeypatch, event, payload):
+    monkeypatch.setattr(server, "event_limits", ratelimit.EventLimits({}, {}))
+    code = started_game(server)
+    game = server.games[code]
+    sid = game.turn_order.current
+    hand = bytes(game.players[sid].hand)
+
+    async def move():
+        ack = await server.sio.handlers["/"][event](sid, dict(payload, code=code))
+        await server.outbound.flush()
+        await server.turn_timers.stop()
+        return ack
+
+    ack = asyncio.run(move())
+    assert ack["error"].startswith("Invalid")
+    assert bytes(game.players[sid].hand) == hand and game.turn_order.current == sid
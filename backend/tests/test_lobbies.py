@@ -0,0 +1,110 @@
+# backend/tests/test_lobbies.py
+"""Lobby-code pool and the open-lobby index behind quick_match."""
+import asyncio
+import random
+
+from app import lobbies
+from app.state import GameState, PlayerState
+
+
+def test_code_pool_never_repeats():
+    pool = lobbies.LobbyCodes(key=12345)
+    codes = [pool.code_at(i) for i in range(200_000)]
+    assert len(set(codes)) == len(codes)
+    assert all(len(c) == lobbies.CODE_LENGTH and c.isalpha() and c.isupper() for c in codes)
+    assert lobbies.LobbyCodes(key=12345).code_at(7) == codes[7]
+    assert [lobbies.LobbyCodes(key=1).code_at(i) for i in range(5)] != codes[:5]
+
+
+def test_allocate_skips_codes_in_use():
+    pool = lobbies.LobbyCodes(key=99)
+    taken = {pool.code_at(0), pool.code_at(1)}
+    assert pool.allocate(taken.__contains__) == pool.code_at(2)
+    assert pool.stats() == {"issued": 1, "skipped": 2}
+
+
+def lobby(code, n):
+    game = GameState(code)
+    for i in range(n):
+        game.players[f"{code}-{i}"] = PlayerState(f"{code}-{i}", "P")
+    return game
+
+
+def listed(index):
+    return {code: n for n, bucket in enumerate(index.buckets) for code in bucket}
+
+
+def test_take_prefers_the_fullest_lobby_and_counts_promised_seats():
+    index = lobbies.OpenLobbies(5)
+    for code, n in (("AAAAA", 1), ("BBBBB", 3), ("CCCCC", 3)):
+        index.add(lobby(code, n))
+    index.add(lobby("PRIVA", 0))  # nobody seated yet: not offered
+    assert index.take() == "BBBBB" and index.take() == "BBBBB"  # 3 seated + 2 promised: full
+    assert index.take() == "CCCCC"
+    assert listed(index) == {"AAAAA": 1, "CCCCC": 4}
+    index.release("BBBBB")  # a join that failed frees its promised seat
+    assert listed(index)["BBBBB"] == 4
+
+
+def test_equally_full_lobbies_are_taken_longest_waiting_first():
+    index = lobbies.OpenLobbies(3)
+    games = [lobby(code, 1) for code in ("OLDER", "NEWER")]
+    for game in games:
+        index.add(game)
+    assert index.take() == "OLDER"  # now 2 of 3, the fullest
+    games[0].started = True  # ...until it starts without the promised player
+    index.update(games[0])
+    index.release("OLDER")
+    assert index.take() == "NEWER" and index.take() == "NEWER" and index.take() is None
+
+
+def test_index_matches_a_scan_under_churn():
+    rng = random.Random(5)
+    index = lobbies.OpenLobbies(5)
+    games, promised = {}, []
+    for step in range(5000):
+        op = rng.random()
+        if op < 0.3 or not games:
+            game = lobby(f"G{step:04d}", 1)
+            games[game.code] = game
+            index.add(game)
+        elif op < 0.5:
+            code = index.take()
+            if code:
+                promised.append(code)
+        elif op < 0.65 and promised:
+            code = promised.pop(rng.randrange(len(promised)))
+            game = games.get(code)
+            if game and game.game_active and not game.started and len(game.players) < 5:
+                game.players[f"j{step}"] = PlayerState(f"j{step}", "P")
+                index.update(game)
+            index.release(code)
+        elif op < 0.8:
+            game = rng.choice(list(games.values()))
+            if game.players:
+                game.players.pop(next(iter(game.players)))
+            index.update(game)
+        elif op < 0.9:
+            game = rng.choice(list(games.values()))
+            game.started = True
+            index.update(game)
+        else:
+            code = rng.choice(list(games))
+            games.pop(code).game_active = False
+            index.remove(code)
+    for code in promised:
+        index.release(code)
+    expected = {code: len(g.players) for code, g in games.items()
+                if g.game_active and not g.started and 0 < len(g.players) < 5}
+    assert listed(index) == expected and len(index) == len(expected)
+
+
+def test_queued_quick_matches_fill_lobbies_in_turn(server):
+    async def scenario():
+        return await asyncio.gather(*(server.handle_quick_match(f"p{i}", {"name": f"P{i}"}) for i in range(23)))
+    results = asyncio.run(scenario())
+    assert not [r for r in results if "error" in r]
+    sizes = sorted(len(g.players) for g in server.games.values())
+    assert sizes == [3, 5, 5, 5, 5]
+    assert listed(server.open_lobbies) == {code: 3 for code, g in server.games.items() if len(g.players) == 3}
+    assert asyncio.run(server.handle_quick_match("p0", {"name": "P0"})) == {"error": "Already in a game"}
@@ -0,0 +1,62 @@
+# backend/tests/test_logs.py
+import io
+import json
+import logging
+from collections import deque
+
+import pytest
+
+from app import logs
+
+
+@pytest.fixture
+def records(monkeypatch):
+    """Capture the app logger's records in a queue of 3, as setup() would (without the writer thread)."""
+    queue = deque()
+    monkeypatch.setattr(logs.logger, "handlers", [logs._NonBlockingQueueHandler(queue, 3)])
+    level = logs.logger.level
+    logs.logger.setLevel(logging.INFO)  # setLevel, not the attribute: isEnabledFor() caches its answers
+    yield queue
+    logs.logger.setLevel(level)
+
+
+def written(queue, formatter=None) -> str:
+    stream = io.StringIO()
+    logs._Writer(queue, formatter or logs.JsonFormatter(), stream).flush()
+    return stream.getvalue()
+
+
+def test_records_are_json_lines_with_their_fields(records):
+    logs.event("word_placed", code="QZRTW", sid="abc", points=9)
+    try:
+        1 / 0
+    except ZeroDivisionError as e:
+        logs.event("handler_failed", logging.ERROR, exc_info=e, code="QZRTW")
+    logs.event("debug_detail", logging.DEBUG)  # below LOG_LEVEL: never queued
+
+    placed, failed = [json.loads(line) for line in written(records).splitlines()]
+    assert set(placed) == {"ts", "level", "event", "code", "sid", "points"}
+    assert (placed["level"], placed["event"], placed["code"], placed["points"]) == ("INFO", "word_placed", "QZRTW", 9)
+    assert (failed["level"], failed["event"]) == ("ERROR", "handler_failed")
+    assert failed["exc"].startswith("Traceback") and "ZeroDivisionError" in failed["exc"]
+    assert not records
+
+
+def test_full_queue_drops_records_instead_of_blocking(records):
+    for i in range(5):
+        logs.event("letter_drawn", n=i)
+    assert [json.loads(line)["n"] for line in written(records).splitlines()] == [0, 1, 2]
+
+
+def test_rate_limited_events_keep_warnings(records, monkeypatch):
+    monkeypatch.setitem(logs._limits, "chat_test", logs._RateLimit(2))
+    for _ in range(4):
+        logs.event("chat_test")
+    logs.event("chat_test", logging.WARNING)  # warnings and errors are never limited
+    levels = [json.loads(line)["level"] for line in written(records).splitlines()]
+    assert levels == ["INFO", "INFO", "WARNING"]
+
+
+def test_text_format_for_local_development(records):
+    logs.event("player_joined", code="QZRTW", player="Ann")
+    assert written(records, logs.TextFormatter()).split(" ", 1)[1] == "INFO  player_joined code=QZRTW player=Ann\n"
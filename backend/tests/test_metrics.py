@@ -0,0 +1,42 @@
+# backend/tests/test_metrics.py
+import asyncio
+
+from app import metrics
+from app.scheduler import TimerScheduler
+
+
+def sample(name: str) -> float:
+    """The value of one rendered sample line (0 when it hasn't been recorded yet)."""
+    lines = [line for line in metrics.render().splitlines() if line.startswith(name + " ")]
+    return float(lines[0].split()[1]) if lines else 0.0
+
+
+def test_handler_latency_and_errors_are_recorded_per_event():
+    async def ok(sid, data):
+        return {"ok": True}
+
+    async def refused(sid, data):
+        return {"error": "Not your turn"}
+
+    async def scenario():
+        await metrics.timed_handler("test_ok", ok)("sid", {})
+        await metrics.timed_handler("test_refused", refused)("sid", {})
+        await metrics.timed_handler("test_refused", refused)("sid", {})
+
+    asyncio.run(scenario())
+    assert sample('socketio_event_duration_seconds_count{event="test_ok"}') == 1
+    assert sample('socketio_event_errors_total{event="test_ok"}') == 0
+    assert sample('socketio_event_errors_total{event="test_refused"}') == 2
+
+
+def test_fired_timers_are_counted():
+    async def scenario():
+        timers = TimerScheduler()
+        timers.schedule("a", 0.01, int)
+        timers.schedule("b", 0.01, int)
+        await asyncio.sleep(0.03)
+        await timers.stop()
+
+    before = sample("bamandagrams_timers_fired_total")
+    asyncio.run(scenario())
+    assert sample("bamandagrams_timers_fired_total") == before + 2
@@ -0,0 +1,86 @@
+# backend/tests/test_outbound.py
+import asyncio
+from types import SimpleNamespace
+
+from app.outbound import RoomDispatcher
+
+
+class FakeServer:
+    """Records emits; `backlogs` maps a connected sid to its engine.io send-queue size."""
+    def __init__(self, backlogs=None):
+        self.emitted, self.disconnected = [], []
+        backlogs = backlogs or {}
+        self.manager = SimpleNamespace(rooms={"/": {}} if backlogs else {},
+                                       get_participants=lambda namespace, room: [(sid, sid) for sid in backlogs])
+        self.eio = SimpleNamespace(sockets={sid: SimpleNamespace(queue=SimpleNamespace(qsize=lambda n=n: n))
+                                            for sid, n in backlogs.items()})
+
+    async def emit(self, event, data, room=None, skip_sid=None):
+        await asyncio.sleep(0)  # a real emit yields to the loop
+        self.emitted.append((room, event, data, skip_sid))
+
+    async def disconnect(self, sid):
+        self.disconnected.append(sid)
+
+
+def test_an_actions_events_go_out_together_in_order():
+    async def scenario():
+        sio = FakeServer()
+        outbound = RoomDispatcher(sio)
+        outbound.emit("AAAAA", "word_placed", {"v": 1})
+        outbound.emit("AAAAA", "your_turn", {}, to="bob")
+        outbound.emit("AAAAA", "tile_flipped", {"v": 2})
+        outbound.emit("AAAAA", "word_stolen", {"v": 3})
+        outbound.emit("BBBBB", "chat_message", {"text": "hi"})
+        await outbound.flush()
+        return sio.emitted, outbound.stats()
+
+    emitted, stats = asyncio.run(scenario())
+    assert [e for e in emitted if e[0] != "room/BBBBB"] == [
+        ("room/AAAAA", "word_placed", {"v": 1}, None),
+        ("bob", "your_turn", {}, None),
+        ("room/AAAAA", "batch", [["tile_flipped", {"v": 2}], ["word_stolen", {"v": 3}]], None)]
+    assert ("room/BBBBB", "chat_message", {"text": "hi"}, None) in emitted
+    assert (stats["sent_events"], stats["sent_messages"], stats["queued"]) == (5, 4, 0)
+
+
+def test_events_queued_while_sending_follow_in_the_next_message():
+    async def scenario():
+        sio = FakeServer()
+        outbound = RoomDispatcher(sio)
+        outbound.emit("AAAAA", "player_joined", {"v": 1})
+        await asyncio.sleep(0)  # the sender has taken v1 and is mid-emit
+        outbound.emit("AAAAA", "player_joined", {"v": 2})
+        outbound.emit("AAAAA", "game_started", {"v": 3})
+        await outbound.flush()
+        return [(event, data) for _, event, data, _ in sio.emitted]
+
+    assert asyncio.run(scenario()) == [
+        ("player_joined", {"v": 1}),
+        ("batch", [["player_joined", {"v": 2}], ["game_started", {"v": 3}]])]
+
+
+def test_a_full_queue_drops_its_oldest_events():
+    async def scenario():
+        sio = FakeServer()
+        outbound = RoomDispatcher(sio, max_depth=3)
+        for v in range(1, 6):
+            outbound.emit("AAAAA", "tile_flipped", {"v": v})
+        await outbound.flush()
+        return sio.emitted, outbound.stats()["dropped_events"]
+
+    [(_, event, data, _)], dropped = asyncio.run(scenario())
+    assert event == "batch" and [d["v"] for _, d in data] == [3, 4, 5] and dropped == 2
+
+
+def test_slow_clients_are_skipped_or_disconnected():
+    async def scenario(policy):
+        sio = FakeServer({"fast": 0, "slow": 100})
+        outbound = RoomDispatcher(sio, client_backlog=64, slow_policy=policy)
+        outbound.emit("AAAAA", "word_placed", {"v": 1})
+        await outbound.flush()
+        await asyncio.sleep(0)
+        return sio.emitted[0][3], sio.disconnected
+
+    assert asyncio.run(scenario("drop")) == (["slow"], [])
+    assert asyncio.run(scenario("disconnect")) == (["slow"], ["slow"])
@@ -0,0 +1,63 @@
+# backend/tests/test_passwords.py
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+
+from app import passwords
+from app.passwords import PasswordPool, PasswordPoolBusy
+
+
+class BlockingContext:
+    """Stands in for pwd_context: each hash blocks its worker thread until `release` is set."""
+    def __init__(self):
+        self.release = threading.Event()
+        self.running = 0
+        self.most_running = 0
+        self._lock = threading.Lock()
+
+    def hash(self, password):
+        with self._lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        self.release.wait(5)
+        with self._lock:
+            self.running -= 1
+        return "hashed:" + password
+
+
+def test_pool_bounds_running_and_waiting_hashes(monkeypatch):
+    context = BlockingContext()
+    monkeypatch.setattr(passwords, "pwd_context", context)
+
+    async def scenario():
+        pool = PasswordPool(workers=2, max_pending=3)
+        accepted = [asyncio.ensure_future(pool.hash(f"pw{i}")) for i in range(5)]
+        await asyncio.sleep(0.05)  # 2 running, 3 waiting for a worker
+        with pytest.raises(PasswordPoolBusy):
+            await pool.hash("one too many")
+        busy = pool.stats()
+        context.release.set()
+        hashes = await asyncio.gather(*accepted)
+        pool.shutdown()
+        return busy, hashes, pool.stats()
+
+    busy, hashes, stats = asyncio.run(scenario())
+    assert (busy["waiting"], busy["rejected"]) == (3, 1)
+    assert hashes == [f"hashed:pw{i}" for i in range(5)] and context.most_running == 2
+    assert (stats["completed"], stats["waiting"]) == (5, 0)
+
+
+def test_verify_upgrades_hashes_made_at_another_cost(monkeypatch):
+    old = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+    monkeypatch.setattr(passwords, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5))
+
+    async def scenario():
+        pool = PasswordPool(workers=0)  # inline
+        checked = await pool.verify("secret", old), await pool.verify("wrong", old)
+        return checked, pool.stats()
+
+    ((ok, new_hash), (wrong, no_hash)), stats = asyncio.run(scenario())
+    assert ok and new_hash.startswith("$2b$05$") and not wrong and no_hash is None
+    assert (stats["completed"], stats["rehashed"]) == (2, 1)
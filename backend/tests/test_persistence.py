@@ -0,0 +1,89 @@
+# backend/tests/test_persistence.py
+import asyncio
+import datetime
+
+from sqlalchemy import select
+
+from app import crud, dictionary, models
+from app.persistence import MatchWriter
+
+
+def record(code, name="Ann", word="CAT"):
+    return {"code": code, "ended_at": datetime.datetime.now(datetime.timezone.utc), "players": [
+        {"name": name, "user_id": None, "score": len(word) ** 2,
+         "words": [{"word": word, "points": len(word) ** 2, "was_stolen": False}]}]}
+
+
+async def saved_codes(database):
+    async with database() as session:
+        return sorted(await session.scalars(select(models.Match.code)))
+
+
+def test_full_batches_are_written_at_once_and_the_rest_after_the_interval(database):
+    async def scenario():
+        writer = MatchWriter(batch_size=2, flush_interval=0.2)
+        for code in ("AAAAA", "BBBBB", "CCCCC"):
+            writer.enqueue(record(code))
+        await asyncio.sleep(0.1)
+        first = (await saved_codes(database), writer.depth)
+        await asyncio.sleep(0.3)
+        second = (await saved_codes(database), writer.stats())
+        await writer.close()
+        return first, second
+
+    first, (codes, stats) = asyncio.run(scenario())
+    assert first == (["AAAAA", "BBBBB"], 1)
+    assert codes == ["AAAAA", "BBBBB", "CCCCC"] and stats["batches"] == 2 and stats["written"] == 3
+
+
+def test_close_drains_the_queue(database):
+    async def scenario():
+        writer = MatchWriter(batch_size=50, flush_interval=60)
+        for code in ("AAAAA", "BBBBB"):
+            writer.enqueue(record(code))
+        await writer.close()
+        return await saved_codes(database), writer.depth
+    assert asyncio.run(scenario()) == (["AAAAA", "BBBBB"], 0)
+
+
+def test_failed_batches_are_retried(database, monkeypatch):
+    real, calls = crud.save_match_results, []
+
+    async def flaky(session, records):
+        calls.append(len(records))
+        if len(calls) == 1:
+            raise ConnectionError("database went away")
+        return await real(session, records)
+
+    monkeypatch.setattr(crud, "save_match_results", flaky)
+
+    async def scenario():
+        writer = MatchWriter(batch_size=2, flush_interval=60)
+        writer.enqueue(record("AAAAA"))
+        writer.enqueue(record("BBBBB"))
+        await writer.close()
+        return await saved_codes(database), writer.stats()
+
+    codes, stats = asyncio.run(scenario())
+    assert codes == ["AAAAA", "BBBBB"] and calls == [2, 2]
+    assert (stats["retries"], stats["dropped"], stats["batches"]) == (1, 0, 1)
+
+
+def test_a_bad_match_is_dropped_alone(database):
+    async def scenario():
+        writer = MatchWriter(batch_size=3, flush_interval=60, max_retries=1)
+        writer.enqueue(record("AAAAA"))
+        writer.enqueue(record("BBBBB", name=None))  # match_players.name is NOT NULL
+        writer.enqueue(record("CCCCC"))
+        await writer.close()
+        return await saved_codes(database), writer.stats()
+
+    codes, stats = asyncio.run(scenario())
+    assert codes == ["AAAAA", "CCCCC"]
+    assert (stats["written"], stats["dropped"], stats["retries"]) == (2, 1, 1)
+
+
+def test_every_dictionary_word_fits_the_word_columns():
+    longest = max(map(len, dictionary.get_dictionary().words))
+    assert models.WordPlayed.__table__.c.word.type.length >= longest
+    assert models.UserStats.__table__.c.longest_word.type.length >= longest
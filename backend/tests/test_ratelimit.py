@@ -0,0 +1,52 @@
+# backend/tests/test_ratelimit.py
+import pytest
+
+from app import ratelimit
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_limits_are_parsed_from_event_rate_burst_lists():
+    assert ratelimit._limits("send_chat=0.5:3, flip_tile=2,,bad") == {"send_chat": (0.5, 3.0), "flip_tile": (2.0, 2.0)}
+
+
+def test_a_burst_then_one_token_per_interval(clock):
+    limiter = ratelimit.RateLimiter(rate=2, burst=3)
+    assert [limiter.take("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.take("a") == pytest.approx(0.5)
+    assert limiter.take("b") == 0.0  # keys are independent
+    clock[0] += 0.5
+    assert limiter.take("a") == 0.0 and limiter.take("a") > 0
+
+
+def test_room_limits_are_shared_by_everyone_in_the_room(clock):
+    limits = ratelimit.EventLimits({"send_chat": (1, 2)}, {"send_chat": (1, 3)})
+    assert [limits.check("send_chat", sid, "QZRTW") for sid in ("a", "a", "b")] == [0.0, 0.0, 0.0]
+    assert limits.check("send_chat", "a", "QZRTW") > 0  # a's own burst is spent
+    assert limits.check("send_chat", "c", "QZRTW") > 0  # the room's is too
+    assert limits.check("send_chat", "c", "OTHER") == 0.0
+    assert limits.check("start_game", "a", "QZRTW") == 0.0  # not a limited event
+    limits.forget_sid("a")
+    limits.forget_room("QZRTW")
+    assert limits.tracked() == 3  # b and c's buckets, and OTHER's
+
+
+def test_bucket_count_stays_bounded(clock):
+    limiter = ratelimit.RateLimiter(rate=1, burst=2, max_keys=100)
+    for i in range(1000):
+        limiter.take(f"sid{i}")
+    assert len(limiter) <= 100
+
+
+def test_connects_are_limited_per_client_ip(clock, monkeypatch):
+    monkeypatch.setattr(ratelimit, "CONNECT_IP_HEADER", "fly-client-ip")
+    limiter = ratelimit.ConnectLimiter((1, 2))
+    behind_proxy = {"HTTP_FLY_CLIENT_IP": "203.0.113.7, 10.0.0.1", "asgi.scope": {"client": ("10.0.0.1", 5000)}}
+    assert [limiter.allow(behind_proxy) for _ in range(3)] == [True, True, False]
+    assert limiter.allow({"HTTP_FLY_CLIENT_IP": "198.51.100.2"})
+    assert ratelimit.ConnectLimiter(None).allow(behind_proxy)  # unset: no limit
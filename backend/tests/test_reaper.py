@@ -0,0 +1,26 @@
+# backend/tests/test_reaper.py
+import asyncio
+
+from app.persistence import MatchWriter
+
+
+def test_expired_games_are_discarded_without_saving_a_match(server, monkeypatch):
+    writer = MatchWriter()
+    monkeypatch.setattr(server, "match_writer", writer)
+    handlers = server._routed_handlers
+
+    async def scenario():
+        code = (await server.handle_create_game("alice", {"name": "Alice"}))["code"]
+        await handlers["handle_join_game"]("bob", {"code": code, "name": "Bob"})
+        await handlers["handle_start_game"]("alice", {"code": code})
+        game = server.games[code]
+        game.history.append(("alice", 1, "CAT", False))  # a word played before the game was abandoned
+        assert not await server.expire_game(code, "idle", game.last_action_time - 1)  # played on since the sweep
+        assert await server.expire_game(code, "idle", game.last_action_time)
+        await server.outbound.flush()
+        await server.turn_timers.stop()
+        return code
+
+    code = asyncio.run(scenario())
+    assert code not in server.games and not server.sessions
+    assert writer.enqueued == 0
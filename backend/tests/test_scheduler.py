@@ -0,0 +1,59 @@
+# backend/tests/test_scheduler.py
+import asyncio
+
+from app.scheduler import TimerScheduler
+
+
+def test_timers_fire_in_deadline_order():
+    async def scenario():
+        timers, fired = TimerScheduler(), []
+        timers.schedule("slow", 0.06, fired.append, "slow")
+        timers.schedule("fast", 0.02, fired.append, "fast")
+        await asyncio.sleep(0.1)
+        await timers.stop()
+        return fired, timers.fired
+    assert asyncio.run(scenario()) == (["fast", "slow"], 2)
+
+
+def test_reschedule_replaces_and_cancel_drops():
+    async def scenario():
+        timers, fired = TimerScheduler(), []
+        timers.schedule("k", 0.01, fired.append, "first")
+        timers.schedule("k", 0.03, fired.append, "second")
+        timers.schedule("gone", 0.01, fired.append, "gone")
+        assert timers.cancel("gone") and not timers.cancel("gone")
+        await asyncio.sleep(0.06)
+        stats = timers.stats()
+        await timers.stop()
+        return fired, stats
+    fired, stats = asyncio.run(scenario())
+    assert fired == ["second"]
+    assert stats == {"pending": 0, "scheduled": 3, "cancelled": 2, "fired": 1}
+
+
+def test_coroutine_callbacks_run_and_errors_do_not_stop_the_scheduler():
+    async def scenario():
+        timers, fired = TimerScheduler(), []
+
+        async def later(value):
+            fired.append(value)
+
+        timers.schedule("boom", 0.01, lambda: 1 / 0)
+        timers.schedule("co", 0.02, later, "co")
+        await asyncio.sleep(0.05)
+        await timers.stop()
+        return fired
+    assert asyncio.run(scenario()) == ["co"]
+
+
+def test_replaced_timers_do_not_pile_up_in_the_heap():
+    async def scenario():
+        timers, fired = TimerScheduler(), []
+        for i in range(500):
+            timers.schedule("k", 0.01, fired.append, i)
+        heap = len(timers._heap)
+        await asyncio.sleep(0.03)
+        await timers.stop()
+        return heap, fired
+    heap, fired = asyncio.run(scenario())
+    assert heap <= 67 and fired == [499]  # compacted whenever it passes 2 * pending + 64
@@ -0,0 +1,75 @@
+# backend/tests/test_solver.py
+import asyncio
+
+from app import anagram, dictionary, letters, solver
+
+
+def started_game(server):
+    """alice has CAT and bob has DOG on the table; it's bob's turn, holding SETRAIN."""
+    handlers = server._routed_handlers
+
+    async def setup():
+        code = (await server.handle_create_game("alice", {"name": "Alice"}))["code"]
+        await server.handle_join_game("bob", {"code": code, "name": "Bob"})
+        await handlers["handle_start_game"]("alice", {"code": code})
+        return code
+
+    code = asyncio.run(setup())
+    game = server.games[code]
+    game.players["alice"].words[1] = "CAT"
+    game.players["bob"].words[2] = "DOG"
+    game.players["bob"].hand = letters.counts("SETRAIN")
+    game.board.changed()
+    anagram.get_index()  # built at warm-up in production, not inside a hint's budget
+    while game.turn_order.current != "bob":
+        game.turn_order.advance()
+    return code, game
+
+
+def call(server, handler, sid, data):
+    async def run():
+        result = await server._routed_handlers[handler](sid, data)
+        await server.outbound.flush()
+        await server.turn_timers.stop()
+        return result
+    return asyncio.run(run())
+
+
+def is_legal(game, sid, move) -> bool:
+    hand, word = game.players[sid].hand, move["word"]
+    if not dictionary.is_valid(word):
+        return False
+    if move["type"] == "form":
+        return letters.has(hand, letters.counts(word))
+    base = game.players[move["targetPlayerId"]].words.get(move["baseWordId"])
+    added = letters.diff(letters.counts(word), letters.counts(base or ""))
+    return base == move["baseWord"] and added is not None and any(added) and letters.has(hand, added)
+
+
+def test_hints_are_legal_and_limited(server):
+    code, game = started_game(server)
+    result = call(server, "handle_get_hint", "bob", {"code": code})
+    assert len(result["moves"]) == 3  # get_hint asks for the best 3
+    assert all(is_legal(game, "bob", move) for move in result["moves"])
+    points = [move["points"] for move in result["moves"]]
+    assert points == sorted(points, reverse=True)
+
+
+def test_solve_returns_the_best_moves_first_for_any_limit(server):
+    code, game = started_game(server)
+    every, complete = solver.solve(game, "bob", budget_ms=1000, limit=50)
+    assert complete and len(every) == 50 and all(is_legal(game, "bob", move) for move in every)
+    for limit in (1, 5, 12):
+        assert solver.solve(game, "bob", budget_ms=1000, limit=limit)[0] == every[:limit]
+
+
+def test_the_top_hint_is_accepted_by_the_game(server):
+    code, game = started_game(server)
+    [move] = solver.solve(game, "bob", budget_ms=1000, limit=1)[0]
+    if move["type"] == "form":
+        result = call(server, "handle_form_word", "bob", {"code": code, "word": move["word"],
+                                                          "tiles": list(move["word"])})
+    else:
+        result = call(server, "handle_steal_word", "bob", {"code": code, "targetPlayerId": move["targetPlayerId"],
+                                                           "baseWordId": move["baseWordId"], "newWord": move["word"]})
+    assert "error" not in result and move["word"] in game.players["bob"].words.values()
@@ -0,0 +1,65 @@
+# backend/tests/test_stats.py
+import asyncio
+import datetime
+
+from sqlalchemy import func, select
+
+from app import crud, models
+from app.persistence import MatchWriter
+
+
+def record(code, *scores):
+    """A match_record() where user i scored scores[i-1], with no words."""
+    return {"code": code, "ended_at": datetime.datetime.now(datetime.timezone.utc), "players": [
+        {"name": f"u{i}", "user_id": i, "score": score, "words": []} for i, score in enumerate(scores, 1)]}
+
+
+def add_users(session, *ids):
+    session.add_all(models.User(id=i, username=f"u{i}", password_hash="x") for i in ids)
+
+
+def test_wins_need_a_positive_top_score(database):
+    async def scenario():
+        async with database() as session:
+            add_users(session, 1, 2, 3)
+            await session.commit()
+            await crud.save_match_results(session, [record("AAAAA", 0, 0, 0), record("BBBBB", 9, 9, 4)])
+            return {user_id: (await crud.get_user_stats(session, user_id)) for user_id in (1, 2, 3)}
+
+    stats = asyncio.run(scenario())
+    assert [(s.games_played, s.wins) for s in stats.values()] == [(2, 1), (2, 1), (2, 0)]  # the 0-0-0 match: no wins
+
+
+def test_lobby_ended_before_it_started_is_not_a_match(server, database, monkeypatch):
+    writer = MatchWriter(flush_interval=0.01)
+    monkeypatch.setattr(server, "match_writer", writer)
+    monkeypatch.setattr(server, "socket_users", {"alice": 1, "bob": 2})
+    handlers = server._routed_handlers
+
+    async def lobby(start: bool):
+        code = (await server.handle_create_game("alice", {"name": "Alice"}))["code"]
+        await server.handle_join_game("bob", {"code": code, "name": "Bob"})
+        if start:
+            await handlers["handle_start_game"]("alice", {"code": code})
+        await server.remove_player("bob", None)  # alice is left alone: the game ends
+        assert code not in server.games
+
+    async def scenario():
+        async with database() as session:
+            add_users(session, 1, 2)
+            await session.commit()
+        await lobby(start=False)
+        await writer.close()
+        async with database() as session:
+            unstarted = (await session.scalar(select(func.count(models.Match.id))),
+                         await session.scalar(select(func.count()).select_from(models.UserStats)))
+        await lobby(start=True)  # the same departure from a started game does count
+        await writer.close()
+        await server.outbound.flush()
+        await server.turn_timers.stop()
+        async with database() as session:
+            started = (await session.scalar(select(func.count(models.Match.id))),
+                       (await crud.get_user_stats(session, 1)).games_played)
+        return unstarted, started
+
+    assert asyncio.run(scenario()) == ((0, 0), (1, 1))
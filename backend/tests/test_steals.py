@@ -0,0 +1,64 @@
+# backend/tests/test_steals.py
+import asyncio
+import time
+
+from app import anagram, letters, ratelimit
+
+
+def lobby_with_cat(server):
+    """A lobby where alice has CAT on the table and bob holds an S."""
+    async def setup():
+        code = (await server.handle_create_game("alice", {"name": "Alice"}))["code"]
+        await server.handle_join_game("bob", {"code": code, "name": "Bob"})
+        return code
+
+    code = asyncio.run(setup())
+    game = server.games[code]
+    game.players["alice"].words[1] = "CAT"
+    game.players["bob"].hand = letters.counts("S")
+    game.board.changed()
+    return code
+
+
+def find_steals(server, sid, code):
+    async def call():
+        result = await server.handle_find_steals(sid, {"code": code})
+        await server.outbound.flush()
+        await server.turn_timers.stop()
+        return result
+    return asyncio.run(call())
+
+
+def test_find_steals_lists_extensions_within_budget(server):
+    code = lobby_with_cat(server)
+    result = find_steals(server, "bob", code)
+    assert result["complete"] is True
+    [steal] = result["steals"]
+    assert steal["targetPlayerId"] == "alice" and steal["baseWord"] == "CAT" and "CATS" in steal["newWords"]
+
+
+def test_find_steals_stops_at_its_deadline(server, monkeypatch):
+    code = lobby_with_cat(server)
+    monkeypatch.setattr(server, "FIND_STEALS_BUDGET_MS", -1)  # already past the deadline
+    assert find_steals(server, "bob", code) == {"steals": [], "complete": False}
+
+
+def test_find_steals_is_rate_limited(server, monkeypatch):
+    code = lobby_with_cat(server)
+    monkeypatch.setattr(server, "event_limits", ratelimit.EventLimits({"find_steals": (0.1, 2)}, {}))
+    assert "steals" in find_steals(server, "bob", code)
+    assert "steals" in find_steals(server, "bob", code)
+    assert find_steals(server, "bob", code)["error"] == "Too many requests"
+    assert "steals" in find_steals(server, "alice", code)  # limits are per socket
+
+
+def test_searches_report_whether_they_finished():
+    index = anagram.get_index()
+    hand = "ETAOINSHRDLUCMFW"
+    every, complete = index.words_from(hand, 3)
+    assert complete and "MOTHERLAND" in every
+    past = time.perf_counter() - 1
+    partial, complete = index.words_from(hand, 3, deadline=past)
+    assert not complete and len(partial) < len(every)
+    # A search too small to reach a clock check finishes, so it is complete even past the deadline
+    assert index.extensions("CAT", "S", deadline=past) == (index.anagrams("CATS"), True)
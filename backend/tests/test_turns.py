@@ -0,0 +1,50 @@
+# backend/tests/test_turns.py
+from app.turns import TurnOrder
+
+
+def ring(*sids):
+    order = TurnOrder()
+    for sid in sids:
+        order.append(sid)
+    return order
+
+
+def test_advance_cycles_in_join_order():
+    order = ring("a", "b", "c")
+    assert order.current == "a"
+    assert [order.advance() for _ in range(4)] == ["b", "c", "a", "b"]
+    assert order.turn == 4
+
+
+def test_remove_keeps_turn_on_the_right_player():
+    order = ring("a", "b", "c", "d")
+    order.advance()  # b
+    order.remove("d")
+    assert order.current == "b" and list(order) == ["a", "b", "c"]
+    turn = order.turn
+    order.remove("b")  # the current player leaves: the turn passes on
+    assert order.current == "c" and order.turn == turn + 1
+    order.remove("a")
+    assert list(order) == ["c"] and order.advance() == "c"
+    order.remove("c")
+    assert order.current is None and len(order) == 0 and order.advance() is None
+
+
+def test_append_is_idempotent_and_rename_keeps_place():
+    order = ring("a", "b", "c")
+    order.append("b")
+    assert list(order) == ["a", "b", "c"]
+    order.advance()
+    order.rename("b", "b2")
+    assert list(order) == ["a", "b2", "c"] and order.current == "b2" and "b" not in order
+    order.rename("a", "c")  # new sid already seated: ignored
+    assert list(order) == ["a", "b2", "c"]
+
+
+def test_players_who_join_mid_game_go_last():
+    order = ring("a", "b")
+    order.advance()  # b
+    order.remove("a")
+    order.append("c")  # "a" was first; with it gone, "b" heads the order
+    assert list(order) == ["b", "c"] and order.current == "b"
+    assert [order.advance() for _ in range(3)] == ["c", "b", "c"]
@@ -0,0 +1,40 @@
+# backend/tests/test_warmup.py
+import asyncio
+
+from app.warmup import WarmUp
+
+
+def flaky(failures: int, calls: list):
+    """A step that raises the first `failures` times it runs."""
+    async def step():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise OSError("not yet")
+    return step
+
+
+def run(warm_up: WarmUp) -> WarmUp:
+    asyncio.run(warm_up.run())
+    return warm_up
+
+
+def test_required_step_is_retried_until_it_succeeds():
+    calls, gave_up = [], []
+    warm_up = run(WarmUp([("words", flaky(2, calls), True)], attempts=3, retry_delay=0.001,
+                         give_up=lambda: gave_up.append(1)))
+    assert warm_up.ready and len(calls) == 3 and not gave_up and warm_up.stats()["errors"] == {}
+
+
+def test_required_step_that_keeps_failing_gives_up_on_the_worker():
+    calls, later, gave_up = [], [], []
+    warm_up = run(WarmUp([("words", flaky(99, calls), True), ("db", flaky(0, later), False)],
+                         attempts=3, retry_delay=0.001, give_up=lambda: gave_up.append(1)))
+    assert not warm_up.ready and len(calls) == 3 and gave_up == [1]
+    assert not later and "words" in warm_up.stats()["errors"]
+
+
+def test_optional_step_failure_is_not_retried():
+    calls, gave_up = [], []
+    warm_up = run(WarmUp([("db", flaky(1, calls), False)], attempts=3, retry_delay=0.001,
+                         give_up=lambda: gave_up.append(1)))
+    assert warm_up.ready and len(calls) == 1 and not gave_up and "db" in warm_up.stats()["errors"]
@@ -0,0 +1,73 @@
+# backend/tests/test_wire.py
+"""Packet layouts (wire.py) and versioned game changes with catch-up (sync)."""
+import asyncio
+import json
+from pathlib import Path
+
+from socketio import packet
+
+from app import wire
+from app.state import DELTA_HISTORY, GameState
+
+# Compact packets the frontend codec (frontend/src/wire.ts) is tested against
+FIXTURES = Path(__file__).parents[2] / "frontend" / "src" / "wire.fixtures.json"
+
+
+def test_compact_and_standard_msgpack_round_trip():
+    for namespace, pid in (("/", None), ("/", 7), ("/other", 3)):
+        pkt = wire.WirePacket(packet.EVENT, data=["word_placed", {"v": 3}], namespace=namespace, id=pid)
+        for compact in (True, False):
+            decoded = wire.WirePacket(encoded_packet=pkt.encode_msgpack(compact))
+            assert (decoded.packet_type, decoded.data, decoded.id, decoded.namespace) == \
+                (packet.EVENT, ["word_placed", {"v": 3}], pid, namespace)
+            assert decoded.compact == compact
+
+
+def test_frontend_fixtures_match_the_compact_encoding():
+    for case in json.loads(FIXTURES.read_text()):
+        expected = case["packet"]
+        pkt = wire.WirePacket(expected["type"], data=expected["data"], namespace=expected["nsp"], id=expected["id"])
+        assert pkt.encode_msgpack(compact=True).hex() == case["hex"]
+        decoded = wire.WirePacket(encoded_packet=bytes.fromhex(case["hex"]))
+        assert (decoded.packet_type, decoded.data, decoded.id, decoded.namespace) == \
+            (expected["type"], expected["data"], expected["id"], expected["nsp"])
+
+
+def test_json_packets_still_decode():
+    encoded = wire.WirePacket(packet.EVENT, data=["chat", {"text": "hi"}]).encode()
+    assert isinstance(encoded, str)
+    assert wire.WirePacket(encoded_packet=encoded).data == ["chat", {"text": "hi"}]
+
+
+def test_changes_since_returns_only_the_gap():
+    game = GameState("WIRES")
+    for i in range(5):
+        game.record_change("tile_flipped", {"n": i})
+    assert game.changes_since(5) == []
+    assert [data["n"] for _, data in game.changes_since(2)] == [2, 3, 4]
+    assert game.changes_since(6) is None and game.changes_since(-1) is None
+
+
+def test_changes_since_gives_up_once_history_is_trimmed():
+    game = GameState("WIRES")
+    for i in range(DELTA_HISTORY + 10):
+        game.record_change("tile_flipped", {"n": i})
+    assert game.changes_since(5) is None
+    assert len(game.changes_since(game.version - DELTA_HISTORY)) == DELTA_HISTORY
+
+
+def test_sync_sends_missed_changes_or_the_full_view(server):
+    async def scenario():
+        created = await server.handle_create_game("alice", {"name": "Alice"})
+        code = created["code"]
+        joined = await server._routed_handlers["handle_join_game"]("bob", {"code": code, "name": "Bob"})
+        assert joined["v"] == created["v"] + 1
+        caught_up = await server._routed_handlers["handle_sync"]("alice", {"code": code, "since": created["v"]})
+        assert caught_up["v"] == joined["v"]
+        assert caught_up["changes"] == [["player_joined", {"sid": "bob", "name": "Bob", "v": joined["v"]}]]
+        full = await server._routed_handlers["handle_sync"]("alice", {"code": code, "since": None})
+        assert full["state"]["v"] == joined["v"] and [p["sid"] for p in full["state"]["players"]] == ["alice", "bob"]
+        outsider = await server._routed_handlers["handle_sync"]("carol", {"code": code, "since": 0})
+        assert "error" in outsider
+        await server.outbound.flush()
+    asyncio.run(scenario())
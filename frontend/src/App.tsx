@@ -5,7 +5,7 @@ import JoinLobby from './components/JoinLobby';
 import GameBoard from './components/GameBoard';
 
 const App: React.FC = () => {
-  const { state, connectSocket, disconnectSocket } = useContext(GameContext);
+  const { state, connectSocket, disconnectSocket, takeSeat } = useContext(GameContext);
   const [joined, setJoined] = useState(false);
 
   useEffect(() => {
@@ -15,26 +15,18 @@ const App: React.FC = () => {
     };
   }, []);
 
-  const handleJoin = (name: string, code?: string) => {
+  const handleJoin = (name: string, code?: string, quick?: boolean) => {
     connectSocket();  // establish socket connection
-    // If code provided, join existing; otherwise create new
-    if (code) {
-      state.socket?.emit('join_game', { code, name }, (res: any) => {
-        if (res.error) {
-          alert(res.error);
-        } else {
-          setJoined(true);
-        }
-      });
-    } else {
-      state.socket?.emit('create_game', { name }, (res: any) => {
-        if (res.error) {
-          alert(res.error);
-        } else {
-          setJoined(true);
-        }
-      });
-    }
+    // Quick match seats us in an open public lobby; with a code, join that one; otherwise create new
+    const event = quick ? 'quick_match' : code ? 'join_game' : 'create_game';
+    state.socket?.emit(event, code ? { code, name } : { name }, (res: any) => {
+      if (res.error) {
+        alert(res.error);
+      } else {
+        takeSeat(res);
+        setJoined(true);
+      }
+    });
   };
 
   return (
@@ -38,6 +38,25 @@ const GameBoard: React.FC = () => {
       });
     }
   };
+  const getHint = () => {
+    state.socket?.emit("get_hint", { code: state.code }, (res: any) => {
+      if (res.error) alert(res.error);
+      else if (!res.moves.length) alert("No words to make - flip a tile.");
+      else {
+        const best = res.moves[0];
+        // Pre-fill the move so the player only has to press Place/Steal
+        setNewWord(best.word);
+        if (best.type === "steal") setStealDetails({ baseWordId: String(best.baseWordId), targetSid: best.targetPlayerId });
+        alert(best.type === "steal" ? `Try stealing ${best.baseWord} to make ${best.word} (${best.points} pts)`
+                                    : `Try placing ${best.word} (${best.points} pts)`);
+      }
+    });
+  };
+  const addBot = () => {
+    state.socket?.emit("add_bot", { code: state.code }, (res: any) => {
+      if (res.error) alert(res.error);
+    });
+  };
   const toggleDarkMode = () => {
     dispatch({ type: 'SET_DARK_MODE', enabled: !state.darkMode });
   };
@@ -78,6 +97,8 @@ const GameBoard: React.FC = () => {
           />
           <button onClick={formWord} className="bg-green-600 hover:bg-green-700 text-white px-4 py-2 rounded">Place Word</button>
           <button onClick={stealWord} className="bg-blue-600 hover:bg-blue-700 text-white px-4 py-2 rounded">Steal Word</button>
+          <button onClick={getHint} className="bg-gray-500 hover:bg-gray-600 text-white px-4 py-2 rounded">Hint</button>
+          <button onClick={addBot} className="bg-purple-600 hover:bg-purple-700 text-white px-4 py-2 rounded">Add Bot</button>
         </div>
         {/* Instructions or status */}
         <p className="text-sm text-gray-700 dark:text-gray-300 mt-1">Use "Place Word" for new words from your letters, or fill in a word and select a target word to "Steal Word".</p>
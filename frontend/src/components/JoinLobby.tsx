@@ -2,7 +2,7 @@
 import React, { useState } from 'react';
 
 interface Props {
-  onSubmit: (name: string, code?: string) => void;
+  onSubmit: (name: string, code?: string, quick?: boolean) => void;
 }
 
 const JoinLobby: React.FC<Props> = ({ onSubmit }) => {
@@ -16,6 +16,13 @@ const JoinLobby: React.FC<Props> = ({ onSubmit }) => {
     }
     onSubmit(name.trim());
   };
+  const handleQuickMatch = () => {
+    if (!name) {
+      alert("Please enter your name");
+      return;
+    }
+    onSubmit(name.trim(), undefined, true);
+  };
   const handleJoin = () => {
     if (!name || !code) {
       alert("Please enter your name and lobby code");
@@ -30,6 +37,7 @@ const JoinLobby: React.FC<Props> = ({ onSubmit }) => {
       <input 
         type="text" 
         placeholder="Your Name" 
+        maxLength={24}
         value={name} 
         onChange={e => setName(e.target.value)} 
         className="mb-3 p-2 border rounded w-64 text-gray-900"
@@ -44,6 +52,7 @@ const JoinLobby: React.FC<Props> = ({ onSubmit }) => {
       <div className="space-x-4">
         <button onClick={handleCreate} className="px-4 py-2 bg-green-600 text-white rounded shadow">Create Game</button>
         <button onClick={handleJoin} className="px-4 py-2 bg-blue-600 text-white rounded shadow">Join Game</button>
+        <button onClick={handleQuickMatch} className="px-4 py-2 bg-yellow-500 text-white rounded shadow">Quick Match</button>
       </div>
     </div>
   );
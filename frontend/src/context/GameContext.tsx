@@ -1,9 +1,10 @@
 // frontend/src/context/GameContext.tsx
-import React, { createContext, useReducer } from 'react';
+import React, { createContext, useReducer, useRef } from 'react';
 import { io, Socket } from 'socket.io-client';
+import { parser as msgpackParser } from '../wire';
 
 interface PlayerInfo { sid: string; name: string; score?: number; }
-interface WordInfo { word: string; word_id: string; owner: string; }
+interface WordInfo { word: string; word_id: number; owner: string; }
 interface Message { from: string; text: string; }
 
 interface GameState {
@@ -29,8 +30,10 @@ type Action =
   | { type: 'SET_PLAYERS', players: PlayerInfo[] }
   | { type: 'PLAYER_JOINED', player: PlayerInfo }
   | { type: 'PLAYER_LEFT', sid: string }
+  | { type: 'PLAYER_RESUMED', old_sid: string, sid: string }
+  | { type: 'RESUME', code: string, players: PlayerInfo[], words: WordInfo[] }
   | { type: 'WORD_PLACED', word: WordInfo }
-  | { type: 'WORD_STOLEN', victim_sid: string, old_word_id: string, new_word: WordInfo }
+  | { type: 'WORD_STOLEN', victim_sid: string, old_word_id: number, new_word: WordInfo }
   | { type: 'TILE_FLIPPED', sid: string, letter: string }
   | { type: 'NEW_MESSAGE', message: Message }
   | { type: 'SET_DARK_MODE', enabled: boolean }
@@ -42,7 +45,8 @@ const GameContext = createContext<{
   dispatch: React.Dispatch<Action>;
   connectSocket: () => void;
   disconnectSocket: () => void;
-}>({ state: initialState, dispatch: () => null, connectSocket: () => {}, disconnectSocket: () => {} });
+  takeSeat: (res: any) => void;
+}>({ state: initialState, dispatch: () => null, connectSocket: () => {}, disconnectSocket: () => {}, takeSeat: () => {} });
 
 const gameReducer = (state: GameState, action: Action): GameState => {
   switch (action.type) {
@@ -54,6 +58,15 @@ const gameReducer = (state: GameState, action: Action): GameState => {
       return { ...state, players: [...state.players, action.player] };
     case 'PLAYER_LEFT':
       return { ...state, players: state.players.filter(p => p.sid !== action.sid) };
+    case 'PLAYER_RESUMED':
+      // A player reconnected with a new socket id
+      return {
+        ...state,
+        players: state.players.map(p => p.sid === action.old_sid ? { ...p, sid: action.sid } : p),
+        words: state.words.map(w => w.owner === action.old_sid ? { ...w, owner: action.sid } : w)
+      };
+    case 'RESUME':
+      return { ...state, code: action.code, players: action.players, words: action.words };
     case 'WORD_PLACED':
       return { ...state, words: [...state.words, action.word] };
     case 'WORD_STOLEN':
@@ -77,25 +90,86 @@ const gameReducer = (state: GameState, action: Action): GameState => {
   }
 };
 
+// Seat token from create_game/join_game, kept so a dropped connection can resume_game
+const SEAT_KEY = 'bamandagrams.seat';
+
+const saveSeat = (code: string, token: string) => sessionStorage.setItem(SEAT_KEY, JSON.stringify({ code, token }));
+
 const GameProvider: React.FC<{ children: React.ReactNode }> = ({ children }) => {
   const [state, dispatch] = useReducer(gameReducer, initialState);
+  // Every change to the game carries the game's version `v`; on a gap, ask for just what we missed
+  const version = useRef(0);
 
   const connectSocket = () => {
     if (!state.socket) {
       const socketUrl = import.meta.env.VITE_API_URL || window.location.origin;
-      const socket = io(socketUrl, { transports: ['websocket'] });
+      // Compact msgpack unless VITE_WIRE=json; the server answers in whichever the socket speaks
+      const wire = import.meta.env.VITE_WIRE === 'json' ? {} : { parser: msgpackParser };
+      const socket = io(socketUrl, { transports: ['websocket'], ...wire });
       dispatch({ type: 'RESET_GAME' });
+      let connectedBefore = false;
+      version.current = 0;
+      let syncing = false;
+      const catchUp = (res: any) => {
+        syncing = false;
+        if (!res || res.error) return;
+        if (res.state) {
+          version.current = res.v;
+          dispatch({
+            type: 'RESUME',
+            code: res.code ?? JSON.parse(sessionStorage.getItem(SEAT_KEY) || '{}').code,
+            players: res.state.players.map((p: any) => ({ sid: p.sid, name: p.name })),
+            words: res.state.players.flatMap((p: any) => p.words.map((w: any) => ({ ...w, owner: p.sid })))
+          });
+        } else {
+          res.changes.forEach(([event, data]: [string, any]) => socket.listeners(event).forEach((fn) => fn(data)));
+        }
+      };
+      const onChange = (event: string, handler: (data: any) => void) => {
+        socket.on(event, (data: any) => {
+          if (version.current && data.v <= version.current) return;  // already applied
+          if (version.current && data.v > version.current + 1) {
+            const seat = sessionStorage.getItem(SEAT_KEY);
+            if (seat && !syncing) {
+              syncing = true;
+              socket.emit('sync', { code: JSON.parse(seat).code, since: version.current }, catchUp);
+            }
+            return;
+          }
+          version.current = data.v;
+          handler(data);
+        });
+      };
       // Register Socket.IO event listeners
       socket.on('connect', () => {
         console.log('Socket connected');
+        const seat = sessionStorage.getItem(SEAT_KEY);
+        if (connectedBefore && seat) {
+          // Reconnected (network blip or server restart): take our seat back, catching up from `version`
+          socket.emit('resume_game', { ...JSON.parse(seat), since: version.current }, (res: any) => {
+            if (res.error) {
+              sessionStorage.removeItem(SEAT_KEY);
+              return;
+            }
+            catchUp(res);
+          });
+        }
+        connectedBefore = true;
+      });
+      socket.on('connect_error', () => {
+        // Refused while the server warms up after a deploy (or connecting too often): try again shortly
+        if (!socket.active) setTimeout(() => socket.connect(), 2000);
       });
-      socket.on('player_joined', (data: any) => {
+      onChange('player_joined', (data: any) => {
         dispatch({ type: 'PLAYER_JOINED', player: { sid: data.sid, name: data.name } });
       });
-      socket.on('player_left', (data: any) => {
+      onChange('player_left', (data: any) => {
         dispatch({ type: 'PLAYER_LEFT', sid: data.sid });
       });
-      socket.on('game_started', () => {
+      onChange('player_resumed', (data: any) => {
+        dispatch({ type: 'PLAYER_RESUMED', old_sid: data.old_sid, sid: data.sid });
+      });
+      onChange('game_started', () => {
         console.log('Game started!');
       });
       socket.on('your_turn', () => {
@@ -104,18 +178,18 @@ const GameProvider: React.FC<{ children: React.ReactNode }> = ({ children }) =>
       socket.on('turn_timeout', (data: any) => {
         console.log(`Player ${data.sid} timed out.`);
       });
-      socket.on('tile_flipped', (data: any) => {
+      onChange('tile_flipped', (data: any) => {
         // Optionally show the letter flip to all players
         console.log(`Tile flipped by ${data.sid}: ${data.letter}`);
         dispatch({ type: 'TILE_FLIPPED', sid: data.sid, letter: data.letter });
       });
-      socket.on('word_placed', (data: any) => {
+      onChange('word_placed', (data: any) => {
         dispatch({
           type: 'WORD_PLACED',
           word: { word: data.word, word_id: data.word_id, owner: data.sid }
         });
       });
-      socket.on('word_stolen', (data: any) => {
+      onChange('word_stolen', (data: any) => {
         dispatch({
           type: 'WORD_STOLEN',
           victim_sid: data.victim_sid,
@@ -126,10 +200,22 @@ const GameProvider: React.FC<{ children: React.ReactNode }> = ({ children }) =>
       socket.on('chat_message', (msg: any) => {
         dispatch({ type: 'NEW_MESSAGE', message: { from: msg.name, text: msg.text } });
       });
+      // The server coalesces the events of one action into a single "batch" message
+      socket.on('batch', (items: [string, any][]) => {
+        items.forEach(([event, data]) => socket.listeners(event).forEach((fn) => fn(data)));
+      });
       socket.on('game_over', (data: any) => {
+        sessionStorage.removeItem(SEAT_KEY);
         alert("Game Over! Final Scores:\n" + data.results.map((r: any, i: number) =>
           `${i+1}. ${r.name}: ${r.score}`).join("\n"));
       });
+      // The server drops lobbies left idle too long (or evicts the quietest ones when short of memory)
+      socket.on('game_expired', (data: any) => {
+        sessionStorage.removeItem(SEAT_KEY);
+        dispatch({ type: 'RESET_GAME' });
+        alert(data.reason === 'idle' ? 'This game was closed after being idle too long.'
+                                     : 'This game was closed because the server is busy.');
+      });
       dispatch({ type: 'SET_PLAYERS', players: [] }); // reset players list
       dispatch({ type: 'SET_CODE', code: '' });       // code will be set upon join/create response
       state.socket = socket;
@@ -139,11 +225,20 @@ const GameProvider: React.FC<{ children: React.ReactNode }> = ({ children }) =>
 
   const disconnectSocket = () => {
     state.socket?.disconnect();
+    sessionStorage.removeItem(SEAT_KEY);
     dispatch({ type: 'RESET_GAME' });
   };
 
+  // The create/join ack carries the lobby's version and roster: changes from here on are applied in order
+  const takeSeat = (res: any) => {
+    saveSeat(res.code, res.token);
+    version.current = res.v;
+    dispatch({ type: 'SET_CODE', code: res.code });
+    dispatch({ type: 'SET_PLAYERS', players: res.players ?? [res.player] });
+  };
+
   return (
-    <GameContext.Provider value={{ state, dispatch, connectSocket, disconnectSocket }}>
+    <GameContext.Provider value={{ state, dispatch, connectSocket, disconnectSocket, takeSeat }}>
       {children}
     </GameContext.Provider>
   );
@@ -0,0 +1,30 @@
+// frontend/src/wire.test.ts
+// Round trips against packets encoded by the server (backend/app/wire.py); backend/tests/test_wire.py pins the same bytes.
+import { describe, expect, it } from 'vitest';
+import { Decoder, Encoder, decode, encode } from './wire';
+import fixtures from './wire.fixtures.json';
+
+const bytes = (hex: string) => Uint8Array.from(hex.match(/../g)!.map((b) => parseInt(b, 16)));
+
+describe('compact msgpack packets', () => {
+  fixtures.forEach(({ packet, hex }, i) => {
+    const { type, data, nsp } = packet;
+    const id = packet.id ?? undefined;
+
+    it(`decodes server packet ${i}`, () => {
+      const decoded: any[] = [];
+      new Decoder().on('decoded', (p) => decoded.push(p)).add(bytes(hex));
+      expect(decoded).toEqual([id === undefined ? { type, data, nsp } : { type, data, nsp, id }]);
+    });
+
+    it(`encodes packet ${i} as the server does`, () => {
+      const [frame] = new Encoder().encode({ type, data, nsp, id });
+      expect(Array.from(frame)).toEqual(Array.from(bytes(hex)));
+    });
+  });
+
+  it('round-trips values', () => {
+    const value = { n: [0, -1, -33, 255, -129, 65535, -32769, 2 ** 32 - 1, 1.5], s: ['', 'é'.repeat(40)], none: null };
+    expect(decode(encode(value))).toEqual(value);
+  });
+});
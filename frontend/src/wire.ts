@@ -0,0 +1,216 @@
+// frontend/src/wire.ts
+// Socket.IO parser speaking compact msgpack: each packet is [type, data, id?, nsp?] (see backend/app/wire.py).
+// The server answers every connection in the encoding it receives, so this is opt-in per client;
+// set VITE_WIRE=json to use the default JSON parser instead.
+
+type Packet = { type: number; nsp: string; data?: any; id?: number };
+
+// msgpack encoding (the subset game payloads need: nil, bool, numbers, strings, binary, arrays, maps)
+class Writer {
+  buf = new Uint8Array(256);
+  view = new DataView(this.buf.buffer);
+  pos = 0;
+
+  reserve(n: number) {
+    if (this.pos + n <= this.buf.length) return;
+    const next = new Uint8Array(Math.max(this.buf.length * 2, this.pos + n));
+    next.set(this.buf);
+    this.buf = next;
+    this.view = new DataView(next.buffer);
+  }
+
+  byte(b: number) {
+    this.reserve(1);
+    this.buf[this.pos++] = b;
+  }
+
+  value(v: any) {
+    if (v === null || v === undefined) {
+      this.byte(0xc0);
+    } else if (v === false || v === true) {
+      this.byte(v ? 0xc3 : 0xc2);
+    } else if (typeof v === 'number') {
+      this.number(v);
+    } else if (typeof v === 'string') {
+      this.string(v);
+    } else if (v instanceof Uint8Array) {
+      this.length(v.length, 0, 0xc4, 0xc5, 0xc6);
+      this.reserve(v.length);
+      this.buf.set(v, this.pos);
+      this.pos += v.length;
+    } else if (Array.isArray(v)) {
+      this.length(v.length, 0x90, 0, 0xdc, 0xdd);
+      v.forEach((item) => this.value(item));
+    } else {
+      const keys = Object.keys(v).filter((k) => v[k] !== undefined);
+      this.length(keys.length, 0x80, 0, 0xde, 0xdf);
+      keys.forEach((k) => {
+        this.string(k);
+        this.value(v[k]);
+      });
+    }
+  }
+
+  number(n: number) {
+    this.reserve(9);
+    if (Number.isInteger(n) && n >= 0 && n < 0x80) {
+      this.buf[this.pos++] = n;
+    } else if (Number.isInteger(n) && n < 0 && n >= -32) {
+      this.buf[this.pos++] = n & 0xff;
+    } else if (Number.isInteger(n) && n >= 0 && n < 0x100) {
+      this.buf[this.pos++] = 0xcc;
+      this.buf[this.pos++] = n;
+    } else if (Number.isInteger(n) && n >= 0 && n < 0x10000) {
+      this.buf[this.pos++] = 0xcd;
+      this.view.setUint16(this.pos, n);
+      this.pos += 2;
+    } else if (Number.isInteger(n) && n >= 0 && n <= 0xffffffff) {
+      this.buf[this.pos++] = 0xce;
+      this.view.setUint32(this.pos, n);
+      this.pos += 4;
+    } else if (Number.isInteger(n) && n < 0 && n >= -0x80) {
+      this.buf[this.pos++] = 0xd0;
+      this.buf[this.pos++] = n & 0xff;
+    } else if (Number.isInteger(n) && n < 0 && n >= -0x8000) {
+      this.buf[this.pos++] = 0xd1;
+      this.view.setInt16(this.pos, n);
+      this.pos += 2;
+    } else if (Number.isInteger(n) && n < 0 && n >= -0x80000000) {
+      this.buf[this.pos++] = 0xd2;
+      this.view.setInt32(this.pos, n);
+      this.pos += 4;
+    } else {
+      this.buf[this.pos++] = 0xcb;
+      this.view.setFloat64(this.pos, n);
+      this.pos += 8;
+    }
+  }
+
+  string(s: string) {
+    const bytes = new TextEncoder().encode(s);
+    this.length(bytes.length, 0xa0, 0xd9, 0xda, 0xdb);
+    this.reserve(bytes.length);
+    this.buf.set(bytes, this.pos);
+    this.pos += bytes.length;
+  }
+
+  // Length prefix: fix (tag | n, when fix != 0 and n < 16 (32 for strings)), else 8/16/32-bit forms
+  length(n: number, fix: number, tag8: number, tag16: number, tag32: number) {
+    this.reserve(5);
+    if (fix && n < (fix === 0xa0 ? 32 : 16)) {
+      this.buf[this.pos++] = fix | n;
+    } else if (tag8 && n < 0x100) {
+      this.buf[this.pos++] = tag8;
+      this.buf[this.pos++] = n;
+    } else if (n < 0x10000) {
+      this.buf[this.pos++] = tag16;
+      this.view.setUint16(this.pos, n);
+      this.pos += 2;
+    } else {
+      this.buf[this.pos++] = tag32;
+      this.view.setUint32(this.pos, n);
+      this.pos += 4;
+    }
+  }
+}
+
+export function encode(value: any): Uint8Array {
+  const w = new Writer();
+  w.value(value);
+  return w.buf.slice(0, w.pos);
+}
+
+export function decode(bytes: Uint8Array): any {
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  const text = new TextDecoder();
+  let pos = 0;
+
+  const str = (n: number) => text.decode(bytes.subarray(pos, (pos += n)));
+  const bin = (n: number) => bytes.slice(pos, (pos += n));
+  const arr = (n: number) => Array.from({ length: n }, () => read());
+  const map = (n: number) => {
+    const out: Record<string, any> = {};
+    for (let i = 0; i < n; i++) {
+      const key = read();
+      out[key] = read();
+    }
+    return out;
+  };
+  const u8 = () => bytes[pos++];
+  const u16 = () => ((pos += 2), view.getUint16(pos - 2));
+  const u32 = () => ((pos += 4), view.getUint32(pos - 4));
+
+  function read(): any {
+    const b = u8();
+    if (b < 0x80) return b;
+    if (b < 0x90) return map(b & 0x0f);
+    if (b < 0xa0) return arr(b & 0x0f);
+    if (b < 0xc0) return str(b & 0x1f);
+    if (b >= 0xe0) return b - 0x100;
+    switch (b) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xc4: return bin(u8());
+      case 0xc5: return bin(u16());
+      case 0xc6: return bin(u32());
+      case 0xca: return (pos += 4), view.getFloat32(pos - 4);
+      case 0xcb: return (pos += 8), view.getFloat64(pos - 8);
+      case 0xcc: return u8();
+      case 0xcd: return u16();
+      case 0xce: return u32();
+      case 0xcf: return (pos += 8), Number(view.getBigUint64(pos - 8));
+      case 0xd0: return (pos += 1), view.getInt8(pos - 1);
+      case 0xd1: return (pos += 2), view.getInt16(pos - 2);
+      case 0xd2: return (pos += 4), view.getInt32(pos - 4);
+      case 0xd3: return (pos += 8), Number(view.getBigInt64(pos - 8));
+      case 0xd9: return str(u8());
+      case 0xda: return str(u16());
+      case 0xdb: return str(u32());
+      case 0xdc: return arr(u16());
+      case 0xdd: return arr(u32());
+      case 0xde: return map(u16());
+      case 0xdf: return map(u32());
+      default: throw new Error(`msgpack: unsupported type 0x${b.toString(16)}`);
+    }
+  }
+  return read();
+}
+
+// socket.io-client parser interface: new Encoder().encode(packet) -> frames; Decoder emits "decoded"
+export class Encoder {
+  encode(packet: Packet): Uint8Array[] {
+    const frame: any[] = [packet.type, packet.data ?? null];
+    if (packet.id !== undefined || (packet.nsp && packet.nsp !== '/')) frame.push(packet.id ?? null);
+    if (packet.nsp && packet.nsp !== '/') frame.push(packet.nsp);
+    return [encode(frame)];
+  }
+}
+
+export class Decoder {
+  private listeners: ((packet: Packet) => void)[] = [];
+
+  on(event: string, fn: (packet: Packet) => void) {
+    if (event === 'decoded') this.listeners.push(fn);
+    return this;
+  }
+
+  off(event?: string, fn?: (packet: Packet) => void) {
+    this.listeners = fn ? this.listeners.filter((l) => l !== fn) : [];
+    return this;
+  }
+
+  add(chunk: ArrayBuffer | Uint8Array | string) {
+    if (typeof chunk === 'string') throw new Error('msgpack parser got a text frame');
+    const frame = decode(chunk instanceof Uint8Array ? chunk : new Uint8Array(chunk));
+    const packet: Packet = { type: frame[0], data: frame[1] ?? undefined, nsp: frame[3] ?? '/' };
+    if (frame[2] !== null && frame[2] !== undefined) packet.id = frame[2];
+    this.listeners.forEach((fn) => fn(packet));
+  }
+
+  destroy() {
+    this.listeners = [];
+  }
+}
+
+export const parser = { Encoder, Decoder };